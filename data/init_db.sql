@@ -14,6 +14,9 @@ CREATE TABLE joueurs (
     date_dernier_credit_auto TIMESTAMP DEFAULT NULL
 );
 
+-- Index du classement : pages et rangs lus sans trier toute la table
+CREATE INDEX idx_joueurs_portefeuille ON joueurs (portefeuille DESC, pseudo);
+
 -- Table des statistiques
 CREATE TABLE joueurs_statistiques (
     pseudo VARCHAR(50) PRIMARY KEY,
@@ -1,10 +1,25 @@
-from fastapi import FastAPI
+import os
+
+from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 from src.api.joueur_router import router as joueur_router
 from src.api.joueur_connecte_router import router as joueur_connecte_router
 from src.api.joueur_en_jeu_router import router as joueur_en_jeu_router
-from src.api.var_utiles import tables_service
+from src.api.var_utiles import tables_service, matchmaking, verrou_table
 from src.scheduler.auto_credit import lancer_auto_credit
+from src.scheduler.flush_statistiques import lancer_flush_statistiques
+from src.scheduler.nettoyage_tables import lancer_nettoyage_tables
+from src.dao.accumulateur_statistique import AccumulateurStatistique
+from src.dao.db_connection import DBConnection
+from src.dao.file_ecriture import FileEcriture
+from src.service.joueur_service import JoueurService
+from src.service.equite_service import EquiteService
+from src.api.demarrage import Demarrage
+from src.business_object.cache_evaluation import CacheEvaluations
+from src.business_object.evaluateur import EvaluateurMain
+from src.business_object.outs import statistiques_cache as statistiques_cache_outs
+from src.utils.log_decorator import Traces
 
 
 # Création de l'application FastAPI
@@ -15,17 +30,37 @@ app = FastAPI(
     root_path="/proxy/8000"
 )
 
+scheduler_statistiques = None
+tache_nettoyage = None
+demarrage = Demarrage()
+
 
 @app.on_event("startup")
-def init_tables_et_parties():
+async def lancer_initialisation():
     """
-    Initialisation des tables et parties à l'ouverture du serveur.
+    Initialisation longue lancée en arrière-plan : le serveur répond immédiatement,
+    /sante/pret indique quand il est prêt.
     """
-    global tables
-    print("Initialisation des tables et parties...")
+    print("Initialisation des tables, de la base et du crédit automatique en arrière-plan...")
+    demarrage.lancer([
+        ("base_de_donnees", DBConnection, True),
+        ("tables", tables_service.prechauffer, True),
+        # facultatif : sans la table, seul le conseil préflop est indisponible
+        ("equite_preflop", EquiteService().charger_table_preflop, False),
+        # facultatif : le crédit automatique est de toute façon relancé chaque jour
+        ("credit_auto", JoueurService().credit_auto, False),
+    ])
 
-    for id_table, partie in tables_service.parties.items():
-        print(f"Table {id_table} créée avec partie associée: {partie is not None}")
+
+@app.on_event("startup")
+def activer_cache_evaluations():
+    """
+    Cache des évaluations de mains partagé par toutes les tables
+    (EVALUATEUR_CACHE_TAILLE entrées, 0 pour le désactiver).
+    """
+    EvaluateurMain.activer_cache(
+        int(os.environ.get("EVALUATEUR_CACHE_TAILLE", CacheEvaluations.TAILLE_DEFAUT))
+    )
 
 
 @app.on_event("startup")
@@ -35,7 +70,37 @@ def demarrer_scheduler():
     """
     global scheduler
     print("[SCHEDULER] Démarrage du créditage automatique")
-    scheduler = lancer_auto_credit()
+    # le rattrapage au démarrage fait partie de l'initialisation en arrière-plan
+    scheduler = lancer_auto_credit(rattrapage=False)
+
+
+@app.on_event("startup")
+def demarrer_flush_statistiques():
+    """
+    Écriture périodique des statistiques accumulées pendant les parties.
+    """
+    global scheduler_statistiques
+    print("[SCHEDULER] Démarrage de l'écriture périodique des statistiques")
+    scheduler_statistiques = lancer_flush_statistiques()
+
+
+@app.on_event("startup")
+async def demarrer_nettoyage_tables():
+    """
+    Fermeture périodique des tables ouvertes en plus et restées vides, service de la file
+    d'attente et regroupement des joueurs seuls, dans la boucle du serveur.
+    """
+    global tache_nettoyage
+    print("[SCHEDULER] Démarrage du nettoyage des tables et de la file d'attente")
+    tache_nettoyage = lancer_nettoyage_tables(tables_service, verrou_table, matchmaking=matchmaking)
+
+
+@app.on_event("shutdown")
+async def arreter_initialisation():
+    """
+    Abandon de l'initialisation si elle n'est pas terminée à la fermeture du serveur.
+    """
+    await demarrage.arreter()
 
 
 @app.on_event("shutdown")
@@ -49,6 +114,29 @@ def arreter_scheduler():
         scheduler.shutdown()
 
 
+@app.on_event("shutdown")
+def arreter_nettoyage_tables():
+    """
+    Arrêt du nettoyage des tables à la fermeture du serveur.
+    """
+    global tache_nettoyage
+    if tache_nettoyage:
+        tache_nettoyage.cancel()
+
+
+@app.on_event("shutdown")
+def vider_statistiques():
+    """
+    Arrêt de l'écriture périodique et écriture des dernières statistiques en attente.
+    """
+    global scheduler_statistiques
+    if scheduler_statistiques:
+        scheduler_statistiques.shutdown()
+    print("[STATISTIQUES] Écriture des statistiques en attente")
+    FileEcriture().attendre(timeout=10)
+    AccumulateurStatistique().vider()
+
+
 # Middleware CORS si tu comptes faire des requêtes depuis un front
 origins = [
     "http://localhost",
@@ -76,6 +164,44 @@ def root():
     return {"message": "Bienvenue sur Tapis!"}
 
 
+# Le processus répond : le serveur est en vie
+@app.get("/sante/vivant")
+def sante_vivant():
+    return {"statut": "ok"}
+
+
+# Le serveur a fini de s'initialiser et peut recevoir des joueurs
+@app.get("/sante/pret")
+def sante_pret():
+    rapport = demarrage.rapport()
+    return JSONResponse(rapport, status_code=200 if rapport["pret"] else 503)
+
+
+# Indicateurs du pool de connexions à la base de données
+@app.get("/metriques/db")
+def metriques_db():
+    try:
+        return DBConnection().metriques()
+    except Exception as e:
+        raise HTTPException(status_code=503, detail=f"Base de données indisponible : {e}")
+
+
+# Durées d'exécution mesurées par méthode (décorateur @log)
+@app.get("/metriques/methodes")
+def metriques_methodes():
+    return Traces.resume()
+
+
+# Efficacité du cache des évaluations de mains, et de celui des outs
+@app.get("/metriques/evaluations")
+def metriques_evaluations():
+    if EvaluateurMain.cache is None:
+        evaluations = {"actif": False}
+    else:
+        evaluations = {"actif": True, **EvaluateurMain.cache.statistiques()}
+    return {**evaluations, "outs": statistiques_cache_outs()}
+
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(
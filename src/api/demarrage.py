@@ -0,0 +1,65 @@
+import asyncio
+import logging
+import time
+
+
+class Demarrage:
+    """
+    Suivi de l'initialisation lancée en arrière-plan au démarrage du serveur.
+
+    Le serveur répond dès son lancement ; les étapes longues (connexion à la base,
+    préparation des tables, rattrapage du crédit automatique) s'exécutent dans des threads
+    et leur avancement est consultable. Le serveur est prêt quand toutes les étapes
+    obligatoires ont réussi.
+    """
+
+    def __init__(self):
+        self.etapes: dict[str, dict] = {}
+        self.tache: asyncio.Task | None = None
+
+    def lancer(self, etapes: list[tuple[str, object, bool]]) -> asyncio.Task:
+        """
+        Lance les étapes, dans l'ordre, sans attendre leur fin.
+
+        Parameters
+        ----------
+        etapes : list[tuple[str, callable, bool]]
+            nom de l'étape, fonction bloquante à exécuter, True si l'étape est obligatoire
+            pour que le serveur soit prêt
+        """
+        for nom, _, obligatoire in etapes:
+            self.etapes[nom] = {"statut": "en_attente", "obligatoire": obligatoire}
+        self.tache = asyncio.get_running_loop().create_task(self._executer(etapes))
+        return self.tache
+
+    async def _executer(self, etapes) -> None:
+        for nom, fonction, _ in etapes:
+            etape = self.etapes[nom]
+            etape["statut"] = "en_cours"
+            debut = time.perf_counter()
+            try:
+                etape["resultat"] = await asyncio.to_thread(fonction)
+                etape["statut"] = "ok"
+            except Exception as e:
+                # une étape en échec n'empêche pas les suivantes
+                logging.exception(e)
+                etape["statut"] = "echec"
+                etape["erreur"] = str(e)
+            etape["duree_s"] = round(time.perf_counter() - debut, 3)
+
+    def pret(self) -> bool:
+        return bool(self.etapes) and all(
+            e["statut"] == "ok" for e in self.etapes.values() if e["obligatoire"]
+        )
+
+    def rapport(self) -> dict:
+        return {"pret": self.pret(), "etapes": self.etapes}
+
+    async def arreter(self) -> None:
+        """Abandonne les étapes restantes (l'étape en cours finit dans son thread)."""
+        if self.tache and not self.tache.done():
+            self.tache.cancel()
+            try:
+                await self.tache
+            except asyncio.CancelledError:
+                pass
@@ -0,0 +1,76 @@
+import asyncio
+import json
+
+# Délai entre deux commentaires de maintien de connexion (secondes)
+DELAI_MAINTIEN = 15
+# Nombre d'états gardés pour un client lent : au-delà, les plus anciens sont abandonnés
+TAILLE_FILE = 32
+# déposé dans la file quand la table de la partie est fermée
+FERMEE = object()
+
+
+def evenement_sse(etat: dict) -> str:
+    """Formate un état de partie en événement Server-Sent Events."""
+    return f"id: {etat['version']}\nevent: etat\ndata: {json.dumps(etat)}\n\n"
+
+
+def evenement_fermeture(id_partie: int) -> str:
+    """Dernier événement du flux : la table de la partie a été fermée."""
+    return f"event: fermee\ndata: {json.dumps({'id_partie': id_partie})}\n\n"
+
+
+def _deposer(file: asyncio.Queue, etat: dict) -> None:
+    if file.full():
+        # seul le dernier état compte pour le client : on oublie le plus ancien
+        file.get_nowait()
+    file.put_nowait(etat)
+
+
+async def flux_etat(partie, delai_maintien: float = DELAI_MAINTIEN, tables_service=None):
+    """
+    Générateur des événements SSE d'une partie.
+
+    Envoie d'abord l'état courant, puis un événement à chaque changement publié par la
+    partie (action, nouvelle rue, abattage, vote pour rejouer). Les changements peuvent
+    être publiés depuis un autre thread : ils sont remis à la boucle d'événements par
+    call_soon_threadsafe.
+    Si le pool de tables est donné, la fermeture de la table envoie un événement fermee
+    et termine le flux.
+    """
+    boucle = asyncio.get_running_loop()
+    file = asyncio.Queue(maxsize=TAILLE_FILE)
+
+    def rappel(etat: dict) -> None:
+        try:
+            boucle.call_soon_threadsafe(_deposer, file, etat)
+        except RuntimeError:
+            # boucle fermée : le client est parti
+            pass
+
+    def fermeture(id_table: int) -> None:
+        if id_table == partie.id:
+            rappel(FERMEE)
+
+    partie.abonner(rappel)
+    if tables_service is not None:
+        tables_service.abonner_fermeture(fermeture)
+    try:
+        if tables_service is not None and partie.id not in tables_service.blinds_tables:
+            # table fermée avant l'abonnement
+            yield evenement_fermeture(partie.id)
+            return
+        yield evenement_sse(partie.etat_publie())
+        while True:
+            try:
+                etat = await asyncio.wait_for(file.get(), timeout=delai_maintien)
+            except asyncio.TimeoutError:
+                yield ": maintien\n\n"
+                continue
+            if etat is FERMEE:
+                yield evenement_fermeture(partie.id)
+                return
+            yield evenement_sse(etat)
+    finally:
+        partie.desabonner(rappel)
+        if tables_service is not None:
+            tables_service.desabonner_fermeture(fermeture)
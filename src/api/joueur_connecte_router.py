@@ -1,9 +1,13 @@
-from fastapi import APIRouter, HTTPException, status
+import asyncio
+
+from fastapi import APIRouter, HTTPException, Query, status
 from pydantic import BaseModel
+from src.business_object.joueurs import Joueur
 from src.dao.joueur_dao import JoueurDao
 from src.dao.statistique_dao import StatistiqueDao
 from src.service.joueur_service import JoueurService
-from src.api.var_utiles import tables_service
+from src.service.classement_service import ClassementService
+from src.api.var_utiles import tables_service, matchmaking, verrou_table
 
 router = APIRouter(prefix="/joueur_connecte", tags=["joueur_connecte"])
 
@@ -23,6 +27,14 @@ class TableRejointe(BaseModel):
     message: str
 
 
+# Modèle de sortie pour la file de placement
+class PlaceFile(BaseModel):
+    statut: str
+    id_table: int | None = None
+    position: int | None = None
+    message: str
+
+
 # Endpoint GET /joueur_connecte/code_parrainage
 @router.get("/code_parrainage", response_model=str)
 def code_parrainage_joueur(pseudo: str):
@@ -47,34 +59,13 @@ def code_parrainage_joueur(pseudo: str):
 def stats_joueur(pseudo: str):
     """
     Endpoint de récupération de ses statistiques par un joueur.
-    Met à jour le meilleur classement si le joueur a une meilleure place dans le classement des
-    portefeuilles.
+    Le meilleur classement est tenu à jour après chaque main et périodiquement par le
+    scheduler : il n'est plus recalculé ici.
     """
-
-    dao_stat = StatistiqueDao()
-    dao_joueur = JoueurDao()
-
-    # Récupérer les statistiques existantes
-    statistiques = dao_stat.trouver_statistiques_par_id(pseudo)
+    statistiques = StatistiqueDao().trouver_statistiques_par_id(pseudo)
     if not statistiques:
         raise HTTPException(status_code=401, detail="Joueur inconnu ou n'ayant pas de statistiques")
 
-    # Calculer le classement actuel par portefeuille
-    classement = dao_joueur.classement_par_portefeuille()
-    for i, joueur in enumerate(classement, start=1):
-        if joueur["pseudo"] == pseudo:
-            classement_actuel = i
-            break
-    else:
-        classement_actuel = None
-
-    # Mettre à jour le meilleur classement si nécessaire
-    if classement_actuel is not None:
-        meilleur = statistiques.get("meilleur_classement")
-        if meilleur is None or classement_actuel < meilleur:
-            dao_stat.mettre_a_jour_statistique(pseudo, "meilleur_classement", classement_actuel)
-            statistiques["meilleur_classement"] = classement_actuel
-
     return statistiques
 
 
@@ -94,22 +85,42 @@ def portefeuille_joueur(pseudo: str):
 
 # Endpoint GET /joueur_connecte/voir_classement
 @router.get("/voir_classement", response_model=list[dict])
-def voir_classement_joueur():
+def voir_classement_joueur(
+    limit: int = Query(50, ge=1, le=500), offset: int = Query(0, ge=0)
+):
     """
-    Endpoint permettant à un joueur de voir le classement.
+    Endpoint permettant à un joueur de voir le classement, page par page.
+    Chaque ligne contient le rang, le pseudo et le portefeuille du joueur.
     """
-    classement_raw = JoueurDao().classement_par_portefeuille(limit=None)
-    classement = [dict(row) for row in classement_raw]
-    return classement
+    return ClassementService().page(limit=limit, offset=offset)
+
+
+# Endpoint GET /joueur_connecte/mon_classement
+@router.get("/mon_classement", response_model=dict)
+def mon_classement(pseudo: str):
+    """
+    Endpoint renvoyant le rang d'un joueur dans le classement des portefeuilles.
+    """
+    rang = ClassementService().rang_joueur(pseudo)
+    if rang is None:
+        raise HTTPException(status_code=401, detail="Pseudo inconnu")
+    return rang
 
 
 # Endpoint POST /joueur_connecte/rejoindre_table
 @router.post("/rejoindre_table", response_model=TableRejointe)
-def rejoindre_table_joueur(pseudo: str, id_table: int):
+async def rejoindre_table_joueur(pseudo: str, id_table: int):
     """
     Endpoint permettant à un joueur de rejoindre une table.
     """
-    succes_action, etat, message_action = tables_service.rejoindre_table(pseudo, id_table)
+    if id_table not in tables_service.blinds_tables:
+        return TableRejointe(succes=False, message=f"La table {id_table} n'existe pas.")
+    # seule la lecture du portefeuille en base est faite dans un thread
+    solde = await asyncio.to_thread(tables_service.lire_solde, pseudo)
+    async with verrou_table(id_table):
+        succes_action, etat, message_action = tables_service.asseoir(
+            Joueur(pseudo, solde), id_table
+        )
     reponse = TableRejointe(
         succes=succes_action,
         message=message_action
@@ -117,6 +128,31 @@ def rejoindre_table_joueur(pseudo: str, id_table: int):
     return reponse
 
 
+# Endpoint POST /joueur_connecte/rejoindre_file
+@router.post("/rejoindre_file", response_model=PlaceFile)
+async def rejoindre_file(pseudo: str, blind: int | None = None):
+    """
+    Endpoint plaçant le joueur à une table de son niveau de blind, ou en file d'attente.
+    À rappeler tant que le statut est "en_attente" : la réponse donne la position dans la
+    file, puis la table attribuée.
+    """
+    # seule la lecture du portefeuille en base est faite dans un thread
+    solde = await asyncio.to_thread(tables_service.lire_solde, pseudo)
+    resultat = await matchmaking.rejoindre_file(
+        Joueur(pseudo, solde), blind or tables_service.blind
+    )
+    return PlaceFile(**resultat)
+
+
+# Endpoint POST /joueur_connecte/quitter_file
+@router.post("/quitter_file", status_code=status.HTTP_204_NO_CONTENT)
+async def quitter_file(pseudo: str):
+    """
+    Retire le joueur de la file d'attente.
+    """
+    await matchmaking.quitter_file(pseudo)
+
+
 # Endpoint GET /joueur_connecte/voir_table
 @router.get("/voir_table", response_model=TableSortie)
 def voir_table(id_table: int):
@@ -145,11 +181,21 @@ def voir_tables():
         etat.append({
             "id": table["id"],
             "nb_joueurs": table["nb_joueurs"],
-            "blind": table["blind"]
+            "blind": table["blind"],
+            "places_max": table["places_max"],
         })
     return etat
 
 
+# Endpoint GET /joueur_connecte/voir_niveaux
+@router.get("/voir_niveaux", response_model=list[dict])
+def voir_niveaux():
+    """
+    Renvoie l'occupation de chaque niveau de blind (tables, joueurs assis, places).
+    """
+    return tables_service.occupation_niveaux()
+
+
 # Endpoint POST /joueur_connecte/deconnexion
 @router.post("/deconnexion", status_code=status.HTTP_204_NO_CONTENT)
 def deconnexion(pseudo: str):
@@ -1,7 +1,13 @@
-from fastapi import APIRouter
+import asyncio
+
+from fastapi import APIRouter, HTTPException, Response
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from src.service.partie_service import PartieService
-from src.api.var_utiles import tables_service
+from src.service.equite_service import EquiteService
+from src.service.outs_service import OutsService
+from src.api.var_utiles import tables_service, verrou_table
+from src.api.diffusion import flux_etat
 
 router = APIRouter(prefix="/joueur_en_jeu", tags=["joueur_en_jeu"])
 
@@ -20,285 +26,257 @@ class RetourPartie(BaseModel):
     joueurs: list[dict]  # contient : pseudo, solde, mise, actif
     board: list[str]
     pot: int
-    pots_secondaires: dict
+    pots_secondaires: list[dict]  # montant et pseudos éligibles de chaque pot secondaire
     mise_max: int
     joueur_courant: str | None
     finie: bool  # True si la partie est terminée
     resultats: list[dict]  # liste des gagnants avec info sur leur main et kickers
     rejouer: dict[str, bool | None]
     liste_attente: list[dict]
+    deplacements: dict[str, int] = {}  # table rejointe par les joueurs déplacés par la file
+    version: int = 0  # numéro du dernier changement, le même que dans le flux
     message_retour: str
 
 
+# Modèle de sortie des changements de la partie depuis une version connue du client
+class RetourChangements(BaseModel):
+    id_partie: int
+    version: int
+    complet: bool  # True si changements contient l'état entier (version trop ancienne)
+    changements: dict  # champs de RetourPartie modifiés, avec leur nouvelle valeur
+
+
+# Modèle de sortie pour l'équité des joueurs à tapis
+class RetourEquite(BaseModel):
+    id_partie: int
+    mode: str  # "exact" ou "monte_carlo"
+    nb_tirages: int
+    board: list[str]
+    joueurs: dict[str, dict]  # pseudo -> victoire, egalite, defaite, equite (en %)
+
+
+# Modèle de sortie du conseil préflop
+class RetourConseil(BaseModel):
+    id_partie: int
+    pseudo: str
+    main: str  # main de départ canonique : "AKs", "QQ", "72o"...
+    nb_adversaires: int
+    equite: float  # en %, contre nb_adversaires mains aléatoires
+    part_egale: float  # part du pot (en %) si toutes les mains se valaient
+    cote: float  # part (en %) que représente la somme à suivre dans le pot après l'avoir suivie
+    conseil: str  # "relancer", "suivre" ou "se_coucher"
+
+
+# Modèle de sortie des outs d'un joueur
+class RetourOuts(BaseModel):
+    id_partie: int
+    pseudo: str
+    combinaison: str  # combinaison actuelle
+    outs: list[dict]  # carte et combinaison atteinte
+    par_combinaison: dict[str, int]  # nombre d'outs par combinaison atteinte
+    nb_outs: int
+    nb_cartes_inconnues: int
+    prochaine_carte: float  # probabilité (en %) de s'améliorer à la carte suivante
+    jusqu_a_la_river: float | None  # au flop : probabilité (en %) de s'améliorer d'ici la river
+
+
+def retour_partie(etat_partie, message: str) -> RetourPartie:
+    """Construit la réponse renvoyée au client à partir de l'état de la partie."""
+    return RetourPartie(
+        id_partie=etat_partie.id_partie,
+        tour_actuel=etat_partie.tour_actuel,
+        joueurs=etat_partie.joueurs,  # contient : pseudo, solde, mise, actif
+        board=etat_partie.board,
+        pot=etat_partie.pot,
+        pots_secondaires=etat_partie.pots_secondaires,
+        mise_max=etat_partie.mise_max,
+        joueur_courant=etat_partie.joueur_courant,
+        finie=etat_partie.finie,  # True si la partie est terminée
+        resultats=etat_partie.resultats or [],  # liste gagnants avec info sur leur main et kickers
+        rejouer=etat_partie.rejouer,
+        liste_attente=etat_partie.liste_attente,
+        deplacements=etat_partie.deplacements,
+        version=etat_partie.version,
+        message_retour=message,
+    )
+
+
+def partie_ou_404(partie: int):
+    """Renvoie la partie demandée, ou une erreur 404 si elle n'existe pas."""
+    partie_jouee = tables_service.parties.get(partie)
+    if partie_jouee is None:
+        raise HTTPException(status_code=404, detail="Partie inconnue")
+    return partie_jouee
+
+
+async def jouer_action(partie: int, action: str, *args, message_ok: str = "Action effectuée"):
+    """
+    Exécute une action de PartieService sous le verrou de la table.
+    Les actions d'une même table sont ainsi traitées une par une, sans bloquer les autres tables.
+    """
+    partie_jouee = partie_ou_404(partie)
+    async with verrou_table(partie):
+        fait, etat_partie, message = getattr(PartieService(partie_jouee), action)(*args)
+        return retour_partie(etat_partie, message_ok if fait else message)
+
+
 # Endpoint POST /joueur_en_jeu/miser
 @router.post("/miser", response_model=RetourPartie)
-def miser_joueur(payload: JoueurEnJeu, montant: int, partie: int):
+async def miser_joueur(payload: JoueurEnJeu, montant: int, partie: int):
     """
     Endpoint de l'action miser pour un joueur.
     Vérifie si le joueur peut miser le montant qu'il souhaite et le fait si possible.
     """
-
-    joueur = payload.pseudo
-    partie_jouee = tables_service.parties[partie]
-    partie_jouee_service = PartieService(partie_jouee)
-    fait, etat_partie, message = partie_jouee_service.miser(joueur, montant)
-    if fait:
-        message = "Action effectuée"
-        partie_retour = RetourPartie(
-            id_partie=etat_partie.id_partie,
-            tour_actuel=etat_partie.tour_actuel,
-            joueurs=etat_partie.joueurs,
-            board=etat_partie.board,
-            pot=etat_partie.pot,
-            pots_secondaires=etat_partie.pots_secondaires,
-            mise_max=etat_partie.mise_max,
-            joueur_courant=etat_partie.joueur_courant,
-            finie=etat_partie.finie,
-            resultats=etat_partie.resultats,
-            rejouer=etat_partie.rejouer,
-            liste_attente=etat_partie.liste_attente,
-            message_retour=message,
-        )
-        return partie_retour
-    else:
-        partie_retour = RetourPartie(
-            id_partie=etat_partie.id_partie,
-            tour_actuel=etat_partie.tour_actuel,
-            joueurs=etat_partie.joueurs,  # contient : pseudo, solde, mise, actif
-            board=etat_partie.board,
-            pot=etat_partie.pot,
-            pots_secondaires=etat_partie.pots_secondaires,
-            mise_max=etat_partie.mise_max,
-            joueur_courant=etat_partie.joueur_courant,
-            finie=etat_partie.finie,  # True si la partie est terminée
-            resultats=etat_partie.resultats,  # liste gagnants avec info sur leur main et kickers
-            rejouer=etat_partie.rejouer,
-            liste_attente=etat_partie.liste_attente,
-            message_retour=message,
-        )
-        return partie_retour
+    return await jouer_action(partie, "miser", payload.pseudo, montant)
 
 
 # Endpoint POST /joueur_en_jeu/se_coucher
 @router.post("/se_coucher", response_model=RetourPartie)
-def se_coucher_joueur(payload: JoueurEnJeu, partie: int):
+async def se_coucher_joueur(payload: JoueurEnJeu, partie: int):
     """
     Endpoint de l'action se coucher pour un joueur.
     """
-
-    joueur = payload.pseudo
-    partie_jouee = tables_service.parties[partie]
-    partie_jouee_service = PartieService(partie_jouee)
-    fait, etat_partie, message = partie_jouee_service.se_coucher(joueur)
-    if fait:
-        message = "Action effectuée"
-        partie_retour = RetourPartie(
-            id_partie=etat_partie.id_partie,
-            tour_actuel=etat_partie.tour_actuel,
-            joueurs=etat_partie.joueurs,
-            board=etat_partie.board,
-            pot=etat_partie.pot,
-            pots_secondaires=etat_partie.pots_secondaires,
-            mise_max=etat_partie.mise_max,
-            joueur_courant=etat_partie.joueur_courant,
-            finie=etat_partie.finie,
-            resultats=etat_partie.resultats,
-            rejouer=etat_partie.rejouer,
-            liste_attente=etat_partie.liste_attente,
-            message_retour=message,
-        )
-        return partie_retour
-    else:
-        partie_retour = RetourPartie(
-            id_partie=etat_partie.id_partie,
-            tour_actuel=etat_partie.tour_actuel,
-            joueurs=etat_partie.joueurs,  # contient : pseudo, solde, mise, actif
-            board=etat_partie.board,
-            pot=etat_partie.pot,
-            pots_secondaires=etat_partie.pots_secondaires,
-            mise_max=etat_partie.mise_max,
-            joueur_courant=etat_partie.joueur_courant,
-            finie=etat_partie.finie,  # True si la partie est terminée
-            resultats=etat_partie.resultats,  # liste gagnants avec info sur leur main et kickers
-            rejouer=etat_partie.rejouer,
-            liste_attente=etat_partie.liste_attente,
-            message_retour=message,
-        )
-        return partie_retour
+    return await jouer_action(partie, "se_coucher", payload.pseudo)
 
 
 # Endpoint POST /joueur_en_jeu/suivre
 @router.post("/suivre", response_model=RetourPartie)
-def suivre_joueur(payload: JoueurEnJeu, partie: int):
+async def suivre_joueur(payload: JoueurEnJeu, partie: int):
     """
     Endpoint de l'action de suivre pour un joueur.
     Vérifie si le joueur peut miser le montant qu'il souhaite et le fait si possible.
     """
-
-    joueur = payload.pseudo
-    partie_jouee = tables_service.parties[partie]
-    partie_jouee_service = PartieService(partie_jouee)
-    fait, etat_partie, message = partie_jouee_service.suivre(joueur)
-    if fait:
-        message = "Action effectuée"
-        partie_retour = RetourPartie(
-            id_partie=etat_partie.id_partie,
-            tour_actuel=etat_partie.tour_actuel,
-            joueurs=etat_partie.joueurs,
-            board=etat_partie.board,
-            pot=etat_partie.pot,
-            pots_secondaires=etat_partie.pots_secondaires,
-            mise_max=etat_partie.mise_max,
-            joueur_courant=etat_partie.joueur_courant,
-            finie=etat_partie.finie,
-            resultats=etat_partie.resultats,
-            rejouer=etat_partie.rejouer,
-            liste_attente=etat_partie.liste_attente,
-            message_retour=message,
-        )
-        return partie_retour
-    else:
-        partie_retour = RetourPartie(
-            id_partie=etat_partie.id_partie,
-            tour_actuel=etat_partie.tour_actuel,
-            joueurs=etat_partie.joueurs,  # contient : pseudo, solde, mise, actif
-            board=etat_partie.board,
-            pot=etat_partie.pot,
-            pots_secondaires=etat_partie.pots_secondaires,
-            mise_max=etat_partie.mise_max,
-            joueur_courant=etat_partie.joueur_courant,
-            finie=etat_partie.finie,  # True si la partie est terminée
-            resultats=etat_partie.resultats,  # liste gagnants avec info sur leur main et kickers
-            rejouer=etat_partie.rejouer,
-            liste_attente=etat_partie.liste_attente,
-            message_retour=message,
-        )
-        return partie_retour
+    return await jouer_action(partie, "suivre", payload.pseudo)
 
 
 # Endpoint POST /joueur_en_jeu/all_in
 @router.post("/all_in", response_model=RetourPartie)
-def all_in_joueur(payload: JoueurEnJeu, partie: int):
+async def all_in_joueur(payload: JoueurEnJeu, partie: int):
     """
     Endpoint de l'action all_in pour un joueur.
     Vérifie si le joueur peut miser le montant qu'il souhaite et le fait si possible.
     """
-
-    joueur = payload.pseudo
-    partie_jouee = tables_service.parties[partie]
-    partie_jouee_service = PartieService(partie_jouee)
-    fait, etat_partie, message = partie_jouee_service.all_in(joueur)
-    # S'assurer que resultats est une liste de dictionnaires valide
-    if etat_partie.resultats is None:
-        etat_partie.resultats = []
-    partie_jouee.etat = etat_partie
-    if fait:
-        message = "Action effectuée"
-        partie_retour = RetourPartie(
-            id_partie=etat_partie.id_partie,
-            tour_actuel=etat_partie.tour_actuel,
-            joueurs=etat_partie.joueurs,
-            board=etat_partie.board,
-            pot=etat_partie.pot,
-            pots_secondaires=etat_partie.pots_secondaires,
-            mise_max=etat_partie.mise_max,
-            joueur_courant=etat_partie.joueur_courant,
-            finie=etat_partie.finie,
-            resultats=etat_partie.resultats,
-            rejouer=etat_partie.rejouer,
-            liste_attente=etat_partie.liste_attente,
-            message_retour=message,
-        )
-        return partie_retour
-    else:
-        partie_retour = RetourPartie(
-            id_partie=etat_partie.id_partie,
-            tour_actuel=etat_partie.tour_actuel,
-            joueurs=etat_partie.joueurs,  # contient : pseudo, solde, mise, actif
-            board=etat_partie.board,
-            pot=etat_partie.pot,
-            pots_secondaires=etat_partie.pots_secondaires,
-            mise_max=etat_partie.mise_max,
-            joueur_courant=etat_partie.joueur_courant,
-            finie=etat_partie.finie,  # True si la partie est terminée
-            resultats=etat_partie.resultats,  # liste gagnants avec info sur leur main et kickers
-            rejouer=etat_partie.rejouer,
-            liste_attente=etat_partie.liste_attente,
-            message_retour=message,
-        )
-        return partie_retour
+    return await jouer_action(partie, "all_in", payload.pseudo)
 
 
 # Endpoint GET /joueur_en_jeu/voir_etat_partie
-@router.get("/voir_etat_partie", response_model=RetourPartie)
-def voir_etat_partie(partie: int):
+@router.get(
+    "/voir_etat_partie",
+    response_model=RetourPartie | RetourChangements,
+    responses={304: {"description": "Aucun changement depuis la version since"}},
+)
+async def voir_etat_partie(partie: int, since: int | None = None):
     """
     Endpoint de l'action voir état de la partie pour un joueur.
-    Renvoie l'état de la partie.
+    Renvoie l'état de la partie ou, si since est donné, seulement les champs modifiés
+    depuis cette version (réponse 304 si rien n'a changé).
     """
-    partie_jouee = tables_service.parties[partie]
-    partie_jouee_service = PartieService(partie_jouee)
-    fait, etat_partie, message = partie_jouee_service.voir_etat_partie()
-    if fait:
-        message = "Action effectuée"
-        partie_retour = RetourPartie(
-            id_partie=etat_partie.id_partie,
-            tour_actuel=etat_partie.tour_actuel,
-            joueurs=etat_partie.joueurs,
-            board=etat_partie.board,
-            pot=etat_partie.pot,
-            pots_secondaires=etat_partie.pots_secondaires,
-            mise_max=etat_partie.mise_max,
-            joueur_courant=etat_partie.joueur_courant,
-            finie=etat_partie.finie,
-            resultats=etat_partie.resultats,
-            rejouer=etat_partie.rejouer,
-            liste_attente=etat_partie.liste_attente,
-            message_retour=message,
-        )
-        return partie_retour.dict()
-    else:
-        partie_retour = RetourPartie(
-            id_partie=etat_partie.id_partie,
-            tour_actuel=etat_partie.tour_actuel,
-            joueurs=etat_partie.joueurs,  # contient : pseudo, solde, mise, actif
-            board=etat_partie.board,
-            pot=etat_partie.pot,
-            pots_secondaires=etat_partie.pots_secondaires,
-            mise_max=etat_partie.mise_max,
-            joueur_courant=etat_partie.joueur_courant,
-            finie=etat_partie.finie,  # True si la partie est terminée
-            resultats=etat_partie.resultats,  # liste gagnants avec info sur leur main et kickers
-            rejouer=etat_partie.rejouer,
-            liste_attente=etat_partie.liste_attente,
-            message_retour=message,
-        )
-        return partie_retour
+    if since is None:
+        return await jouer_action(partie, "voir_etat_partie")
+
+    partie_jouee = partie_ou_404(partie)
+    async with verrou_table(partie):
+        changements = partie_jouee.changements_depuis(since)
+    if changements is None:
+        return Response(status_code=304)
+    return RetourChangements(id_partie=partie, **changements)
+
+
+# Endpoint GET /joueur_en_jeu/flux
+@router.get("/flux")
+async def flux_partie(partie: int):
+    """
+    Flux Server-Sent Events de la partie.
+    Envoie l'état courant puis un nouvel état à chaque changement, ce qui évite au client
+    d'interroger voir_etat_partie en boucle.
+    """
+    partie_jouee = partie_ou_404(partie)
+    return StreamingResponse(
+        flux_etat(partie_jouee, tables_service=tables_service),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 
 # Endpoint GET /joueur_en_jeu/voir_mes_cartes
 @router.get("/voir_mes_cartes", response_model=str)
-def voir_mes_cartes(partie: int, pseudo: str):
+async def voir_mes_cartes(partie: int, pseudo: str):
     """
     Endpoint pour que le joueur puisse voir ses cartes.
     Renvoie la liste des cartes du joueur.
     """
-    table = tables_service.tables[partie]
-    for j in table.joueurs:
-        if j.pseudo == pseudo:
-            liste_cartes = [str(c) for c in j.main]
-            main = liste_cartes[0] + "| " + liste_cartes[1]
-            return main
-    return "Le joueur n'a pas été trouvé à la table"
+    partie_jouee = partie_ou_404(partie)
+    async with verrou_table(partie):
+        j = partie_jouee.table.joueur(pseudo)
+        if j is None:
+            return "Le joueur n'a pas été trouvé à la table"
+        liste_cartes = [str(c) for c in j.main]
+    if len(liste_cartes) < 2:
+        return "Le joueur n'a pas de cartes"
+    main = liste_cartes[0] + "| " + liste_cartes[1]
+    return main
+
+
+# Endpoint GET /joueur_en_jeu/equite
+@router.get("/equite", response_model=RetourEquite)
+async def equite_partie(partie: int, nb_cartes_board: int | None = None, nb_tirages: int = 20000):
+    """
+    Endpoint renvoyant l'équité des joueurs lorsque tous sont à tapis.
+    nb_cartes_board permet de consulter l'équité au preflop (0), au flop (3) ou à la turn (4)
+    une fois le board déroulé.
+    """
+    partie_jouee = partie_ou_404(partie)
+    if nb_tirages <= 0:
+        raise HTTPException(status_code=400, detail="Le nombre de tirages doit être positif")
+    async with verrou_table(partie):
+        # calcul NumPy dans un thread : la boucle d'événements continue de servir les autres tables
+        fait, equite, message = await asyncio.to_thread(
+            EquiteService().equite_partie, partie_jouee, nb_cartes_board, nb_tirages
+        )
+    if not fait:
+        raise HTTPException(status_code=400, detail=message)
+    return RetourEquite(id_partie=partie, **equite)
+
+
+# Endpoint GET /joueur_en_jeu/conseil
+@router.get("/conseil", response_model=RetourConseil)
+async def conseil_preflop(partie: int, pseudo: str):
+    """
+    Endpoint renvoyant, au préflop, l'équité de la main du joueur (lue dans la table
+    précalculée, sans calcul) et l'action conseillée.
+    """
+    partie_jouee = partie_ou_404(partie)
+    fait, conseil, message = EquiteService().conseil_preflop(partie_jouee, pseudo)
+    if not fait:
+        raise HTTPException(status_code=400, detail=message)
+    return RetourConseil(id_partie=partie, pseudo=pseudo, **conseil)
+
+
+# Endpoint GET /joueur_en_jeu/outs
+@router.get("/outs", response_model=RetourOuts)
+async def outs_joueur(partie: int, pseudo: str):
+    """
+    Endpoint renvoyant, au flop et à la turn, les cartes qui améliorent la combinaison
+    du joueur et ses probabilités de s'améliorer (calcul gardé en cache par main et board).
+    """
+    partie_jouee = partie_ou_404(partie)
+    async with verrou_table(partie):
+        fait, outs, message = OutsService().outs_joueur(partie_jouee, pseudo)
+    if not fait:
+        raise HTTPException(status_code=400, detail=message)
+    return RetourOuts(id_partie=partie, pseudo=pseudo, **outs)
 
 
 # Endpoint POST /joueur_en_jeu/quitter_table
 @router.post("/quitter_table", response_model=str)
-def quitter_table_joueur(pseudo: str, id_table: int):
+async def quitter_table_joueur(pseudo: str, id_table: int):
     """
     Endpoint permettant à un joueur de quitter une table.
     """
-    quitter = tables_service.quitter_table(pseudo, id_table)
+    if id_table not in tables_service.blinds_tables:
+        raise HTTPException(status_code=404, detail="Table inconnue")
+    async with verrou_table(id_table):
+        quitter = tables_service.quitter_table(pseudo, id_table)
     if quitter == 1:
         return "Table quittée"
     else:
@@ -307,45 +285,10 @@ def quitter_table_joueur(pseudo: str, id_table: int):
 
 # Endpoint POST /joueur_en_jeu/decision_rejouer
 @router.post("/decision_rejouer", response_model=RetourPartie)
-def decision_rejouer(pseudo: str, veut_rejouer: bool, partie: int):
+async def decision_rejouer(pseudo: str, veut_rejouer: bool, partie: int):
     """
     Endpoint pour qu'un joueur indique s'il veut rejouer ou quitter après une main.
     """
-    partie_jouee = tables_service.parties[partie]
-    partie_jouee_service = PartieService(partie_jouee)
-    fait, etat_partie, message = partie_jouee_service.decision_rejouer(pseudo, veut_rejouer)
-    if fait:
-        message = "Réponse enregistrée"
-        partie_retour = RetourPartie(
-            id_partie=etat_partie.id_partie,
-            tour_actuel=etat_partie.tour_actuel,
-            joueurs=etat_partie.joueurs,
-            board=etat_partie.board,
-            pot=etat_partie.pot,
-            pots_secondaires=etat_partie.pots_secondaires,
-            mise_max=etat_partie.mise_max,
-            joueur_courant=etat_partie.joueur_courant,
-            finie=etat_partie.finie,
-            resultats=etat_partie.resultats,
-            rejouer=etat_partie.rejouer,
-            liste_attente=etat_partie.liste_attente,
-            message_retour=message,
-        )
-        return partie_retour
-    else:
-        partie_retour = RetourPartie(
-            id_partie=etat_partie.id_partie,
-            tour_actuel=etat_partie.tour_actuel,
-            joueurs=etat_partie.joueurs,
-            board=etat_partie.board,
-            pot=etat_partie.pot,
-            pots_secondaires=etat_partie.pots_secondaires,
-            mise_max=etat_partie.mise_max,
-            joueur_courant=etat_partie.joueur_courant,
-            finie=etat_partie.finie,
-            resultats=etat_partie.resultats,
-            rejouer=etat_partie.rejouer,
-            liste_attente=etat_partie.liste_attente,
-            message_retour=message,
-        )
-        return partie_retour
+    return await jouer_action(
+        partie, "decision_rejouer", pseudo, veut_rejouer, message_ok="Réponse enregistrée"
+    )
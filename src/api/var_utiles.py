@@ -1,5 +1,37 @@
+import asyncio
+
 from src.service.table_service import TableService
+from src.service.matchmaking_service import MatchmakingService
 
-tables_service = TableService()
+# niveaux de blind lus dans TABLES_NIVEAUX (par défaut 10 tables à 20)
+tables_service = TableService(niveaux=TableService.niveaux_depuis_env())
 
 scheduler = None
+
+# Un verrou par table : les actions sur une même partie sont traitées l'une après l'autre,
+# les tables restent indépendantes entre elles. Le verrou d'une table fermée est oublié.
+verrous_tables: dict[int, asyncio.Lock] = {}
+
+
+def verrou_table(id_table: int) -> asyncio.Lock:
+    """
+    Renvoie le verrou asyncio de la table, créé à la première demande.
+    Lève KeyError si la table n'existe pas (ou a été fermée).
+    """
+    verrou = verrous_tables.get(id_table)
+    if verrou is None:
+        if id_table not in tables_service.blinds_tables:
+            raise KeyError(id_table)
+        verrou = verrous_tables[id_table] = asyncio.Lock()
+    return verrou
+
+
+def oublier_verrou(id_table: int) -> None:
+    """Supprime le verrou d'une table fermée."""
+    verrous_tables.pop(id_table, None)
+
+
+tables_service.abonner_fermeture(oublier_verrou)
+
+# la file de placement prend les mêmes verrous que les routes
+matchmaking = MatchmakingService(tables_service, verrou_table)
@@ -0,0 +1,66 @@
+import argparse
+import random
+import time
+
+from src.business_object.cartes import Deck
+from src.business_object.evaluateur import EvaluateurMain
+from src.business_object import evaluateur_tables
+
+
+def generer_mains(nb_mains: int, nb_cartes: int = 7, graine: int = 0,
+                  distinctes: int | None = None) -> list[list]:
+    """
+    Tire nb_mains mains aléatoires de nb_cartes cartes,
+    parmi distinctes mains différentes si précisé (pour mesurer le cache)
+    """
+    random.seed(graine)
+    deck = Deck()
+    deck.remplir()
+    if distinctes is None:
+        return [random.sample(deck.cartes, nb_cartes) for _ in range(nb_mains)]
+    tirees = [random.sample(deck.cartes, nb_cartes) for _ in range(distinctes)]
+    return [random.choice(tirees) for _ in range(nb_mains)]
+
+
+def mesurer(mains: list[list], moteur: str) -> float:
+    """Évalue toutes les mains avec un moteur et renvoie le nombre de mains par seconde"""
+    debut = time.perf_counter()
+    for cartes in mains:
+        EvaluateurMain(cartes, moteur=moteur).evalue_main()
+    duree = time.perf_counter() - debut
+    return len(mains) / duree
+
+
+def lancer(nb_mains: int, nb_cartes: int, cache: int = 0,
+           distinctes: int | None = None) -> dict[str, float]:
+    """Compare les moteurs d'évaluation et affiche le débit de chacun"""
+    mains = generer_mains(nb_mains, nb_cartes, distinctes=distinctes)
+
+    debut = time.perf_counter()
+    evaluateur_tables.table_couleurs()
+    evaluateur_tables.table_multiensembles()
+    print(f"Construction des tables : {time.perf_counter() - debut:.2f} s")
+
+    resultats = {}
+    for moteur in EvaluateurMain.MOTEURS:
+        # cache vide pour chaque moteur : les deux partent des mêmes conditions
+        EvaluateurMain.activer_cache(cache)
+        resultats[moteur] = mesurer(mains, moteur)
+        print(f"{moteur:<10} : {resultats[moteur]:>12,.0f} mains/s")
+        if EvaluateurMain.cache is not None:
+            print(f"{'':<10}   cache : {EvaluateurMain.cache.statistiques()}")
+    EvaluateurMain.activer_cache(None)
+    print(f"Accélération : x{resultats['tables'] / resultats['classique']:.1f}")
+    return resultats
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark des moteurs d'évaluation des mains")
+    parser.add_argument("--mains", type=int, default=50_000, help="nombre de mains à évaluer")
+    parser.add_argument("--cartes", type=int, default=7, choices=(5, 6, 7))
+    parser.add_argument("--cache", type=int, default=0,
+                        help="taille du cache des évaluations (0 : sans cache)")
+    parser.add_argument("--distinctes", type=int, default=None,
+                        help="nombre de mains différentes parmi les mains évaluées")
+    args = parser.parse_args()
+    lancer(args.mains, args.cartes, args.cache, args.distinctes)
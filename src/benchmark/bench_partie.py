@@ -0,0 +1,39 @@
+import argparse
+import os
+
+from src.simulation.bots import STRATEGIES
+from src.simulation.simulateur import Simulateur
+
+
+def lancer(nb_mains: int, nb_tables: int, joueurs_par_table: int, strategie: str,
+           graine: int = 0, echauffement: int = 200, profil_memoire: bool = False,
+           nb_processus: int = 1) -> dict:
+    """Joue des mains entre bots sans base de données et affiche le débit du moteur de jeu"""
+    simulateur = Simulateur(nb_tables, joueurs_par_table, strategie, graine=graine,
+                            nb_processus=nb_processus)
+    rapport = simulateur.jouer(nb_mains, profil_memoire=profil_memoire, echauffement=echauffement)
+    print(f"{rapport['mains']:,} mains, {rapport['actions']:,} actions sur {rapport['tables']} tables "
+          f"({rapport['processus']} processus) en {rapport['duree_s']} s")
+    print(f"Débit       : {rapport['mains_par_s']:>12,.0f} mains/s, "
+          f"{rapport['actions_par_s']:,.0f} actions/s")
+    print(f"Latence     : p50 {rapport['latence_p50_us']} µs, p99 {rapport['latence_p99_us']} µs")
+    print(f"Mémoire     : {rapport['blocs_conserves_par_main']} blocs conservés par main"
+          + (f", pic {rapport['memoire_max_ko']} Ko" if profil_memoire else ""))
+    print(f"Recaves     : {rapport['recaves']} (conservation des jetons vérifiée à chaque main)")
+    return rapport
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark du moteur de partie avec des bots")
+    parser.add_argument("--mains", type=int, default=100_000, help="nombre total de mains")
+    parser.add_argument("--tables", type=int, default=8)
+    parser.add_argument("--joueurs", type=int, default=5, help="joueurs par table")
+    parser.add_argument("--strategie", default="aleatoire", choices=sorted(STRATEGIES))
+    parser.add_argument("--graine", type=int, default=0)
+    parser.add_argument("--echauffement", type=int, default=200, help="mains jouées avant la mesure")
+    parser.add_argument("--memoire", action="store_true", help="mesure le pic mémoire (plus lent)")
+    parser.add_argument("--processus", type=int, default=1,
+                        help=f"processus de simulation (cœurs disponibles : {os.cpu_count()})")
+    args = parser.parse_args()
+    lancer(args.mains, args.tables, args.joueurs, args.strategie, args.graine,
+           args.echauffement, args.memoire, args.processus)
@@ -0,0 +1,83 @@
+from collections import OrderedDict
+
+
+class CacheEvaluations:
+    """
+    Cache borné des évaluations de mains, du plus récemment au moins récemment utilisé.
+
+    La clé ne dépend que des valeurs présentes dans chaque couleur, les couleurs étant
+    triées : deux mains identiques à une permutation des couleurs près (As-Roi de coeur
+    sur un board à trois coeurs, ou de pique sur le même board à trois piques) ont la même
+    force et partagent la même entrée.
+
+    Le cache peut être partagé par toutes les tables d'un processus sans verrou : sous le
+    GIL, chaque opération sur le dictionnaire est atomique. Au pire, sous forte concurrence,
+    une main est évaluée deux fois ou un compteur oublie un appel.
+    """
+
+    TAILLE_DEFAUT = 100_000
+
+    def __init__(self, taille: int = TAILLE_DEFAUT) -> None:
+        if taille <= 0:
+            raise ValueError("La taille du cache doit être positive.")
+        self.taille = taille
+        self._entrees: OrderedDict[tuple, object] = OrderedDict()
+        self.succes = 0
+        self.echecs = 0
+        self.evictions = 0
+
+    @staticmethod
+    def cle(cartes) -> tuple[int, ...]:
+        """Clé canonique des cartes : masques des valeurs de chaque couleur, triés"""
+        masques = [0, 0, 0, 0]
+        for c in cartes:
+            masques[c.id // 13] |= 1 << (c.id % 13)
+        masques.sort()
+        return tuple(masques)
+
+    def obtenir(self, cartes, calculer, moteur: str | None = None):
+        """
+        Résultat mis en cache pour ces cartes (ou une permutation de leurs couleurs),
+        calculé par calculer() et ajouté au cache s'il n'y est pas.
+        Les résultats de moteurs différents sont gardés dans des entrées distinctes.
+        Le résultat est partagé entre les appelants : il ne doit pas être modifié.
+        """
+        cle = (moteur, *self.cle(cartes))
+        entrees = self._entrees
+        resultat = entrees.get(cle)
+        if resultat is not None:
+            self.succes += 1
+            try:
+                entrees.move_to_end(cle)
+            except KeyError:
+                # évincée entre-temps par un autre fil
+                pass
+            return resultat
+
+        self.echecs += 1
+        resultat = calculer()
+        entrees[cle] = resultat
+        while len(entrees) > self.taille:
+            try:
+                entrees.popitem(last=False)
+                self.evictions += 1
+            except KeyError:
+                break
+        return resultat
+
+    def statistiques(self) -> dict:
+        """Taille, succès, échecs, évictions et taux de succès (%) du cache"""
+        appels = self.succes + self.echecs
+        return {
+            "taille": len(self._entrees),
+            "taille_max": self.taille,
+            "succes": self.succes,
+            "echecs": self.echecs,
+            "evictions": self.evictions,
+            "taux_succes": round(100 * self.succes / appels, 2) if appels else 0.0,
+        }
+
+    def vider(self) -> None:
+        """Oublie toutes les entrées et remet les compteurs à zéro"""
+        self._entrees.clear()
+        self.succes = self.echecs = self.evictions = 0
@@ -1,4 +1,5 @@
 import random
+from array import array
 from enum import Enum
 
 
@@ -39,9 +40,29 @@ class combinaisons(Enum):
 
 
 class Carte:
-    def __init__(self, couleur: str, valeur: str) -> None:
-        self.couleur = couleur
-        self.valeur = valeur
+    """
+    Carte à jouer, identifiée par un entier de 0 à 51 (couleur * 13 + valeur).
+    Il n'existe qu'une seule instance par carte : Carte(couleur, valeur) renvoie toujours
+    le même objet, ce qui évite toute allocation pendant une main.
+    """
+
+    __slots__ = ("couleur", "valeur", "id")
+
+    def __new__(cls, couleur, valeur) -> "Carte":
+        couleur = _membre(couleurs, couleur)
+        valeur = _membre(valeurs, valeur)
+        return CARTES[INDICE_COULEUR[couleur] * 13 + INDICE_VALEUR[valeur]]
+
+    @classmethod
+    def depuis_id(cls, id_carte: int) -> "Carte":
+        """renvoie la carte correspondant à un identifiant entre 0 et 51"""
+        return CARTES[id_carte]
+
+    def __setattr__(self, nom, valeur) -> None:
+        raise AttributeError("Une carte ne peut pas être modifiée.")
+
+    def __reduce__(self):
+        return Carte.depuis_id, (self.id,)
 
     def __str__(self) -> str:
         return f"{self.valeur.value} de {self.couleur.value}"
@@ -50,29 +71,79 @@ class Carte:
         return f"Carte({self.valeur.value}, {self.couleur.value})"
 
 
+def _membre(enum, element):
+    """Accepte un membre de l'enum, son nom ('COEUR') ou sa valeur ('Coeur')"""
+    if isinstance(element, enum):
+        return element
+    try:
+        return enum[element]
+    except KeyError:
+        return enum(element)
+
+
+INDICE_COULEUR = {couleur: i for i, couleur in enumerate(couleurs)}
+INDICE_VALEUR = {valeur: i for i, valeur in enumerate(valeurs)}
+
+
+def _creer_carte(id_carte: int) -> Carte:
+    carte = object.__new__(Carte)
+    object.__setattr__(carte, "couleur", list(couleurs)[id_carte // 13])
+    object.__setattr__(carte, "valeur", list(valeurs)[id_carte % 13])
+    object.__setattr__(carte, "id", id_carte)
+    return carte
+
+
+# Les 52 cartes, indexées par leur identifiant
+CARTES = tuple(_creer_carte(i) for i in range(52))
+_ORDRE_INITIAL = array("B", range(52))
+
+
 class Deck:
-    def __init__(self) -> None:
-        self.cartes = []
+    """
+    Paquet de cartes stocké comme une permutation des identifiants 0..51 dans un tableau
+    préalloué : remplir et mélanger se font sur place, sans créer de nouvelles cartes.
+    Les cartes restantes occupent les `taille` premières cases, la prochaine carte tirée
+    est la dernière d'entre elles.
+    """
+
+    def __init__(self, rng: random.Random | None = None) -> None:
+        self.ids = array("B", bytes(52))
+        self.taille = 0
+        # générateur propre au paquet (tirages reproductibles), sinon le module random
+        self.rng = rng
+
+    @property
+    def cartes(self) -> list[Carte]:
+        """cartes restantes dans le deck"""
+        return [CARTES[i] for i in self.ids[:self.taille]]
 
     def remplir(self) -> None:
         """ rempli un deck avec toutes les cartes"""
-        self.cartes = [
-            Carte(couleur, valeur) for couleur in couleurs for valeur in valeurs
-            ]
+        self.ids[:] = _ORDRE_INITIAL
+        self.taille = 52
 
-    def melanger(self) -> None:
+    def melanger(self, rng: random.Random | None = None) -> None:
         """ mélange le deck"""
-        random.shuffle(self.cartes)
+        (rng or self.rng or random).shuffle(memoryview(self.ids)[:self.taille])
+
+    def tirer_id(self) -> int:
+        """tire une carte du deck et renvoie son identifiant"""
+        if self.taille < 1:
+            raise ValueError("Pas assez de cartes dans le deck.")
+        self.taille -= 1
+        return self.ids[self.taille]
 
     def tirer(self) -> Carte:
         """tire une carte du deck"""
-        if len(self.cartes) < 1:
-            raise ValueError("Pas assez de cartes dans le deck.")
-        return self.cartes.pop()
+        return CARTES[self.tirer_id()]
 
     def ajouter(self, carte: Carte) -> None:
         "ajoute une carte dans le deck"
-        self.cartes.append(carte)
+        if self.taille < len(self.ids):
+            self.ids[self.taille] = carte.id
+        else:
+            self.ids.append(carte.id)
+        self.taille += 1
 
     def __len__(self) -> int:
-        return len(self.cartes)
+        return self.taille
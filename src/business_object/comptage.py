@@ -5,10 +5,13 @@ class Comptage:
     def __init__(self) -> None:
         self.pot = 0
         self.pots_perso = {}
+        # total misé par chaque joueur depuis le début de la main (couchés compris)
+        self.contributions = {}
 
     def ajouter_pot_perso(self, joueur: Joueur, montant: int) -> None:
         "ajoute la mise au pot secondaire"""
         self.pots_perso[joueur] = self.pots_perso.get(joueur, 0) + montant
+        self.contributions[joueur] = self.contributions.get(joueur, 0) + montant
 
     def ajouter_pot(self) -> None:
         """Ajoute toutes les mises perso au pot principal et reset les mises perso"""
@@ -25,3 +28,114 @@ class Comptage:
             j.solde += part
         self.pot = 0
         self.pots_perso = {}
+        self.contributions = {}
+
+    def construire_pots(self, en_jeu: list[Joueur]) -> list[dict]:
+        """
+        Découpe les contributions en pots successifs (principal puis secondaires).
+
+        Chaque niveau de contribution distinct ferme une couche : elle contient, pour chaque
+        contributeur ayant misé au moins ce niveau, la différence avec le niveau précédent.
+        Seuls les joueurs encore en jeu ayant atteint le niveau peuvent la remporter. Les couches
+        consécutives ayant les mêmes joueurs éligibles sont fusionnées.
+
+        Parameters
+        ----------
+        en_jeu : list[Joueur]
+            joueurs qui ne se sont pas couchés
+
+        Returns
+        -------
+        list[dict]
+            pots du principal au dernier secondaire : {"montant": int, "eligibles": list[Joueur]}
+        """
+        en_jeu = set(en_jeu)
+        contributions = sorted(
+            ((montant, joueur) for joueur, montant in self.contributions.items() if montant > 0),
+            key=lambda c: c[0],
+        )
+
+        nb_contributeurs = len(contributions)
+        # nombre de joueurs en jeu parmi les contributions[i:]
+        eligibles_suffixe = [0] * (nb_contributeurs + 1)
+        for i in range(nb_contributeurs - 1, -1, -1):
+            eligibles_suffixe[i] = eligibles_suffixe[i + 1] + (contributions[i][1] in en_jeu)
+
+        couches = []  # [montant, indice du premier contributeur concerné]
+        niveau_precedent = 0
+        eligible_sorti = True
+        i = 0
+        while i < nb_contributeurs:
+            niveau = contributions[i][0]
+            montant = (niveau - niveau_precedent) * (nb_contributeurs - i)
+
+            if couches and (not eligible_sorti or eligibles_suffixe[i] == 0):
+                # mêmes joueurs éligibles, ou mise morte d'un joueur couché : même pot
+                couches[-1][0] += montant
+            else:
+                couches.append([montant, i])
+
+            eligible_sorti = False
+            while i < nb_contributeurs and contributions[i][0] == niveau:
+                eligible_sorti = eligible_sorti or contributions[i][1] in en_jeu
+                i += 1
+            niveau_precedent = niveau
+
+        return [
+            {"montant": montant, "eligibles": [j for _, j in contributions[debut:] if j in en_jeu]}
+            for montant, debut in couches
+        ]
+
+    def repartir_pots(
+        self, classement: list[list[Joueur]], ordre: list[Joueur]
+    ) -> list[dict]:
+        """
+        Attribue chaque pot à la meilleure main parmi ses joueurs éligibles.
+
+        Parameters
+        ----------
+        classement : list[list[Joueur]]
+            joueurs en jeu regroupés par main, de la meilleure à la moins bonne (égalités groupées)
+        ordre : list[Joueur]
+            ordre des joueurs à partir de la gauche du donneur : en cas de partage inégal,
+            les jetons restants reviennent un par un aux premiers gagnants dans cet ordre
+
+        Returns
+        -------
+        list[dict]
+            pour chaque pot : montant, eligibles, gagnants et gains (dict Joueur -> jetons reçus)
+        """
+        position = {j: i for i, j in enumerate(ordre)}
+        en_jeu = [j for groupe in classement for j in groupe]
+
+        attributions = []
+        for pot in self.construire_pots(en_jeu):
+            eligibles = set(pot["eligibles"])
+            gagnants = next(
+                (
+                    [j for j in groupe if j in eligibles]
+                    for groupe in classement
+                    if any(j in eligibles for j in groupe)
+                ),
+                [],
+            )
+            if not gagnants:
+                continue
+            gagnants.sort(key=lambda j: position.get(j, len(position)))
+
+            part, reste = divmod(pot["montant"], len(gagnants))
+            gains = {}
+            for rang, j in enumerate(gagnants):
+                gains[j] = part + (1 if rang < reste else 0)
+                j.solde += gains[j]
+            attributions.append({
+                "montant": pot["montant"],
+                "eligibles": pot["eligibles"],
+                "gagnants": gagnants,
+                "gains": gains,
+            })
+
+        self.pot = 0
+        self.pots_perso = {}
+        self.contributions = {}
+        return attributions
@@ -1,49 +1,98 @@
-from src.business_object.cartes import Deck
+from src.business_object.cartes import Carte, Deck
+from src.business_object.evaluateur import ResultatMain
+from src.business_object.evaluateur_tables import MainIncrementale
 from src.business_object.joueurs import Joueur
 
 
 class Distrib:
     """Distribue les cartes pour Texas Hold'em"""
 
-    def __init__(self, joueurs: list[Joueur]) -> None:
+    def __init__(self, joueurs: list[Joueur], deck: Deck | None = None) -> None:
         self.joueurs = joueurs
-        self.deck = Deck()
-        self.deck.remplir()
-        self.deck.melanger()
+        # le deck de la table est réutilisé d'une main à l'autre : rempli et mélangé sur place,
+        # au premier tirage seulement (une table sans joueurs ne mélange jamais)
+        self.deck = deck if deck is not None else Deck()
+        self._deck_pret = False
         self.flop = []
         self.turn = None
         self.river = None
         self.tour_actuel = "preflop"
+        # main de chaque joueur (pseudo), complétée à chaque carte du board distribuée
+        self.mains: dict[str, MainIncrementale] = {}
+
+    def _preparer_deck(self) -> None:
+        if not self._deck_pret:
+            self.deck.remplir()
+            self.deck.melanger()
+            self._deck_pret = True
 
     def distribuer_mains(self) -> None:
         """distribue les mains de joueurs"""
+        self._preparer_deck()
         for j in self.joueurs:
             j.reset_main()
         for _ in range(2):
             for j in self.joueurs:
                 j.recevoir_du_deck(self.deck)
+        self.mains = {j.pseudo: MainIncrementale(c.id for c in j.main) for j in self.joueurs}
         self.tour_actuel = "preflop"
 
+    def _absorber(self, cartes: list[Carte]) -> None:
+        """Ajoute les nouvelles cartes du board à la main de chaque joueur"""
+        for main in self.mains.values():
+            for c in cartes:
+                main.ajouter(c.id)
+
+    def resultat(self, pseudo: str, cartes: list[Carte] | None = None) -> ResultatMain | None:
+        """
+        Meilleure main actuelle du joueur (cartes privées et board déjà distribué).
+
+        Parameters
+        ----------
+        pseudo : str
+            joueur concerné
+        cartes : list[Carte] | None
+            cartes attendues (main puis board) : si elles ne correspondent pas à celles
+            distribuées, la main suivie n'est pas utilisable et None est renvoyé
+
+        Returns
+        -------
+        ResultatMain | None
+            None si le joueur n'a pas reçu de cartes ou si le flop n'est pas distribué
+        """
+        main = self.mains.get(pseudo)
+        if main is None or main.rang is None:
+            return None
+        if cartes is not None and [c.id for c in cartes] != main.ids:
+            return None
+        return ResultatMain.depuis_rang(main.rang)
+
     def distribuer_flop(self) -> None:
         """distribue les 3 première cartes"""
         if len(self.joueurs) <= 1:
             return
+        self._preparer_deck()
         self.deck.tirer()  # brulage
         self.flop = [self.deck.tirer() for _ in range(3)]
+        self._absorber(self.flop)
         self.tour_actuel = "flop"
 
     def distribuer_turn(self) -> None:
         """distribue la 4eme carte"""
         if len(self.joueurs) <= 1:
             return
+        self._preparer_deck()
         self.deck.tirer()  # brulage
         self.turn = self.deck.tirer()
+        self._absorber([self.turn])
         self.tour_actuel = "turn"
 
     def distribuer_river(self) -> None:
         """distribue la 4eme carte"""
         if len(self.joueurs) <= 1:
             return
+        self._preparer_deck()
         self.deck.tirer()  # brulage
         self.river = self.deck.tirer()
+        self._absorber([self.river])
         self.tour_actuel = "river"
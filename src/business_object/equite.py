@@ -0,0 +1,154 @@
+from itertools import combinations
+from math import comb
+
+import numpy as np
+
+from src.business_object.cartes import Carte
+from src.business_object.evaluateur_vectorise import rangs_mains
+
+
+class CalculateurEquite:
+    """
+    Calcule l'équité de plusieurs mains face à un board partiel.
+
+    Les cartes manquantes du board sont tirées par lots NumPy et toutes les mains
+    d'un lot sont évaluées en une seule passe. Lorsque peu de boards restent possibles
+    (turn, river), ils sont énumérés exhaustivement et le résultat est exact.
+    """
+
+    NB_TIRAGES_DEFAUT = 20000
+    TAILLE_LOT = 10000
+    # au-delà, l'énumération exhaustive est remplacée par un tirage aléatoire
+    SEUIL_EXHAUSTIF = 2000
+
+    def __init__(
+        self,
+        nb_tirages: int = NB_TIRAGES_DEFAUT,
+        taille_lot: int = TAILLE_LOT,
+        seuil_exhaustif: int = SEUIL_EXHAUSTIF,
+        graine: int | None = None,
+    ) -> None:
+        if nb_tirages <= 0:
+            raise ValueError("Le nombre de tirages doit être positif.")
+        if taille_lot <= 0:
+            raise ValueError("La taille de lot doit être positive.")
+        self.nb_tirages = nb_tirages
+        self.taille_lot = taille_lot
+        self.seuil_exhaustif = seuil_exhaustif
+        self.rng = np.random.default_rng(graine)
+
+    def calculer(
+        self, mains: list[list[Carte]], board: list[Carte], exact: bool | None = None
+    ) -> dict:
+        """
+        Équité de chaque main.
+
+        Parameters
+        ----------
+        mains : list[list[Carte]]
+            cartes privées de chaque joueur (2 cartes chacune)
+        board : list[Carte]
+            cartes communes déjà connues (0 à 5)
+        exact : bool | None
+            force (True) ou interdit (False) l'énumération exhaustive ;
+            par défaut, elle est utilisée dès que le nombre de boards possibles
+            ne dépasse pas seuil_exhaustif
+
+        Returns
+        -------
+        dict
+            mode ("exact" ou "monte_carlo"), nb_tirages et, pour chaque main,
+            les pourcentages de victoire, d'égalité, de défaite et l'équité
+        """
+        self._verifier(mains, board)
+
+        mains_ids = np.array([[c.id for c in main] for main in mains], dtype=np.int64)
+        board_ids = np.array([c.id for c in board], dtype=np.int64)
+        connues = set(mains_ids.ravel().tolist()) | set(board_ids.tolist())
+        restantes = np.array([i for i in range(52) if i not in connues], dtype=np.int64)
+        a_tirer = 5 - len(board)
+
+        nb_boards = comb(len(restantes), a_tirer)
+        if exact is None:
+            exact = nb_boards <= self.seuil_exhaustif
+
+        compteurs = np.zeros((3, len(mains)), dtype=np.float64)
+        if exact:
+            mode = "exact"
+            lots = self._lots_exhaustifs(restantes, a_tirer)
+        else:
+            mode = "monte_carlo"
+            lots = self._lots_aleatoires(restantes, a_tirer)
+
+        total = 0
+        for tirages in lots:
+            boards = np.hstack([np.broadcast_to(board_ids, (len(tirages), len(board))), tirages])
+            self._compter(mains_ids, boards, compteurs)
+            total += len(tirages)
+
+        victoires, egalites, parts = compteurs / total * 100
+        return {
+            "mode": mode,
+            "nb_tirages": total,
+            "mains": [
+                {
+                    "victoire": round(float(victoires[i]), 2),
+                    "egalite": round(float(egalites[i]), 2),
+                    "defaite": round(float(100 - victoires[i] - egalites[i]), 2),
+                    "equite": round(float(parts[i]), 2),
+                }
+                for i in range(len(mains))
+            ],
+        }
+
+    @staticmethod
+    def _verifier(mains: list[list[Carte]], board: list[Carte]) -> None:
+        if len(mains) < 2:
+            raise ValueError("Il faut au moins deux mains pour calculer une équité.")
+        if any(len(main) != 2 for main in mains):
+            raise ValueError("Chaque main doit contenir exactement 2 cartes.")
+        if len(board) > 5:
+            raise ValueError("Le board contient au plus 5 cartes.")
+        cartes = [c for main in mains for c in main] + list(board)
+        if len(set(c.id for c in cartes)) != len(cartes):
+            raise ValueError("Une même carte apparaît plusieurs fois.")
+
+    def _lots_exhaustifs(self, restantes: np.ndarray, a_tirer: int):
+        """Énumère tous les compléments de board possibles, par lots."""
+        if a_tirer == 0:
+            yield np.empty((1, 0), dtype=np.int64)
+            return
+        generateur = combinations(restantes.tolist(), a_tirer)
+        while True:
+            lot = np.array(
+                [c for _, c in zip(range(self.taille_lot), generateur)], dtype=np.int64
+            )
+            if len(lot) == 0:
+                return
+            yield lot
+
+    def _lots_aleatoires(self, restantes: np.ndarray, a_tirer: int):
+        """Tire nb_tirages compléments de board sans remise dans les cartes restantes."""
+        reste = self.nb_tirages
+        while reste > 0:
+            taille = min(self.taille_lot, reste)
+            # les a_tirer plus petites clés aléatoires désignent un tirage sans remise
+            cles = self.rng.random((taille, len(restantes)))
+            indices = np.argpartition(cles, a_tirer, axis=1)[:, :a_tirer]
+            yield restantes[indices]
+            reste -= taille
+
+    @staticmethod
+    def _compter(mains_ids: np.ndarray, boards: np.ndarray, compteurs: np.ndarray) -> None:
+        """Ajoute aux compteurs (victoires, égalités, parts de pot) les résultats d'un lot."""
+        nb_boards = len(boards)
+        rangs = np.empty((len(mains_ids), nb_boards), dtype=np.int64)
+        for i, main in enumerate(mains_ids):
+            cartes = np.hstack([np.broadcast_to(main, (nb_boards, 2)), boards])
+            rangs[i] = rangs_mains(cartes)
+
+        gagnants = rangs == rangs.max(axis=0)
+        nb_gagnants = gagnants.sum(axis=0)
+        compteurs[0] += (gagnants & (nb_gagnants == 1)).sum(axis=1)
+        compteurs[1] += (gagnants & (nb_gagnants > 1)).sum(axis=1)
+        compteurs[2] += (gagnants / nb_gagnants).sum(axis=1)
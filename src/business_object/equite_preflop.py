@@ -0,0 +1,182 @@
+import mmap
+import os
+import struct
+
+import numpy as np
+
+from src.business_object.cartes import Carte
+from src.business_object.evaluateur_vectorise import rangs_mains
+
+# Fichier livré avec le projet, produit par src.utils.genere_equite_preflop
+CHEMIN_DEFAUT = os.path.normpath(os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "..", "..", "data", "equite_preflop.bin"
+))
+
+# En-tête : signature, version, nombre maximal d'adversaires, nombre de mains, tirages par case
+ENTETE = struct.Struct("<4sBBHI")
+SIGNATURE = b"EQPF"
+VERSION = 1
+# puis, pour chaque main puis chaque nombre d'adversaires : équité en centièmes de pourcent
+VALEUR = struct.Struct("<H")
+
+NB_MAINS = 169
+# 5 places par table : au plus 4 adversaires
+NB_ADVERSAIRES_MAX = 4
+NOMS_VALEURS = "23456789TJQKA"
+
+
+def indice_main(carte1: Carte, carte2: Carte) -> int:
+    """
+    Indice (0 à 168) de la main de départ canonique : case d'une grille 13 x 13 dont la
+    diagonale contient les paires, la partie basse les mains assorties et la partie haute
+    les mains dépareillées.
+    """
+    haute, basse = carte1.id % 13, carte2.id % 13
+    if haute < basse:
+        haute, basse = basse, haute
+    if haute != basse and carte1.id // 13 != carte2.id // 13:
+        return basse * 13 + haute
+    return haute * 13 + basse
+
+
+def nom_main(indice: int) -> str:
+    """Nom usuel de la main de départ : "AA", "AKs", "72o"..."""
+    ligne, colonne = divmod(indice, 13)
+    if ligne == colonne:
+        return NOMS_VALEURS[ligne] * 2
+    if ligne > colonne:
+        return NOMS_VALEURS[ligne] + NOMS_VALEURS[colonne] + "s"
+    return NOMS_VALEURS[colonne] + NOMS_VALEURS[ligne] + "o"
+
+
+def cartes_representantes(indice: int) -> tuple[int, int]:
+    """Identifiants de deux cartes formant la main de départ d'indice donné"""
+    ligne, colonne = divmod(indice, 13)
+    if ligne > colonne:
+        # assorties : même couleur
+        return ligne, colonne
+    # paires et mains dépareillées : deux couleurs
+    return colonne, 13 + ligne
+
+
+def calculer_equites(indice: int, nb_tirages: int, graine: int = 0,
+                     taille_lot: int = 10_000) -> list[float]:
+    """
+    Équité (%) de la main de départ contre 1 à NB_ADVERSAIRES_MAX adversaires aux mains
+    aléatoires, estimée sur nb_tirages donnes (mains adverses et board) par nombre
+    d'adversaires.
+    """
+    rng = np.random.default_rng([graine, indice])
+    main = np.array(cartes_representantes(indice), dtype=np.int64)
+    restantes = np.array([i for i in range(52) if i not in main], dtype=np.int64)
+    equites = []
+    for nb_adversaires in range(1, NB_ADVERSAIRES_MAX + 1):
+        a_tirer = 2 * nb_adversaires + 5
+        parts = 0.0
+        reste = nb_tirages
+        while reste > 0:
+            taille = min(taille_lot, reste)
+            # ordre aléatoire des cartes restantes : les premières forment la donne
+            ordre = np.argsort(rng.random((taille, len(restantes))), axis=1)
+            tirages = restantes[ordre[:, :a_tirer]]
+            board = tirages[:, -5:]
+            rang_main = rangs_mains(np.hstack([np.broadcast_to(main, (taille, 2)), board]))
+            rangs_adverses = np.stack([
+                rangs_mains(np.hstack([tirages[:, 2 * a:2 * a + 2], board]))
+                for a in range(nb_adversaires)
+            ])
+            meilleur_adverse = rangs_adverses.max(axis=0)
+            ex_aequo = (rangs_adverses == rang_main).sum(axis=0)
+            parts += np.where(rang_main >= meilleur_adverse, 1 / (1 + ex_aequo), 0.0).sum()
+            reste -= taille
+        equites.append(100 * parts / nb_tirages)
+    return equites
+
+
+def ecrire_table(chemin: str, equites: list[list[float]], nb_tirages: int) -> None:
+    """Écrit la table (équités de chaque main, par nombre d'adversaires) au format binaire"""
+    with open(chemin, "wb") as fichier:
+        fichier.write(ENTETE.pack(SIGNATURE, VERSION, NB_ADVERSAIRES_MAX, NB_MAINS, nb_tirages))
+        for ligne in equites:
+            for equite in ligne:
+                fichier.write(VALEUR.pack(round(equite * 100)))
+
+
+class TableEquitePreflop:
+    """
+    Équités préflop précalculées, lues dans un fichier projeté en mémoire.
+
+    Le fichier n'est pas chargé : chaque consultation lit deux octets à une position
+    calculée, et le système partage les pages entre tous les processus qui l'ouvrent.
+    """
+
+    _partagee: "TableEquitePreflop | None" = None
+
+    def __init__(self, chemin: str = CHEMIN_DEFAUT) -> None:
+        with open(chemin, "rb") as fichier:
+            self._donnees = mmap.mmap(fichier.fileno(), 0, access=mmap.ACCESS_READ)
+        signature, version, nb_adversaires, nb_mains, nb_tirages = ENTETE.unpack_from(self._donnees)
+        if signature != SIGNATURE or version != VERSION:
+            raise ValueError(f"{chemin} n'est pas une table d'équités préflop.")
+        if len(self._donnees) != ENTETE.size + nb_mains * nb_adversaires * VALEUR.size:
+            raise ValueError(f"{chemin} est tronqué.")
+        self.nb_adversaires_max = nb_adversaires
+        self.nb_tirages = nb_tirages
+
+    @classmethod
+    def partagee(cls) -> "TableEquitePreflop":
+        """Table livrée avec le projet, ouverte à la première demande puis partagée"""
+        if cls._partagee is None:
+            cls._partagee = cls()
+        return cls._partagee
+
+    def equite_indice(self, indice: int, nb_adversaires: int) -> float:
+        """Équité (%) de la main de départ d'indice donné"""
+        if not 1 <= nb_adversaires <= self.nb_adversaires_max:
+            raise ValueError(f"Nombre d'adversaires invalide ({nb_adversaires}).")
+        position = ENTETE.size + VALEUR.size * (
+            indice * self.nb_adversaires_max + nb_adversaires - 1
+        )
+        return VALEUR.unpack_from(self._donnees, position)[0] / 100
+
+    def equite(self, main: list[Carte], nb_adversaires: int) -> float:
+        """Équité (%) de deux cartes privées contre nb_adversaires mains aléatoires"""
+        if len(main) != 2:
+            raise ValueError("Une main de départ contient exactement 2 cartes.")
+        return self.equite_indice(indice_main(*main), nb_adversaires)
+
+
+# équité, rapportée à la part d'un pot partagé également, à partir de laquelle relancer
+SEUIL_RELANCE = 1.25
+
+
+def conseiller(equite: float, nb_adversaires: int, a_suivre: int, pot: int) -> dict:
+    """
+    Action conseillée au préflop : relancer avec une main nettement meilleure que la
+    moyenne, suivre si l'équité couvre la cote du pot, se coucher sinon.
+
+    Parameters
+    ----------
+    equite : float
+        équité de la main (%)
+    nb_adversaires : int
+        adversaires encore en jeu
+    a_suivre : int
+        jetons à ajouter pour suivre
+    pot : int
+        jetons déjà engagés par tous les joueurs
+
+    Returns
+    -------
+    dict
+        part égale du pot (%), cote du pot (%) et conseil ("relancer", "suivre" ou "se_coucher")
+    """
+    part_egale = 100 / (nb_adversaires + 1)
+    cote = 100 * a_suivre / (pot + a_suivre) if a_suivre else 0.0
+    if equite >= SEUIL_RELANCE * part_egale:
+        conseil = "relancer"
+    elif equite >= cote:
+        conseil = "suivre"
+    else:
+        conseil = "se_coucher"
+    return {"part_egale": round(part_egale, 2), "cote": round(cote, 2), "conseil": conseil}
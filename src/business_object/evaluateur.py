@@ -1,18 +1,45 @@
 from src.business_object.cartes import Carte, combinaisons, valeurs
+from src.business_object import evaluateur_tables
+from src.business_object.cache_evaluation import CacheEvaluations
 from collections import Counter
 from typing import List, Optional, Tuple
 
 
 class ResultatMain:
-    def __init__(self, combinaison, tiebreaker_cards) -> None:
+    def __init__(self, combinaison, tiebreaker_cards, rang: int | None = None) -> None:
         self.combinaison = combinaison
         # tiebreaker_cards contient désormais des enums valeurs.* directement
         self.tiebreaker_cards = tiebreaker_cards
+        # rang entier comparable (renseigné par le moteur à tables)
+        self.rang = rang
+        # clé entière d'ordre total : comparer deux mains revient à comparer leurs clés
+        self.cle = rang if rang is not None else self._encoder(combinaison, tiebreaker_cards)
+
+    @staticmethod
+    def _encoder(combinaison, tiebreaker_cards) -> int:
+        """Calcule la clé d'un résultat du moteur classique, encodée comme un rang des tables"""
+        departages = [EvaluateurMain.valeur_order[v] for v in tiebreaker_cards]
+        # le moteur classique range la quinte basse sous l'As : il compte alors pour 1
+        if (combinaison in (combinaisons.QUINTE, combinaisons.QUINTE_FLUSH)
+                and departages[:2] == [14, 5]):
+            departages = departages[1:] + [1]
+        return evaluateur_tables.encoder_rang(combinaison.value, departages)
 
     @property
     def value(self) -> int:
         return self.combinaison.value
 
+    @classmethod
+    def depuis_rang(cls, rang: int) -> "ResultatMain":
+        """Construit le résultat correspondant à un rang calculé par les tables"""
+        combinaison, departages = evaluateur_tables.decoder_rang(rang)
+        return cls(
+            combinaisons(combinaison),
+            # 1 désigne l'As d'une quinte basse
+            [valeurs.AS if v == 1 else EvaluateurMain.valeur_par_numerique[v] for v in departages],
+            rang,
+        )
+
 
 class EvaluateurMain:
     valeur_order = {
@@ -22,11 +49,22 @@ class EvaluateurMain:
         valeurs.VALET: 11, valeurs.DAME: 12, valeurs.ROI: 13,
         valeurs.AS: 14
     }
+    valeur_par_numerique = {num: val for val, num in valeur_order.items()}
 
-    def __init__(self, cartes: list[Carte]) -> None:
+    # "tables" : rang précalculé en quelques accès aux tables, "classique" : évaluation pas à pas
+    MOTEURS = ("tables", "classique")
+    moteur_par_defaut = "tables"
+    # cache partagé par toutes les évaluations du processus, désactivé si None
+    cache: CacheEvaluations | None = None
+
+    def __init__(self, cartes: list[Carte], moteur: str | None = None) -> None:
         if len(cartes) < 5 or len(cartes) > 7:
             raise ValueError("Il faut entre 5 et 7 cartes pour évaluer une main.")
+        moteur = moteur or self.moteur_par_defaut
+        if moteur not in self.MOTEURS:
+            raise ValueError(f"Moteur d'évaluation inconnu : {moteur}.")
         self.cartes = cartes
+        self.moteur = moteur
 
     def _valeurs_numeriques(self) -> List[int]:
         """donne les valeurs numériques de la carte"""
@@ -63,13 +101,32 @@ class EvaluateurMain:
 
     def _numerique_to_enum(self, valeur_num) -> Optional[valeurs]:
         """Convertit une valeur numérique en enum valeurs."""
-        for enum_val, num in self.valeur_order.items():
-            if num == valeur_num:
-                return enum_val
-        return None
+        return self.valeur_par_numerique.get(valeur_num)
+
+    @classmethod
+    def activer_cache(cls, taille: int | None = CacheEvaluations.TAILLE_DEFAUT) -> None:
+        """Place un cache partagé devant les moteurs (taille None ou 0 : le désactive)"""
+        cls.cache = CacheEvaluations(taille) if taille else None
 
     def evalue_main(self) -> ResultatMain:
         """donne la meilleure combinaison de la main"""
+        if self.cache is not None:
+            return self.cache.obtenir(self.cartes, self._evalue_main_moteur, self.moteur)
+        return self._evalue_main_moteur()
+
+    def _evalue_main_moteur(self) -> ResultatMain:
+        """évalue la main avec le moteur choisi"""
+        if self.moteur == "tables":
+            return self._evalue_main_tables()
+        return self._evalue_main_classique()
+
+    def _evalue_main_tables(self) -> ResultatMain:
+        """évalue la main grâce aux tables précalculées"""
+        rang = evaluateur_tables.rang_ids([c.id for c in self.cartes])
+        return ResultatMain.depuis_rang(rang)
+
+    def _evalue_main_classique(self) -> ResultatMain:
+        """donne la meilleure combinaison de la main, en testant les combinaisons une à une"""
         counts = self._compter_occurrences()
         valeurs_list = self._valeurs_numeriques()
         is_flush, flush_vals = self._is_flush()
@@ -157,15 +214,49 @@ class EvaluateurMain:
     @staticmethod
     def comparer_mains(main1, main2) -> int:
         """donne la meilleure des mains"""
-        if main1.value > main2.value:
-            return 1
-        elif main1.value < main2.value:
-            return -1
-        else:
-            # comparer les tiebreaker_cards
-            for c1, c2 in zip(main1.tiebreaker_cards, main2.tiebreaker_cards):
-                if EvaluateurMain.valeur_order[c1] > EvaluateurMain.valeur_order[c2]:
-                    return 1
-                elif EvaluateurMain.valeur_order[c1] < EvaluateurMain.valeur_order[c2]:
-                    return -1
-            return 0
+        return (main1.cle > main2.cle) - (main1.cle < main2.cle)
+
+    @staticmethod
+    def classer_resultats(resultats: dict) -> list[list]:
+        """
+        Classe des mains déjà évaluées, de la meilleure à la moins bonne.
+
+        Parameters
+        ----------
+        resultats : dict
+            ResultatMain de chaque participant (joueur, pseudo...)
+
+        Returns
+        -------
+        list[list]
+            groupes de participants à égalité, dans l'ordre de resultats au sein d'un groupe
+        """
+        classement = []
+        cle_groupe = None
+        for participant in sorted(resultats, key=lambda p: resultats[p].cle, reverse=True):
+            if resultats[participant].cle != cle_groupe:
+                cle_groupe = resultats[participant].cle
+                classement.append([])
+            classement[-1].append(participant)
+        return classement
+
+    @classmethod
+    def classer_mains(cls, mains: dict, moteur: str | None = None) -> tuple[list[list], dict]:
+        """
+        Évalue une seule fois la main de chaque participant et classe toutes les mains.
+
+        Parameters
+        ----------
+        mains : dict
+            cartes (de 5 à 7) de chaque participant
+        moteur : str | None
+            moteur d'évaluation, celui par défaut si None
+
+        Returns
+        -------
+        tuple[list[list], dict]
+            groupes de participants à égalité de la meilleure main à la moins bonne,
+            et ResultatMain de chaque participant
+        """
+        resultats = {p: cls(cartes, moteur).evalue_main() for p, cartes in mains.items()}
+        return cls.classer_resultats(resultats), resultats
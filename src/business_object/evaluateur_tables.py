@@ -0,0 +1,206 @@
+from itertools import combinations_with_replacement
+
+from src.business_object.cartes import combinaisons
+
+# Un rang est un entier unique et comparable : la combinaison occupe les bits de poids fort,
+# puis les valeurs de départage (2 à 14, 1 pour l'As d'une quinte basse) sur 4 bits chacune.
+DECALAGE_COMBINAISON = 20
+NB_DEPARTAGES = 5
+
+# Chaque valeur (indice 0 pour le 2, 12 pour l'As) compte pour une puissance de 5 :
+# la somme identifie de manière unique le multi-ensemble de valeurs d'une main (au plus 4 par valeur).
+PUISSANCES_5 = tuple(5 ** i for i in range(13))
+
+# Pour chaque identifiant de carte : contribution à la clé, couleur et bit de la valeur
+_CLE_ID = tuple(PUISSANCES_5[i % 13] for i in range(52))
+_COULEUR_ID = tuple(i // 13 for i in range(52))
+_BIT_ID = tuple(1 << (i % 13) for i in range(52))
+
+_table_couleurs = None
+_table_multiensembles = None
+_decodages = {}
+
+
+def encoder_rang(combinaison: int, departages: list[int]) -> int:
+    """Encode une combinaison et ses valeurs de départage en un seul entier comparable."""
+    rang = combinaison << DECALAGE_COMBINAISON
+    for i, valeur in enumerate(departages[:NB_DEPARTAGES]):
+        rang |= valeur << (4 * (NB_DEPARTAGES - 1 - i))
+    return rang
+
+
+def decoder_rang(rang: int) -> tuple[int, list[int]]:
+    """Retrouve la combinaison et les valeurs de départage à partir d'un rang."""
+    decode = _decodages.get(rang)
+    if decode is None:
+        decode = _decodages[rang] = _decoder(rang)
+    return decode[0], list(decode[1])
+
+
+def _decoder(rang: int) -> tuple[int, tuple[int, ...]]:
+    combinaison = rang >> DECALAGE_COMBINAISON
+    departages = []
+    for i in range(NB_DEPARTAGES):
+        valeur = (rang >> (4 * (NB_DEPARTAGES - 1 - i))) & 0xF
+        if valeur == 0:
+            break
+        departages.append(valeur)
+    return combinaison, tuple(departages)
+
+
+def _meilleure_quinte(valeurs_presentes: set[int]) -> list[int] | None:
+    """Renvoie les valeurs de la plus haute quinte (As bas noté 1), None s'il n'y en a pas."""
+    for haute in range(14, 5, -1):
+        if all(v in valeurs_presentes for v in range(haute - 4, haute + 1)):
+            return list(range(haute, haute - 5, -1))
+    if {14, 2, 3, 4, 5} <= valeurs_presentes:
+        return [5, 4, 3, 2, 1]
+    return None
+
+
+def _rang_couleur(masque: int) -> int:
+    """Rang de la meilleure main dans une couleur décrite par un masque de 13 bits."""
+    valeurs_presentes = {i + 2 for i in range(13) if masque >> i & 1}
+    quinte = _meilleure_quinte(valeurs_presentes)
+    if quinte:
+        if quinte[0] == 14:
+            return encoder_rang(combinaisons.QUINTE_FLUSH_ROYALE.value, [14])
+        return encoder_rang(combinaisons.QUINTE_FLUSH.value, quinte)
+    top5 = sorted(valeurs_presentes, reverse=True)[:5]
+    return encoder_rang(combinaisons.COULEUR.value, top5)
+
+
+def _rang_sans_couleur(comptes: dict[int, int]) -> int:
+    """Rang de la meilleure main (hors couleur) pour un multi-ensemble de valeurs."""
+    valeurs_desc = sorted(comptes, reverse=True)
+    carres = [v for v in valeurs_desc if comptes[v] == 4]
+    brelans = [v for v in valeurs_desc if comptes[v] == 3]
+    paires = [v for v in valeurs_desc if comptes[v] == 2]
+
+    if carres:
+        kicker = max(v for v in valeurs_desc if v != carres[0])
+        return encoder_rang(combinaisons.CARRE.value, [carres[0], kicker])
+
+    if brelans:
+        complement = [v for v in valeurs_desc if v != brelans[0] and comptes[v] >= 2]
+        if complement:
+            return encoder_rang(combinaisons.FULL.value, [brelans[0], complement[0]])
+
+    quinte = _meilleure_quinte(set(valeurs_desc))
+    if quinte:
+        return encoder_rang(combinaisons.QUINTE.value, quinte)
+
+    if brelans:
+        kickers = [v for v in valeurs_desc if v != brelans[0]][:2]
+        return encoder_rang(combinaisons.BRELAN.value, [brelans[0]] + kickers)
+
+    if len(paires) >= 2:
+        kicker = max(v for v in valeurs_desc if v not in paires[:2])
+        return encoder_rang(combinaisons.DOUBLE_PAIRE.value, paires[:2] + [kicker])
+
+    if paires:
+        kickers = [v for v in valeurs_desc if v != paires[0]][:3]
+        return encoder_rang(combinaisons.PAIRE.value, [paires[0]] + kickers)
+
+    return encoder_rang(combinaisons.HAUTEUR.value, valeurs_desc[:5])
+
+
+def table_couleurs() -> list[int]:
+    """Table indexée par un masque de 13 bits : rang de la couleur (0 si moins de 5 cartes)."""
+    global _table_couleurs
+    if _table_couleurs is None:
+        _table_couleurs = [
+            _rang_couleur(masque) if masque.bit_count() >= 5 else 0
+            for masque in range(1 << 13)
+        ]
+    return _table_couleurs
+
+
+def table_multiensembles() -> dict[int, int]:
+    """Table des multi-ensembles de 5 à 7 valeurs : somme des puissances de 5 -> rang."""
+    global _table_multiensembles
+    if _table_multiensembles is None:
+        table = {}
+        for nb_cartes in (5, 6, 7):
+            for indices in combinations_with_replacement(range(13), nb_cartes):
+                comptes = {}
+                for i in indices:
+                    comptes[i + 2] = comptes.get(i + 2, 0) + 1
+                if max(comptes.values()) > 4:
+                    continue
+                cle = sum(PUISSANCES_5[i] for i in indices)
+                table[cle] = _rang_sans_couleur(comptes)
+        _table_multiensembles = table
+    return _table_multiensembles
+
+
+def rang_ids(ids) -> int:
+    """
+    Rang d'une main de 5 à 7 cartes en quelques accès aux tables.
+
+    Parameters
+    ----------
+    ids : iterable[int]
+        identifiants des cartes (couleur * 13 + indice de la valeur, 0 pour le 2)
+    """
+    multiensembles = _table_multiensembles or table_multiensembles()
+    cle = 0
+    masques = [0, 0, 0, 0]
+    for i in ids:
+        cle += _CLE_ID[i]
+        masques[_COULEUR_ID[i]] |= _BIT_ID[i]
+
+    for masque in masques:
+        if masque.bit_count() >= 5:
+            # une couleur exclut carré et full avec 7 cartes au plus : elle l'emporte
+            return (_table_couleurs or table_couleurs())[masque]
+    return multiensembles[cle]
+
+
+class MainIncrementale:
+    """
+    Main en cours de construction : cartes privées, puis cartes du board à mesure qu'elles
+    sont distribuées.
+
+    Chaque carte ajoutée met à jour en O(1) la clé de multi-ensemble (qui tient lieu
+    d'histogramme des valeurs, en base 5), le nombre de cartes et le masque de chaque
+    couleur. Le rang n'est recalculé qu'en cas de besoin, en un seul accès aux tables,
+    puis gardé jusqu'à la carte suivante.
+    """
+
+    __slots__ = ("ids", "cle", "comptes_couleurs", "masques", "couleur", "_rang")
+
+    def __init__(self, ids=()) -> None:
+        self.ids: list[int] = []
+        self.cle = 0
+        self.comptes_couleurs = [0, 0, 0, 0]
+        self.masques = [0, 0, 0, 0]
+        # couleur d'au moins 5 cartes, s'il y en a une
+        self.couleur: int | None = None
+        self._rang: int | None = None
+        for i in ids:
+            self.ajouter(i)
+
+    def ajouter(self, id_carte: int) -> None:
+        """Ajoute une carte (par son identifiant) à la main"""
+        if len(self.ids) >= 7:
+            raise ValueError("Une main compte au plus 7 cartes.")
+        couleur = _COULEUR_ID[id_carte]
+        self.ids.append(id_carte)
+        self.cle += _CLE_ID[id_carte]
+        self.masques[couleur] |= _BIT_ID[id_carte]
+        self.comptes_couleurs[couleur] += 1
+        if self.comptes_couleurs[couleur] == 5:
+            self.couleur = couleur
+        self._rang = None
+
+    @property
+    def rang(self) -> int | None:
+        """Rang de la meilleure main actuelle, None tant qu'il y a moins de 5 cartes"""
+        if self._rang is None and len(self.ids) >= 5:
+            if self.couleur is not None:
+                # une couleur exclut carré et full avec 7 cartes au plus : elle l'emporte
+                self._rang = (_table_couleurs or table_couleurs())[self.masques[self.couleur]]
+            else:
+                self._rang = (_table_multiensembles or table_multiensembles())[self.cle]
+        return self._rang
@@ -0,0 +1,55 @@
+import numpy as np
+
+from src.business_object import evaluateur_tables
+
+# Pour chaque identifiant de carte : contribution à la clé de multi-ensemble, couleur et bit de valeur
+_CLE_ID = np.array(evaluateur_tables._CLE_ID, dtype=np.int64)
+_COULEUR_ID = np.array(evaluateur_tables._COULEUR_ID, dtype=np.int8)
+_BIT_ID = np.array(evaluateur_tables._BIT_ID, dtype=np.int32)
+
+_cles_triees = None
+_rangs_multiensembles = None
+_rangs_couleurs = None
+
+
+def _tables() -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Copie NumPy des tables de l'évaluateur (clés triées pour une recherche dichotomique)"""
+    global _cles_triees, _rangs_multiensembles, _rangs_couleurs
+    if _cles_triees is None:
+        table = evaluateur_tables.table_multiensembles()
+        cles = np.fromiter(table.keys(), dtype=np.int64, count=len(table))
+        rangs = np.fromiter(table.values(), dtype=np.int64, count=len(table))
+        ordre = np.argsort(cles)
+        _rangs_couleurs = np.array(evaluateur_tables.table_couleurs(), dtype=np.int64)
+        _rangs_multiensembles = rangs[ordre]
+        _cles_triees = cles[ordre]
+    return _cles_triees, _rangs_multiensembles, _rangs_couleurs
+
+
+def rangs_mains(ids: np.ndarray) -> np.ndarray:
+    """
+    Évalue un lot de mains en une seule passe.
+
+    Parameters
+    ----------
+    ids : np.ndarray
+        tableau (nb_mains, nb_cartes) d'identifiants de cartes, avec 5 <= nb_cartes <= 7
+
+    Returns
+    -------
+    np.ndarray
+        rang de chaque main, identique à evaluateur_tables.rang_ids
+    """
+    cles_triees, rangs_multiensembles, rangs_couleurs = _tables()
+    ids = np.asarray(ids)
+
+    cles = _CLE_ID[ids].sum(axis=1)
+    rangs = rangs_multiensembles[np.searchsorted(cles_triees, cles)]
+
+    couleurs = _COULEUR_ID[ids]
+    bits = _BIT_ID[ids]
+    for couleur in range(4):
+        # les valeurs d'une même couleur sont distinctes : la somme des bits vaut leur union
+        masques = np.where(couleurs == couleur, bits, 0).sum(axis=1)
+        np.maximum(rangs, rangs_couleurs[masques], out=rangs)
+    return rangs
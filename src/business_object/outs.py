@@ -0,0 +1,94 @@
+from functools import lru_cache
+from itertools import combinations
+
+from src.business_object.cartes import Carte, combinaisons
+from src.business_object.evaluateur_tables import DECALAGE_COMBINAISON, rang_ids
+
+# résultats gardés en mémoire : une entrée par main et par board consultés
+TAILLE_CACHE = 4096
+
+
+def _combinaison(ids) -> int:
+    return rang_ids(ids) >> DECALAGE_COMBINAISON
+
+
+@lru_cache(maxsize=TAILLE_CACHE)
+def _outs(main: tuple[int, ...], board: tuple[int, ...]) -> tuple:
+    connues = main + board
+    actuelle = _combinaison(connues)
+    inconnues = [i for i in range(52) if i not in connues]
+
+    outs = []
+    for i in inconnues:
+        combinaison = _combinaison(connues + (i,))
+        if combinaison > actuelle:
+            outs.append((i, combinaison))
+
+    # au flop, amélioration avec la turn ou la river : toutes les paires de cartes énumérées
+    ameliorations_river = None
+    if len(board) == 3:
+        ameliorations_river = sum(
+            1 for paire in combinations(inconnues, 2) if _combinaison(connues + paire) > actuelle
+        )
+    return actuelle, tuple(outs), len(inconnues), ameliorations_river
+
+
+def calculer_outs(main: list[Carte], board: list[Carte]) -> dict:
+    """
+    Cartes inconnues qui, en arrivant au board, font passer la main à une meilleure
+    combinaison, et probabilités de s'améliorer.
+
+    Le résultat ne dépend que des cartes : il est gardé en cache, et les consultations
+    répétées d'une même main au même tour ne coûtent qu'une recherche.
+
+    Parameters
+    ----------
+    main : list[Carte]
+        les 2 cartes privées du joueur
+    board : list[Carte]
+        le flop (3 cartes) ou le flop et la turn (4 cartes)
+
+    Returns
+    -------
+    dict
+        combinaison actuelle, outs (carte et combinaison atteinte), nombre d'outs par
+        combinaison, nombre de cartes inconnues, probabilité (%) de s'améliorer à la carte
+        suivante et, au flop, d'ici la river (énumération exacte des deux cartes restantes)
+    """
+    if len(main) != 2:
+        raise ValueError("La main doit contenir exactement 2 cartes.")
+    if len(board) not in (3, 4):
+        raise ValueError("Les outs se calculent au flop ou à la turn.")
+    ids_main = tuple(sorted(c.id for c in main))
+    ids_board = tuple(sorted(c.id for c in board))
+    if len(set(ids_main + ids_board)) != len(ids_main) + len(ids_board):
+        raise ValueError("Une même carte apparaît plusieurs fois.")
+
+    actuelle, outs, nb_inconnues, ameliorations_river = _outs(ids_main, ids_board)
+    par_combinaison = {}
+    for _, combinaison in outs:
+        nom = combinaisons(combinaison).name
+        par_combinaison[nom] = par_combinaison.get(nom, 0) + 1
+    resultat = {
+        "combinaison": combinaisons(actuelle).name,
+        "outs": [
+            {"carte": str(Carte.depuis_id(i)), "combinaison": combinaisons(c).name}
+            for i, c in outs
+        ],
+        "par_combinaison": par_combinaison,
+        "nb_outs": len(outs),
+        "nb_cartes_inconnues": nb_inconnues,
+        "prochaine_carte": round(100 * len(outs) / nb_inconnues, 2),
+        "jusqu_a_la_river": None,
+    }
+    if ameliorations_river is not None:
+        nb_paires = nb_inconnues * (nb_inconnues - 1) // 2
+        resultat["jusqu_a_la_river"] = round(100 * ameliorations_river / nb_paires, 2)
+    return resultat
+
+
+def statistiques_cache() -> dict:
+    """Succès, échecs et taille du cache des outs"""
+    infos = _outs.cache_info()
+    return {"succes": infos.hits, "echecs": infos.misses, "taille": infos.currsize,
+            "taille_max": infos.maxsize}
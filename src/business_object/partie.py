@@ -1,10 +1,14 @@
+import logging
+from collections import deque
+from functools import wraps
+
 from src.business_object.joueurs import Joueur
 from src.business_object.distrib import Distrib
 from src.business_object.comptage import Comptage
-from src.business_object.evaluateur import EvaluateurMain
+from src.business_object.evaluateur import EvaluateurMain, ResultatMain
 
-from src.dao.statistique_dao import StatistiqueDao
-from src.dao.joueur_dao import JoueurDao
+from src.dao.accumulateur_statistique import AccumulateurStatistique
+from src.dao.file_ecriture import FileEcriture
 
 
 class EtatPartie:
@@ -14,38 +18,101 @@ class EtatPartie:
         self.joueurs: list[dict] = []  # contient : pseudo, solde, mise, actif
         self.board: list[str] = []
         self.pot: int = 0
-        self.pots_secondaires: dict = {}
+        self.pots_secondaires: list[dict] = []  # montant et pseudos éligibles de chaque pot
         self.mise_max: int = 0
         self.joueur_courant: str | None = None
         self.finie: bool = True   # True si la partie est terminée
         self.resultats: list[dict] = []  # liste des gagnants avec info sur leur main et kickers
         self.rejouer: dict[str, bool | None] = {}
         self.liste_attente: list[dict] = []
+        # table rejointe par chaque joueur que la file de placement a déplacé ailleurs
+        self.deplacements: dict[str, int] = {}
+        self.version: int = 0  # incrémentée à chaque changement publié
+
+    def en_dict(self) -> dict:
+        """Copie indépendante de l'état, sérialisable en JSON"""
+        etat = dict(vars(self))
+        # seuls ces conteneurs sont modifiés sur place par la partie
+        for cle in ("joueurs", "pots_secondaires", "resultats", "liste_attente"):
+            etat[cle] = [dict(element) for element in etat[cle]]
+        etat["board"] = list(self.board)
+        etat["rejouer"] = dict(self.rejouer)
+        etat["deplacements"] = dict(self.deplacements)
+        return etat
+
+
+def _une_publication(methode):
+    """
+    Regroupe les mises à jour de l'état faites pendant l'appel : l'état n'est construit,
+    comparé au précédent et publié qu'une fois, à la sortie de l'appel le plus externe.
+    """
+    @wraps(methode)
+    def enveloppe(self, *args, **kwargs):
+        self._profondeur_action += 1
+        try:
+            return methode(self, *args, **kwargs)
+        finally:
+            self._profondeur_action -= 1
+            if self._profondeur_action == 0 and self._etat_a_publier:
+                self._etat_a_publier = False
+                self._mettre_a_jour_etat()
+    return enveloppe
 
 
 class Partie:
     """Gestion complète d'une partie de poker Texas Hold'em sans input/output."""
 
     GROSSE_BLIND = 20
+    # nombre de changements conservés pour répondre aux demandes incrémentales
+    TAILLE_HISTORIQUE = 64
 
-    def __init__(self, id: int, table) -> None:
+    def __init__(self, id: int, table, grosse_blind: int | None = None,
+                 stats_dao=None, file_ecriture=None) -> None:
         self.id = id
+        if grosse_blind is not None:
+            # niveau de blind propre à la table
+            self.GROSSE_BLIND = grosse_blind
         self.table = table
-        self.distrib = Distrib(self.table.joueurs)
+        self.distrib = Distrib(self.table.joueurs, self.table.deck)
         self.comptage = Comptage()
         self.tour_actuel = "preflop"
         self.mise_max = 0
         self.indice_joueur_courant = 0
-        self.stats_dao = StatistiqueDao()
+        # statistiques agrégées en mémoire, écrites en base en fin de main
+        # (remplaçables, comme la file d'écriture, pour jouer sans base de données)
+        self.stats_dao = stats_dao or AccumulateurStatistique()
+        self.file_ecriture = file_ecriture or FileEcriture()
         self.etat = EtatPartie()
         self.etat.id_partie = id
         self.joueurs_ayant_joue: dict[str, bool] = {}
+        # anneau des joueurs pouvant encore agir dans la main (ni couchés ni all-in) :
+        # pseudo -> pseudo suivant dans l'ordre des sièges. Les joueurs retirés gardent leur
+        # lien pour retrouver le suivant encore présent.
+        self._anneau: dict[str, str] = {}
+        self._precedent: dict[str, str] = {}
+        self._dans_anneau: set[str] = set()
+        self._tete_anneau: str | None = None
+        # classement complet et ResultatMain de chaque joueur au dernier abattage
+        self.classement_abattage: list[list[Joueur]] = []
+        self.mains_abattage: dict[Joueur, ResultatMain] = {}
         # suppression du champ redondant index_joueur_courant
+        # fonctions appelées avec le nouvel état à chaque changement (diffusion aux clients)
+        self._abonnes: list = []
+        self._dernier_publie: dict | None = None
+        # appels imbriqués de _une_publication en cours, et mise à jour demandée pendant ceux-ci
+        self._profondeur_action = 0
+        self._etat_a_publier = False
+        # (version, champs modifiés) des derniers changements publiés
+        self.historique: deque[tuple[int, dict]] = deque(maxlen=self.TAILLE_HISTORIQUE)
 
     # ---------------------------
     # Synchronisation état -> vue
     # ---------------------------
     def _mettre_a_jour_etat(self):
+        # pendant une action, la mise à jour est faite une seule fois, à la fin
+        if self._profondeur_action:
+            self._etat_a_publier = True
+            return
         # synchronise l'objet métier vers l'objet d'état exposé
         self.etat.id_partie = getattr(self, "id", None)
         self.etat.tour_actuel = self.tour_actuel
@@ -55,14 +122,12 @@ class Partie:
         ]
         self.etat.board = [str(c) for c in self.table.board]
         self.etat.pot = self.comptage.pot
-        # pots secondaires (clé pseudo -> montant)
-        try:
-            # comptage.pots_perso est un dict mapping joueur->montant
-            self.etat.pots_secondaires = {
-                j.pseudo: montant for j, montant in self.comptage.pots_perso.items()}
-        except Exception:
-            # fallback si structure différente
-            self.etat.pots_secondaires = getattr(self.comptage, "pots_secondaires", {})
+        # pots secondaires : couches au-delà du pot principal, avec les joueurs pouvant les gagner
+        pots = self.comptage.construire_pots([j for j in self.table.joueurs if j.actif])
+        self.etat.pots_secondaires = [
+            {"montant": pot["montant"], "eligibles": [j.pseudo for j in pot["eligibles"]]}
+            for pot in pots[1:]
+        ]
 
         self.etat.mise_max = self.mise_max
 
@@ -80,9 +145,83 @@ class Partie:
             else:
                 self.etat.joueur_courant = None
 
+        self._publier()
+
+    # ---------------------------
+    # Diffusion des changements d'état
+    # ---------------------------
+    def abonner(self, rappel) -> None:
+        """Enregistre une fonction appelée avec l'état (dict) à chaque changement de la partie."""
+        self._abonnes.append(rappel)
+
+    def desabonner(self, rappel) -> None:
+        if rappel in self._abonnes:
+            self._abonnes.remove(rappel)
+
+    def etat_publie(self) -> dict:
+        """Dernier état publié, tel que reçu par les abonnés."""
+        if self._dernier_publie is None:
+            self._mettre_a_jour_etat()
+        return self._dernier_publie
+
+    def changements_depuis(self, version: int) -> dict | None:
+        """
+        Changements de l'état depuis une version connue du client.
+
+        Parameters
+        ----------
+        version : int
+            dernière version reçue par le client
+
+        Returns
+        -------
+        dict | None
+            None si le client est à jour. Sinon la version courante, les champs modifiés
+            depuis `version` avec leur nouvelle valeur, et complet=True quand la version est
+            trop ancienne (ou inconnue) pour l'historique : les champs sont alors l'état entier.
+        """
+        etat = self.etat_publie()
+        if version == etat["version"]:
+            return None
+
+        plus_ancienne = self.historique[0][0] if self.historique else etat["version"] + 1
+        if version > etat["version"] or version < plus_ancienne - 1:
+            champs = {cle: valeur for cle, valeur in etat.items() if cle != "version"}
+            return {"version": etat["version"], "complet": True, "changements": champs}
+
+        changements = {}
+        for version_delta, delta in self.historique:
+            if version_delta > version:
+                changements.update(delta)
+        return {"version": etat["version"], "complet": False, "changements": changements}
+
+    def _publier(self) -> None:
+        """
+        Prévient les abonnés si l'état a changé depuis la dernière publication.
+        Une simple consultation de l'état ne déclenche donc aucun envoi.
+        """
+        instantane = self.etat.en_dict()
+        precedent = self._dernier_publie or {}
+        delta = {
+            cle: valeur for cle, valeur in instantane.items()
+            if cle != "version" and precedent.get(cle) != valeur
+        }
+        if not delta:
+            return
+        self.etat.version += 1
+        instantane["version"] = self.etat.version
+        self._dernier_publie = instantane
+        self.historique.append((self.etat.version, delta))
+        for rappel in list(self._abonnes):
+            try:
+                rappel(instantane)
+            except Exception as e:
+                logging.info(e)
+
     # ---------------------------
     # Initialisation des blinds
     # ---------------------------
+    @_une_publication
     def initialiser_blinds(self):
         nb_joueurs = len(self.table.joueurs)
         if nb_joueurs < 2:
@@ -90,7 +229,7 @@ class Partie:
 
         self.distrib.distribuer_mains()
 
-        grosse_blind = Partie.GROSSE_BLIND
+        grosse_blind = self.GROSSE_BLIND
         petite_blind = grosse_blind // 2
 
         dealer_idx = self.table.indice_dealer % nb_joueurs
@@ -108,13 +247,65 @@ class Partie:
         # Initialiser le tracking des joueurs ayant joué (actifs non all-in)
         self.joueurs_ayant_joue = {
             j.pseudo: False for j in self.table.joueurs if j.actif and j.solde > 0}
+        self._construire_anneau()
 
         self.etat.finie = False
         self._mettre_a_jour_etat()
 
+    # ---------------------------
+    # Anneau des joueurs pouvant agir
+    # ---------------------------
+    def _construire_anneau(self) -> None:
+        """
+        Relie en anneau, dans l'ordre des sièges, les joueurs qui peuvent agir.
+        La tête est le premier d'entre eux à gauche du bouton : c'est lui qui parle en premier
+        après le flop.
+        """
+        nb = len(self.table.joueurs)
+        debut = (self.table.indice_dealer + 1) % nb if nb else 0
+        ordre = [
+            j.pseudo for j in self.table.joueurs[debut:] + self.table.joueurs[:debut]
+            if j.actif and j.solde > 0
+        ]
+        self._anneau = {p: ordre[(i + 1) % len(ordre)] for i, p in enumerate(ordre)}
+        self._precedent = {p: ordre[i - 1] for i, p in enumerate(ordre)}
+        self._dans_anneau = set(ordre)
+        self._tete_anneau = ordre[0] if ordre else None
+
+    def _retirer_de_anneau(self, pseudo: str) -> None:
+        """Retire de l'anneau un joueur qui s'est couché ou est all-in."""
+        if pseudo not in self._dans_anneau:
+            return
+        self._dans_anneau.discard(pseudo)
+        precedent, suivant = self._precedent[pseudo], self._anneau[pseudo]
+        # le joueur retiré garde son lien vers le suivant
+        self._anneau[precedent] = suivant
+        self._precedent[suivant] = precedent
+        if pseudo == self._tete_anneau:
+            self._tete_anneau = suivant if self._dans_anneau else None
+
+    def _peut_agir(self, pseudo: str) -> bool:
+        """Vérifie un joueur de l'anneau, et l'en retire s'il s'est couché ou est all-in."""
+        joueur = self.table.joueur(pseudo)
+        if joueur is not None and joueur.actif and joueur.solde > 0:
+            return True
+        self._retirer_de_anneau(pseudo)
+        return False
+
+    def _suivant_dans_anneau(self, pseudo: str | None) -> str | None:
+        """Premier joueur pouvant agir après pseudo (qui peut avoir été retiré de l'anneau)."""
+        suivant = self._anneau.get(pseudo)
+        while suivant is not None and suivant not in self._dans_anneau:
+            # lien d'un joueur retiré : il mène vers un joueur retiré après lui ou encore présent
+            suivant = self._anneau.get(suivant) if self._dans_anneau else None
+        while suivant is not None and not self._peut_agir(suivant):
+            suivant = self._anneau[suivant] if self._dans_anneau else None
+        return suivant
+
     # ---------------------------
     # Passer au tour suivant
     # ---------------------------
+    @_une_publication
     def passer_tour(self):
         # Consolider mises personnelles dans le comptage
         for j in self.table.joueurs:
@@ -156,14 +347,15 @@ class Partie:
             if j.actif and j.solde == 0:
                 self.joueurs_ayant_joue[j.pseudo] = True
 
-        # Si après avoir avancé, tous les joueurs actifs sont all-in, avancer automatiquement
-        # jusqu'à showdown (flop->turn->river->showdown)
+        # Si après avoir avancé, plus personne ne peut miser (tous les joueurs actifs sauf
+        # au plus un sont all-in), avancer automatiquement jusqu'à showdown
+        # (flop->turn->river->showdown)
         while self.tour_actuel != "fin":
             actifs = [j for j in self.table.joueurs if j.actif]
             if not actifs:
                 break
 
-            if all(j.solde == 0 for j in actifs):
+            if sum(1 for j in actifs if j.solde > 0) <= 1:
                 # consolider encore avant d'avancer (sécurité)
                 for j in self.table.joueurs:
                     if j.mise > 0:
@@ -199,12 +391,13 @@ class Partie:
     # ---------------------------
     # Actions d'un joueur (miser / suivre / all-in / se coucher)
     # ---------------------------
+    @_une_publication
     def actions_joueur(self, pseudo: str, action: str, montant: int | None = None):
         # PROTECTION : ne rien faire si la main est terminée
         if getattr(self.etat, "finie", False):
             return self.etat
 
-        joueur = next((j for j in self.table.joueurs if j.pseudo == pseudo), None)
+        joueur = self.table.joueur(pseudo)
         if not joueur or not joueur.actif:
             return self.etat
 
@@ -232,7 +425,7 @@ class Partie:
 
         elif action == "se_coucher":
             # conserver la mise actuelle dans le pot (consolidation)
-            self.comptage.pot += joueur.mise
+            self.comptage.ajouter_pot_perso(joueur, joueur.mise)
             joueur.se_coucher()
             joueur.mise = 0
             self.stats_dao.incrementer_statistique(joueur.pseudo, "nombre_folds")
@@ -240,12 +433,11 @@ class Partie:
             # Si un seul joueur reste actif, on annonce le résultat directement
             actifs = [j for j in self.table.joueurs if j.actif]
             if len(actifs) == 1:
-                self.indice_joueur_courant = self.table.joueurs.index(actifs[0])
-                gagnant = actifs[0]
-
-                if gagnant.mise > 0:
-                    self.comptage.pot += gagnant.mise
-                    gagnant.mise = 0
+                for j in self.table.joueurs:
+                    if j.mise > 0:
+                        self.comptage.ajouter_pot_perso(j, j.mise)
+                        j.mise = 0
+                self.comptage.ajouter_pot()
 
                 # S'assurer que l'état final est propre : marquer fin, invalider joueur courant
                 self.etat.finie = True
@@ -271,6 +463,8 @@ class Partie:
         for j in self.table.joueurs:
             if j.solde == 0 and j.actif:
                 self.joueurs_ayant_joue[j.pseudo] = True
+        if not joueur.actif or joueur.solde == 0:
+            self._retirer_de_anneau(joueur.pseudo)
 
         # Vérifier si le tour est terminé (all-in ou tous ont joué)
         if self._tour_termine():
@@ -291,19 +485,18 @@ class Partie:
         if len(actifs) <= 1:
             return True
 
-        limite_max = self.mise_max_autorisee()
-        # Si tous les joueurs actifs sont all-in, le tour est terminé
-        if all(j.solde == 0 or j.mise == limite_max for j in actifs):
+        # Les joueurs all-in n'ont plus à agir : leur mise plus faible est gérée par les pots
+        # secondaires. Seuls ceux qui ont encore des jetons doivent égaliser la mise max.
+        peuvent_miser = [j for j in actifs if j.solde > 0]
+        if not peuvent_miser:
             return True
 
-        mises_actifs = [j.mise for j in actifs]
-        mises_equivalentes = len(set(mises_actifs)) == 1
+        mises_equivalentes = all(j.mise == self.mise_max for j in peuvent_miser)
+        tous_ont_joue = all(self.joueurs_ayant_joue.get(j.pseudo, False) for j in peuvent_miser)
 
-        # Considérer qu'un joueur qui est all-in a "joué"
-        tous_ont_joue = all(
-            self.joueurs_ayant_joue.get(j.pseudo, False) or j.solde == 0
-            for j in actifs
-        )
+        if len(peuvent_miser) == 1 and peuvent_miser[0].mise >= self.mise_max:
+            # dernier joueur avec des jetons, qui couvre déjà toutes les mises
+            return True
 
         return mises_equivalentes and tous_ont_joue
 
@@ -327,22 +520,30 @@ class Partie:
             self.etat.joueur_courant = None
             return
 
-        start = self.indice_joueur_courant if self.indice_joueur_courant >= 0 else 0
-        next_idx = (start + 1) % nb_joueurs
-        boucle = 0
-        while boucle < nb_joueurs:
-            cand = self.table.joueurs[next_idx]
-            a_deja_joue = self.joueurs_ayant_joue.get(cand.pseudo, False)
-            # Conditions pour s'arrêter sur ce joueur :
-            # - il est actif
-            # - il n'est pas all-in (solde > 0)
-            # - il n'a pas encore joué ce tour
-            if cand.actif and cand.solde > 0 and not a_deja_joue:
-                self.indice_joueur_courant = next_idx
-                self.etat.joueur_courant = cand.pseudo
+        # l'anneau ne contient que les joueurs actifs et non all-in : il reste à sauter
+        # ceux qui ont déjà joué ce tour (en pratique, le suivant est presque toujours le bon)
+        if 0 <= self.indice_joueur_courant < nb_joueurs:
+            courant = self.table.joueurs[self.indice_joueur_courant].pseudo
+            if courant not in self._anneau:
+                # joueur hors de l'anneau (all-in sur la blind, arrivé en cours de main) :
+                # on repart du premier membre de l'anneau après son siège
+                courant = next(
+                    (j.pseudo for j in self.table.joueurs[self.indice_joueur_courant:]
+                     + self.table.joueurs[:self.indice_joueur_courant] if j.pseudo in self._dans_anneau),
+                    None,
+                )
+                courant = self._precedent.get(courant)
+            candidat = self._suivant_dans_anneau(courant)
+        else:
+            candidat = self._premier_postflop()
+        for _ in range(len(self._dans_anneau)):
+            if candidat is None:
+                break
+            if not self.joueurs_ayant_joue.get(candidat, False):
+                self.indice_joueur_courant = self.table.siege(candidat)
+                self.etat.joueur_courant = candidat
                 return
-            next_idx = (next_idx + 1) % nb_joueurs
-            boucle += 1
+            candidat = self._suivant_dans_anneau(candidat)
 
         # Aucun joueur trouvé : soit tous ont joué, soit tous sont all-in, soit pas d'actifs.
         # Si le tour est terminé, on le fait avancer automatiquement.
@@ -359,18 +560,24 @@ class Partie:
     # ---------------------------
     # Annoncer résultats / showdown
     # ---------------------------
+    def meilleure_main(self, pseudo: str) -> ResultatMain | None:
+        """
+        Meilleure main actuelle d'un joueur, à partir du flop, sans réévaluer ses cartes :
+        la main est complétée à chaque carte distribuée (affichage, bots, analyses).
+        """
+        return self.distrib.resultat(pseudo)
+
+    @_une_publication
     def annoncer_resultats(self) -> EtatPartie:
         self.etat.resultats = []
+        self.classement_abattage = []
+        self.mains_abattage = {}
 
         for j in self.table.joueurs:
             self.stats_dao.incrementer_statistique(j.pseudo, "nombre_total_mains_jouees")
 
         joueurs_en_jeu = [j for j in self.table.joueurs if j.actif or j.mise > 0]
 
-        # Mettre à jour le portefeuille de TOUS les joueurs en base
-        for j in joueurs_en_jeu:
-            JoueurDao().mettre_a_jour_solde(j.pseudo, j.solde)
-
         # Cas : un seul joueur en jeu => gagne immédiatement
         if len(joueurs_en_jeu) <= 1:
             if joueurs_en_jeu:
@@ -383,71 +590,93 @@ class Partie:
                     "description": "Gagne car les autres se sont couchés."
                 }]
 
-            self.comptage.pot = 0
+            self.comptage = Comptage()
             self.etat.finie = True
             self.indice_joueur_courant = -1
-            self._mettre_a_jour_etat()
             self.etat.rejouer = {j.pseudo: None for j in self.table.joueurs}
-            for j in self.table.joueurs:
-                JoueurDao().mettre_a_jour_solde(j.pseudo, j.solde)
+            self._mettre_a_jour_etat()
+            self._regler_main()
             return self.etat
 
         # Cas normal : showdown
         for j in joueurs_en_jeu:
             self.stats_dao.incrementer_statistique(j.pseudo, "nombre_fois_abattage")
 
-        scores = {}
+        # Consolider les dernières mises avant de découper les pots
+        for j in self.table.joueurs:
+            if j.mise > 0:
+                self.comptage.ajouter_pot_perso(j, j.mise)
+                j.mise = 0
+        self.comptage.ajouter_pot()
+
+        # Une évaluation par joueur (la main suivie depuis la distribution si elle correspond
+        # aux cartes), puis groupes de joueurs à égalité, de la meilleure main à la moins bonne
+        # (conservés pour la suite : historique, analyses)
         for j in joueurs_en_jeu:
-            cartes_totales = j.main + self.table.board
-            evaluateur = EvaluateurMain(cartes_totales)
-            resultat = evaluateur.evalue_main()
-            scores[j] = resultat
-
-        gagnants = [joueurs_en_jeu[0]]
-        for j in joueurs_en_jeu[1:]:
-            cmp = EvaluateurMain.comparer_mains(scores[j], scores[gagnants[0]])
-            if cmp == 1:
-                gagnants = [j]
-            elif cmp == 0:
-                gagnants.append(j)
-
-        if self.comptage.pot > 0:
-            part = self.comptage.pot // len(gagnants)
-            for j in gagnants:
-                j.solde += part
-
-                # Incrémenter stats de victoire pour le gagnant
-                self.stats_dao.incrementer_statistique(j.pseudo, "nombre_victoire_abattage")
-
-                self.etat.resultats.append({
-                    "pseudo": j.pseudo,
-                    "main": [str(c) for c in j.main],
-                    "description": "Gagne parce qu'il avait une meilleure combinaison"
-                })
-            self.comptage.pot = 0
+            cartes = j.main + self.table.board
+            self.mains_abattage[j] = (
+                self.distrib.resultat(j.pseudo, cartes) or EvaluateurMain(cartes).evalue_main()
+            )
+        classement = EvaluateurMain.classer_resultats(self.mains_abattage)
+        self.classement_abattage = classement
+
+        # Jetons indivisibles : au premier gagnant à gauche du donneur
+        # (initialiser_blinds a déjà avancé indice_dealer sur ce joueur)
+        nb_joueurs = len(self.table.joueurs)
+        debut = self.table.indice_dealer % nb_joueurs
+        ordre = self.table.joueurs[debut:] + self.table.joueurs[:debut]
+
+        gains = {}
+        for attribution in self.comptage.repartir_pots(classement, ordre):
+            if len(attribution["eligibles"]) < 2:
+                # mise non suivie rendue à son auteur : ce n'est pas une victoire
+                continue
+            for j, montant in attribution["gains"].items():
+                gains[j] = gains.get(j, 0) + montant
+
+        for j in ordre:
+            if j not in gains:
+                continue
+            # Incrémenter stats de victoire pour le gagnant
+            self.stats_dao.incrementer_statistique(j.pseudo, "nombre_victoire_abattage")
+
+            self.etat.resultats.append({
+                "pseudo": j.pseudo,
+                "main": [str(c) for c in j.main],
+                "gain": gains[j],
+                "description": "Gagne parce qu'il avait une meilleure combinaison"
+            })
 
         # Marquer fin et préparer rejouer
         self.etat.finie = True
         self.indice_joueur_courant = -1
         self.etat.rejouer = {j.pseudo: None for j in self.table.joueurs}
         self._mettre_a_jour_etat()
-        for j in self.table.joueurs:
-            JoueurDao().mettre_a_jour_solde(j.pseudo, j.solde)
+        self._regler_main()
         return self.etat
 
+    def _regler_main(self) -> None:
+        """
+        Écrit en une seule transaction les soldes finaux et les statistiques de la main.
+        L'écriture passe par la file d'écriture : la partie n'attend pas la base de données.
+        """
+        soldes = {j.pseudo: j.solde for j in self.table.joueurs}
+        self.file_ecriture.soumettre(self.stats_dao.vider, soldes)
+
     # ---------------------------
     # Gestion du relancement / nouvelle main
     # ---------------------------
+    @_une_publication
     def gestion_rejouer(self) -> bool:
         """Prépare la partie pour une nouvelle main, réinitialise tout l'état."""
         # Filtrer les joueurs sans solde suffisant
-        joueurs_valides = [j for j in self.table.joueurs if j.solde >= Partie.GROSSE_BLIND]
+        joueurs_valides = [j for j in self.table.joueurs if j.solde >= self.GROSSE_BLIND]
 
         # Intégrer les joueurs en attente (sans doublon et avec solde suffisant)
         pseudos_deja_presents = {j.pseudo for j in joueurs_valides}
         for j in list(self.etat.liste_attente):
-            if j['solde'] >= Partie.GROSSE_BLIND and j['pseudo'] not in pseudos_deja_presents:
-                existant = next((x for x in self.table.joueurs if x.pseudo == j['pseudo']), None)
+            if j['solde'] >= self.GROSSE_BLIND and j['pseudo'] not in pseudos_deja_presents:
+                existant = self.table.joueur(j['pseudo'])
                 if existant:
                     joueurs_valides.append(existant)
                 else:
@@ -473,7 +702,7 @@ class Partie:
         # Réinitialiser pot, board et comptage
         self.table.board = []
         self.comptage = Comptage()
-        self.distrib = Distrib(self.table.joueurs)
+        self.distrib = Distrib(self.table.joueurs, self.table.deck)
         self.tour_actuel = "preflop"
         self.mise_max = 0
         self.indice_joueur_courant = 0
@@ -502,18 +731,20 @@ class Partie:
             "solde": joueur.solde,
             "jeton": joueur.jeton if hasattr(joueur, "jeton") else None
         })
+        self._publier()
 
     # ---------------------------
     # Reponse après la main : rejouer or not
     # ---------------------------
+    @_une_publication
     def reponse_rejouer(self, pseudo: str, veut_rejouer: bool) -> EtatPartie:
         """Un joueur répond s’il veut rejouer ou non."""
-        joueur = next((j for j in self.table.joueurs if j.pseudo == pseudo), None)
+        joueur = self.table.joueur(pseudo)
         if not joueur:
             return self.etat
 
         # Si le joueur n'a pas assez de jetons, forcer "Non"
-        if joueur.solde < Partie.GROSSE_BLIND:
+        if joueur.solde < self.GROSSE_BLIND:
             veut_rejouer = False
 
         self.etat.rejouer[pseudo] = veut_rejouer
@@ -524,6 +755,7 @@ class Partie:
         self._mettre_a_jour_etat()
         return self.etat
 
+    @_une_publication
     def _relancer_si_possible(self):
         """Vérifie qui veut rejouer et relance une nouvelle main si possible."""
         # Vérifier que tous les joueurs ont répondu
@@ -533,11 +765,11 @@ class Partie:
             return
 
         # Filtrer les joueurs sans solde suffisant
-        joueurs_valides = [j for j in self.table.joueurs if j.solde >= Partie.GROSSE_BLIND]
+        joueurs_valides = [j for j in self.table.joueurs if j.solde >= self.GROSSE_BLIND]
 
         # Ajouter les joueurs en liste d'attente avec solde suffisant
         pseudos_en_attente = {
-            j['pseudo'] for j in self.etat.liste_attente if j['solde'] >= Partie.GROSSE_BLIND}
+            j['pseudo'] for j in self.etat.liste_attente if j['solde'] >= self.GROSSE_BLIND}
         pseudos_rejouent = {pseudo for pseudo, rejoue in self.etat.rejouer.items() if rejoue}
 
         # Si moins de 2 joueurs combinés veulent rejouer / sont en attente, on ne relance pas
@@ -556,7 +788,7 @@ class Partie:
 
         # Intégrer les joueurs en attente
         for j in list(self.etat.liste_attente):
-            if j["solde"] >= Partie.GROSSE_BLIND and j["pseudo"] not in pseudos_deja_presents:
+            if j["solde"] >= self.GROSSE_BLIND and j["pseudo"] not in pseudos_deja_presents:
                 joueur = Joueur(pseudo=j["pseudo"], solde=j["solde"])
                 joueurs_rejouent.append(joueur)
                 pseudos_deja_presents.add(j["pseudo"])
@@ -573,13 +805,13 @@ class Partie:
             self._mettre_a_jour_etat()
 
     # ---------------------------
-    # our ne pas gerer les pots secondaire
+    # Mise maximale (les pots secondaires gèrent les tapis inégaux)
     # ---------------------------
     def mise_max_autorisee(self) -> int:
-        return min(
-            j.solde + j.mise
-            for j in self.table.joueurs
-            if j.actif
+        """Mise totale maximale sur le tour : le plus gros tapis encore en jeu."""
+        return max(
+            (j.solde + j.mise for j in self.table.joueurs if j.actif),
+            default=0
         )
 
     def _set_first_player_postflop(self) -> None:
@@ -587,14 +819,10 @@ class Partie:
         Positionne le joueur devant parler en début de tour postflop,
         en prenant le premier joueur actif à gauche du bouton.
         """
-        nb = len(self.table.joueurs)
-        start = (self.table.indice_dealer + 1) % nb
+        premier = self._premier_postflop()
+        self.indice_joueur_courant = -1 if premier is None else self.table.siege(premier)
 
-        for k in range(nb):
-            i = (start + k) % nb
-            j = self.table.joueurs[i]
-            if j.actif and j.solde > 0:
-                self.indice_joueur_courant = i
-                return
-
-        self.indice_joueur_courant = -1
+    def _premier_postflop(self) -> str | None:
+        while self._tete_anneau is not None and not self._peut_agir(self._tete_anneau):
+            pass
+        return self._tete_anneau
@@ -2,37 +2,120 @@ from src.business_object.cartes import Deck
 from src.business_object.joueurs import Joueur
 
 
+def _reindexer_apres(methode):
+    """Enveloppe une méthode de list pour reconstruire l'index des sièges après modification."""
+    def modifier(self, *args):
+        resultat = methode(self, *args)
+        self._indexer()
+        return resultat
+    modifier.__name__ = methode.__name__
+    return modifier
+
+
+class Sieges(list):
+    """
+    Joueurs assis à une table, dans l'ordre des sièges, avec un index pseudo -> siège.
+
+    Toutes les modifications de la liste tiennent l'index à jour : chercher un joueur
+    par son pseudo ne parcourt plus la table.
+    """
+
+    def __init__(self, joueurs=()):
+        super().__init__(joueurs)
+        self._indexer()
+
+    def _indexer(self) -> None:
+        self.index_pseudos: dict[str, int] = {}
+        for i, joueur in enumerate(self):
+            self.index_pseudos.setdefault(joueur.pseudo, i)
+
+    def siege(self, pseudo: str) -> int | None:
+        """Indice du siège du joueur, None s'il n'est pas à la table"""
+        return self.index_pseudos.get(pseudo)
+
+    def joueur(self, pseudo: str) -> Joueur | None:
+        """Joueur assis sous ce pseudo, None s'il n'est pas à la table"""
+        siege = self.index_pseudos.get(pseudo)
+        return None if siege is None else self[siege]
+
+    def append(self, joueur: Joueur) -> None:
+        self.index_pseudos.setdefault(joueur.pseudo, len(self))
+        super().append(joueur)
+
+    extend = _reindexer_apres(list.extend)
+    insert = _reindexer_apres(list.insert)
+    remove = _reindexer_apres(list.remove)
+    pop = _reindexer_apres(list.pop)
+    clear = _reindexer_apres(list.clear)
+    sort = _reindexer_apres(list.sort)
+    reverse = _reindexer_apres(list.reverse)
+    __setitem__ = _reindexer_apres(list.__setitem__)
+    __delitem__ = _reindexer_apres(list.__delitem__)
+    __iadd__ = _reindexer_apres(list.__iadd__)
+
+
 class Table:
-    def __init__(self, id, blind=10) -> None:
+    PLACES_MAX = 5
+
+    def __init__(self, id, blind=10, places_max: int = PLACES_MAX) -> None:
         self.id = id
-        self.joueurs = []
+        # appelé avec (table, variation du nombre de joueurs) à chaque arrivée ou départ
+        self.surveillant = None
+        self._joueurs = Sieges()
+        self.places_max = places_max
         self.blind = blind
         self.pot = 0
         self.indice_dealer = 0
         self.deck = Deck()
         self.board = []
 
+    @property
+    def joueurs(self) -> list[Joueur]:
+        return self._joueurs
+
+    @joueurs.setter
+    def joueurs(self, joueurs: list[Joueur]) -> None:
+        variation = len(joueurs) - len(self._joueurs)
+        self._joueurs = joueurs if isinstance(joueurs, Sieges) else Sieges(joueurs)
+        self._signaler(variation)
+
+    def _signaler(self, variation: int) -> None:
+        if variation and self.surveillant is not None:
+            self.surveillant(self, variation)
+
+    def est_pleine(self) -> bool:
+        return len(self._joueurs) >= self.places_max
+
+    def siege(self, pseudo: str) -> int | None:
+        """Indice du siège du joueur, None s'il n'est pas à la table"""
+        return self._joueurs.siege(pseudo)
+
+    def joueur(self, pseudo: str) -> Joueur | None:
+        """Joueur assis sous ce pseudo, None s'il n'est pas à la table"""
+        return self._joueurs.joueur(pseudo)
+
     def ajouter_joueur(self, joueur: Joueur) -> int:
         """ajoute un joueur a la table"""
-        if joueur in self.joueurs:
+        if self.siege(joueur.pseudo) is not None:
             return 2
-        if len(self.joueurs) >= 5:
+        if self.est_pleine():
             return 3
-            self.joueurs.append(joueur)
-        self.joueurs.append(joueur)
+        self._joueurs.append(joueur)
+        self._signaler(1)
         return 1
 
     def supprimer_joueur(self, joueur: Joueur) -> None:
         """enleve un joueur de la table"""
-        if joueur not in self.joueurs:
+        siege = self.siege(joueur.pseudo)
+        if siege is None:
             raise ValueError("Ce joueur n'est pas à la table.")
-        self.joueurs.remove(joueur)
+        del self._joueurs[siege]
+        self._signaler(-1)
 
     def reset_table(self) -> None:
         """Prépare la table pour une nouvelle main."""
         self.pot = 0
         self.board = []
-        self.deck = Deck()
         self.deck.remplir()
         self.deck.melanger()
 
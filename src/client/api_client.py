@@ -1,9 +1,12 @@
 # src/client/api_client.py
+import json
 import os
 import requests
 
 BASE_URL = os.environ.get("API_BASE_URL", "http://localhost:8000")
 TIMEOUT = 5  # secondes
+# le serveur envoie un message de maintien toutes les 15 s : au-delà, la connexion est perdue
+TIMEOUT_FLUX = 30
 
 
 class APIError(Exception):
@@ -43,3 +46,29 @@ def get(path: str, params=None):
         raise APIError(f"HTTP {r.status_code}: {r.text}") from e
     except Exception as e:
         raise APIError(str(e)) from e
+
+
+def ecouter(path: str, params=None):
+    """
+    Générateur des événements Server-Sent Events d'un endpoint.
+    Chaque événement est renvoyé sous forme de dict (données JSON décodées).
+    """
+    try:
+        with requests.get(
+            _url(path), params=params, stream=True, timeout=(TIMEOUT, TIMEOUT_FLUX)
+        ) as r:
+            r.raise_for_status()
+            donnees = []
+            for ligne in r.iter_lines(decode_unicode=True):
+                if ligne is None or ligne.startswith(":"):
+                    continue  # commentaire de maintien de connexion
+                if ligne == "":
+                    if donnees:
+                        yield json.loads("\n".join(donnees))
+                        donnees = []
+                elif ligne.startswith("data:"):
+                    donnees.append(ligne[5:].lstrip())
+    except requests.HTTPError as e:
+        raise APIError(f"HTTP {r.status_code}: {r.text}") from e
+    except Exception as e:
+        raise APIError(str(e)) from e
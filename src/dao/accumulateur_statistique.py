@@ -0,0 +1,116 @@
+import atexit
+import logging
+import threading
+
+from src.utils.singleton import Singleton
+from src.utils.log_decorator import log
+
+from src.dao.statistique_dao import StatistiqueDao
+from src.dao.joueur_dao import JoueurDao
+
+
+class AccumulateurStatistique(metaclass=Singleton):
+    """
+    Accumule en mémoire les incréments de statistiques des joueurs.
+
+    Les actions de jeu n'attendent plus la base de données : les incréments sont agrégés
+    par (pseudo, statistique) puis écrits en une seule requête par vider(), appelée en fin
+    de main (avec les soldes du règlement, suivis du meilleur classement des joueurs de la
+    main), périodiquement par le scheduler et à l'arrêt du programme.
+    """
+
+    def __init__(self, dao: StatistiqueDao | None = None, joueur_dao: JoueurDao | None = None):
+        self.dao = dao or StatistiqueDao()
+        self.joueur_dao = joueur_dao or JoueurDao()
+        self._verrou = threading.Lock()
+        self._deltas: dict[tuple[str, str], int] = {}
+        # derniers soldes non encore écrits (pseudo -> portefeuille)
+        self._soldes: dict[str, int] = {}
+        # fonctions appelées avec les soldes une fois un règlement écrit en base
+        self._abonnes_reglement: list = []
+        atexit.register(self.vider)
+
+    def abonner_reglement(self, rappel) -> None:
+        """Enregistre une fonction appelée avec les soldes (pseudo -> portefeuille) écrits."""
+        if rappel not in self._abonnes_reglement:
+            self._abonnes_reglement.append(rappel)
+
+    def incrementer_statistique(self, pseudo: str, stat_a_incrementer: str, valeur: int = 1):
+        """Enregistre un incrément, sans accès à la base de données.
+
+        Parameters
+        ----------
+        pseudo: str
+            pseudo du joueur dont on souhaite incrémenter une statistique
+        stat_a_incrementer: str
+            nom de la statistique que l'on souhaite incrementer
+        valeur: int
+            valeur dont on souhaite augmenter la statistique, par défaut vaut 1"""
+        if stat_a_incrementer not in StatistiqueDao.CHAMPS_AUTORISES:
+            raise ValueError(f"Champ '{stat_a_incrementer}' non autorisé pour la mise à jour.")
+        cle = (pseudo, stat_a_incrementer)
+        with self._verrou:
+            self._deltas[cle] = self._deltas.get(cle, 0) + valeur
+
+    def en_attente(self) -> dict[tuple[str, str], int]:
+        """Copie des incréments pas encore écrits en base"""
+        with self._verrou:
+            return dict(self._deltas)
+
+    @log
+    def vider(self, soldes: dict[str, int] | None = None) -> int:
+        """Écrit tous les incréments en attente en une seule requête.
+
+        Les soldes d'un règlement de main sont écrits dans la même requête, donc dans la
+        même transaction que les statistiques. En cas d'erreur, incréments et soldes sont
+        conservés pour la prochaine tentative.
+
+        Parameters
+        ----------
+        soldes: dict[str, int] | None
+            soldes finaux des joueurs à enregistrer (pseudo -> portefeuille)
+
+        Returns
+        -------
+        int
+            nombre d'incréments écrits"""
+        with self._verrou:
+            self._soldes.update(soldes or {})
+            lot, self._deltas = self._deltas, {}
+            lot_soldes, self._soldes = self._soldes, {}
+        if not lot and not lot_soldes:
+            return 0
+
+        try:
+            if lot_soldes:
+                self.joueur_dao.regler_main(lot_soldes, lot)
+                self._classer(list(lot_soldes))
+                self._notifier_reglement(lot_soldes)
+            else:
+                self.dao.incrementer_statistiques_lot(lot)
+        except Exception as e:
+            logging.info(e)
+            with self._verrou:
+                for cle, valeur in lot.items():
+                    self._deltas[cle] = self._deltas.get(cle, 0) + valeur
+                for pseudo, solde in lot_soldes.items():
+                    # un solde plus récent a pu arriver entre temps : il est prioritaire
+                    self._soldes.setdefault(pseudo, solde)
+            return 0
+        return len(lot)
+
+    def _notifier_reglement(self, soldes: dict[str, int]) -> None:
+        for rappel in list(self._abonnes_reglement):
+            try:
+                rappel(soldes)
+            except Exception as e:
+                logging.info(e)
+
+    def _classer(self, pseudos: list[str]) -> None:
+        """Met à jour le meilleur classement des joueurs dont le portefeuille a changé.
+        Les autres joueurs, qui ont pu gagner des places, et les échecs sont rattrapés par
+        la tâche périodique sur toute la table ; un échec n'annule pas le règlement."""
+        try:
+            self.dao.mettre_a_jour_meilleurs_classements(pseudos)
+        except Exception as e:
+            logging.info(e)
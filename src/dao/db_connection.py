@@ -1,7 +1,12 @@
 import os
+import threading
+import time
+from contextlib import contextmanager
+
 import dotenv
 import psycopg2
 
+from psycopg2 import pool
 from psycopg2.extras import RealDictCursor
 
 from src.utils.singleton import Singleton
@@ -10,24 +15,157 @@ from src.utils.singleton import Singleton
 class DBConnection(metaclass=Singleton):
     """
     Classe de connexion à la base de données
-    Elle permet de n'ouvrir qu'une seule et unique connexion
+    Elle gère un pool de connexions partagé par tous les DAO : chaque requête emprunte
+    une connexion le temps de son exécution, puis la rend au pool.
+
+    Taille et délais sont réglables par variables d'environnement :
+    POSTGRES_POOL_MIN, POSTGRES_POOL_MAX, POSTGRES_POOL_TIMEOUT (attente maximale d'une
+    connexion libre, en secondes) et POSTGRES_POOL_VERIFICATION (inactivité en secondes
+    au-delà de laquelle une connexion est testée avant d'être prêtée).
     """
 
     def __init__(self):
-        """Ouverture de la connexion"""
+        """Ouverture du pool de connexions"""
         dotenv.load_dotenv()
 
-        self.__connection = psycopg2.connect(
-            host=os.environ["POSTGRES_HOST"],
-            port=os.environ["POSTGRES_PORT"],
-            database=os.environ["POSTGRES_DATABASE"],
-            user=os.environ["POSTGRES_USER"],
-            password=os.environ["POSTGRES_PASSWORD"],
-            options=f"-c search_path={os.environ['POSTGRES_SCHEMA']}",
-            cursor_factory=RealDictCursor,
-        )
-        self.connection.autocommit = True
+        self.taille_min = int(os.environ.get("POSTGRES_POOL_MIN", 1))
+        self.taille_max = int(os.environ.get("POSTGRES_POOL_MAX", 10))
+        self.delai_attente = float(os.environ.get("POSTGRES_POOL_TIMEOUT", 30))
+        self.delai_verification = float(os.environ.get("POSTGRES_POOL_VERIFICATION", 30))
+
+        self._parametres = {
+            "host": os.environ["POSTGRES_HOST"],
+            "port": os.environ["POSTGRES_PORT"],
+            "database": os.environ["POSTGRES_DATABASE"],
+            "user": os.environ["POSTGRES_USER"],
+            "password": os.environ["POSTGRES_PASSWORD"],
+            "options": f"-c search_path={os.environ['POSTGRES_SCHEMA']}",
+            "cursor_factory": RealDictCursor,
+        }
+
+        # le sémaphore fait patienter les emprunteurs au lieu de lever PoolError
+        self._places = threading.BoundedSemaphore(self.taille_max)
+        self._verrou = threading.Lock()
+        self._dernier_usage: dict[int, float] = {}
+        self._metriques = {
+            "emprunts": 0,
+            "en_cours": 0,
+            "max_en_cours": 0,
+            "attente_totale_s": 0.0,
+            "attente_max_s": 0.0,
+            "attentes_expirees": 0,
+            "reconnexions": 0,
+        }
+        self._pool = self._creer_pool()
+
+    def _creer_pool(self) -> pool.ThreadedConnectionPool:
+        return pool.ThreadedConnectionPool(self.taille_min, self.taille_max, **self._parametres)
 
     @property
     def connection(self):
-        return self.__connection
+        """Compatibilité : `with DBConnection().connection as conn` emprunte une connexion."""
+        return self.connexion()
+
+    @contextmanager
+    def connexion(self):
+        """
+        Emprunte une connexion du pool pour la durée du bloc `with`.
+
+        La connexion est rendue à la sortie du bloc. Si elle s'est révélée inutilisable
+        (coupure réseau, redémarrage du serveur), elle est fermée et le pool en ouvrira
+        une nouvelle.
+        """
+        debut = time.perf_counter()
+        if not self._places.acquire(timeout=self.delai_attente):
+            with self._verrou:
+                self._metriques["attentes_expirees"] += 1
+            raise pool.PoolError(
+                f"Aucune connexion disponible après {self.delai_attente} s "
+                f"({self.taille_max} connexions utilisées)."
+            )
+        attente = time.perf_counter() - debut
+
+        connexion = None
+        cassee = False
+        try:
+            connexion = self._emprunter()
+            with self._verrou:
+                m = self._metriques
+                m["emprunts"] += 1
+                m["en_cours"] += 1
+                m["max_en_cours"] = max(m["max_en_cours"], m["en_cours"])
+                m["attente_totale_s"] += attente
+                m["attente_max_s"] = max(m["attente_max_s"], attente)
+            try:
+                with connexion:
+                    yield connexion
+            except (psycopg2.OperationalError, psycopg2.InterfaceError):
+                cassee = True
+                raise
+            finally:
+                with self._verrou:
+                    self._metriques["en_cours"] -= 1
+        finally:
+            if connexion is not None:
+                self._rendre(connexion, cassee or connexion.closed)
+            self._places.release()
+
+    def _emprunter(self):
+        """Renvoie une connexion en état de marche, en remplaçant celles qui sont cassées."""
+        for _ in range(self.taille_max + 1):
+            connexion = self._pool.getconn()
+            if self._est_valide(connexion):
+                connexion.autocommit = True
+                return connexion
+
+            # le pool ouvrira une nouvelle connexion au prochain getconn
+            with self._verrou:
+                self._metriques["reconnexions"] += 1
+            self._rendre(connexion, fermer=True)
+        raise pool.PoolError("Impossible d'obtenir une connexion valide.")
+
+    def _est_valide(self, connexion) -> bool:
+        """Vérifie une connexion fermée ou restée longtemps inutilisée."""
+        if connexion.closed:
+            return False
+        maintenant = time.monotonic()
+        if maintenant - self._dernier_usage.get(id(connexion), maintenant) < self.delai_verification:
+            return True
+        try:
+            with connexion.cursor() as cursor:
+                cursor.execute("SELECT 1;")
+            return True
+        except psycopg2.Error:
+            return False
+
+    def _rendre(self, connexion, fermer: bool = False) -> None:
+        if fermer:
+            self._dernier_usage.pop(id(connexion), None)
+        else:
+            self._dernier_usage[id(connexion)] = time.monotonic()
+        self._pool.putconn(connexion, close=fermer)
+
+    def metriques(self) -> dict:
+        """
+        Indicateurs d'utilisation du pool.
+
+        Returns
+        -------
+        dict
+            taille du pool, connexions empruntées (en cours et maximum observé),
+            nombre d'emprunts, temps d'attente moyen et maximal (ms), attentes expirées
+            et reconnexions
+        """
+        with self._verrou:
+            m = dict(self._metriques)
+        attente_totale = m.pop("attente_totale_s")
+        attente_max = m.pop("attente_max_s")
+        return {
+            "taille_min": self.taille_min,
+            "taille_max": self.taille_max,
+            **m,
+            "taux_utilisation": round(m["en_cours"] / self.taille_max, 3),
+            "attente_moyenne_ms": round(1000 * attente_totale / m["emprunts"], 3)
+            if m["emprunts"] else 0.0,
+            "attente_max_ms": round(1000 * attente_max, 3),
+        }
@@ -0,0 +1,85 @@
+import atexit
+import logging
+import queue
+import threading
+from concurrent.futures import Future
+
+from src.utils.singleton import Singleton
+
+
+class FileEcriture(metaclass=Singleton):
+    """
+    File d'écritures en base de données traitée par un thread dédié.
+
+    Le code de jeu soumet ses écritures sans attendre la base : elles sont exécutées
+    une par une, dans l'ordre de soumission, ce qui garantit par exemple que les soldes
+    d'une main sont écrits avant ceux de la main suivante.
+    """
+
+    def __init__(self):
+        self._file = queue.Queue()
+        self._verrou = threading.Lock()
+        self._thread = None
+        atexit.register(self.attendre, 10)
+
+    def soumettre(self, fonction, *args, **kwargs) -> Future:
+        """
+        Ajoute une écriture à la file.
+
+        Parameters
+        ----------
+        fonction : callable
+            fonction à exécuter dans le thread d'écriture
+        *args, **kwargs
+            arguments de la fonction
+
+        Returns
+        -------
+        Future
+            résultat (ou exception) de la fonction une fois exécutée
+        """
+        self._demarrer()
+        futur = Future()
+        self._file.put((futur, fonction, args, kwargs))
+        return futur
+
+    def en_attente(self) -> int:
+        """Nombre d'écritures pas encore exécutées"""
+        return self._file.qsize()
+
+    def attendre(self, timeout: float | None = None) -> bool:
+        """
+        Attend que toutes les écritures soumises jusqu'ici soient exécutées.
+
+        Returns
+        -------
+        bool
+            True si la file a été vidée avant la fin du délai
+        """
+        if self._thread is None:
+            return True
+        try:
+            self.soumettre(lambda: None).result(timeout)
+        except TimeoutError:
+            return False
+        return True
+
+    def _demarrer(self) -> None:
+        with self._verrou:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._boucle, name="file-ecriture", daemon=True
+                )
+                self._thread.start()
+
+    def _boucle(self) -> None:
+        while True:
+            futur, fonction, args, kwargs = self._file.get()
+            try:
+                if futur.set_running_or_notify_cancel():
+                    futur.set_result(fonction(*args, **kwargs))
+            except Exception as e:
+                logging.info(e)
+                futur.set_exception(e)
+            finally:
+                self._file.task_done()
@@ -29,7 +29,7 @@ class JoueurDao(metaclass=Singleton):
         Retourne True si succès, False sinon
         """
         try:
-            with DBConnection().connection as connection:
+            with DBConnection().connexion() as connection:
                 with connection.cursor() as cursor:
                     cursor.execute(
                         """
@@ -50,7 +50,7 @@ class JoueurDao(metaclass=Singleton):
     def trouver_par_pseudo(self, pseudo: str) -> dict | None:
         """Trouver un joueur grâce à son pseudo"""
         try:
-            with DBConnection().connection as connection:
+            with DBConnection().connexion() as connection:
                 with connection.cursor() as cursor:
                     cursor.execute(
                         """
@@ -71,7 +71,7 @@ class JoueurDao(metaclass=Singleton):
     def lister_tous(self) -> list[dict]:
         """Lister tous les joueurs de la base"""
         try:
-            with DBConnection().connection as connection:
+            with DBConnection().connexion() as connection:
                 with connection.cursor() as cursor:
                     cursor.execute(
                         """
@@ -90,7 +90,7 @@ class JoueurDao(metaclass=Singleton):
     def modifier(self, joueur: dict) -> bool:
         """Modifier les informations d'un joueur dans la base"""
         try:
-            with DBConnection().connection as connection:
+            with DBConnection().connexion() as connection:
                 with connection.cursor() as cursor:
                     cursor.execute(
                         """
@@ -112,7 +112,7 @@ class JoueurDao(metaclass=Singleton):
     def supprimer(self, pseudo: str) -> bool:
         """Supprimer un joueur grâce à son pseudo"""
         try:
-            with DBConnection().connection as connection:
+            with DBConnection().connexion() as connection:
                 with connection.cursor() as cursor:
                     cursor.execute(
                         "DELETE FROM joueurs WHERE pseudo = %(pseudo)s;",
@@ -133,7 +133,7 @@ class JoueurDao(metaclass=Singleton):
         - Sinon, met connecte = TRUE et retourne le joueur
         """
         try:
-            with DBConnection().connection as connection:
+            with DBConnection().connexion() as connection:
                 with connection.cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cursor:
                     cursor.execute(
                         """
@@ -164,7 +164,7 @@ class JoueurDao(metaclass=Singleton):
     def deconnecter(self, pseudo: str) -> bool:
         """Met connecte = FALSE pour le joueur et commit immédiatement."""
         try:
-            with DBConnection().connection as connection:
+            with DBConnection().connexion() as connection:
                 with connection.cursor() as cursor:
                     cursor.execute(
                         "UPDATE joueurs SET connecte = FALSE WHERE pseudo = %(pseudo)s;",
@@ -180,7 +180,7 @@ class JoueurDao(metaclass=Singleton):
     def valeur_portefeuille(self, pseudo: str) -> int | None:
         """Renvoie la valeur du portefeuille pour un joueur donné"""
         try:
-            with DBConnection().connection as connection:
+            with DBConnection().connexion() as connection:
                 with connection.cursor() as cursor:
                     cursor.execute(
                         """
@@ -199,43 +199,65 @@ class JoueurDao(metaclass=Singleton):
     # --------------------------------------------------------------------------
 
     @log
-    def classement_par_portefeuille(self, limit: int | None = None) -> list[dict]:
+    def classement_par_portefeuille(self, limit: int | None = None, offset: int = 0) -> list[dict]:
         """
-        Retourne le classement des joueurs selon la valeur de leur portefeuille (desc)
+        Retourne le classement des joueurs selon la valeur de leur portefeuille (desc),
+        départagés par pseudo. limit et offset permettent de n'en lire qu'une page.
         """
         try:
-            with DBConnection().connection as connection:
+            with DBConnection().connexion() as connection:
                 with connection.cursor() as cursor:
-                    if limit:
-                        cursor.execute(
-                            """
-                            SELECT pseudo, portefeuille
-                            FROM joueurs
-                            ORDER BY portefeuille DESC
-                            LIMIT %(limit)s;
-                            """,
-                            {"limit": limit},
-                        )
-                    else:
-                        cursor.execute(
-                            """
-                            SELECT pseudo, portefeuille
-                            FROM joueurs
-                            ORDER BY portefeuille DESC;
-                            """
-                        )
+                    # LIMIT NULL : pas de limite
+                    cursor.execute(
+                        """
+                        SELECT pseudo, portefeuille
+                        FROM joueurs
+                        ORDER BY portefeuille DESC, pseudo
+                        LIMIT %(limit)s OFFSET %(offset)s;
+                        """,
+                        {"limit": limit or None, "offset": offset},
+                    )
                     return cursor.fetchall() or []
         except Exception as e:
             logging.exception(e)
             return []
 
+    @log
+    def rang_par_portefeuille(self, pseudo: str) -> dict | None:
+        """
+        Rang d'un joueur dans le classement des portefeuilles (les ex aequo partagent le
+        même rang), compté grâce à l'index sur portefeuille sans trier toute la table.
+
+        Returns
+        -------
+        dict | None
+            pseudo, portefeuille et rang du joueur, None s'il n'existe pas
+        """
+        try:
+            with DBConnection().connexion() as connection:
+                with connection.cursor() as cursor:
+                    cursor.execute(
+                        """
+                        SELECT j.pseudo, j.portefeuille,
+                               1 + (SELECT COUNT(*) FROM joueurs AS a
+                                     WHERE a.portefeuille > j.portefeuille) AS rang
+                        FROM joueurs AS j
+                        WHERE j.pseudo = %(pseudo)s;
+                        """,
+                        {"pseudo": pseudo},
+                    )
+                    return cursor.fetchone()
+        except Exception as e:
+            logging.exception(e)
+            return None
+
     # --------------------------------------------------------------------------
 
     @log
     def code_de_parrainage_existe(self, code: str) -> bool:
         """Vérifie si un code de parrainage existe déjà"""
         try:
-            with DBConnection().connection as connection:
+            with DBConnection().connexion() as connection:
                 with connection.cursor() as cursor:
                     cursor.execute(
                         """
@@ -257,7 +279,7 @@ class JoueurDao(metaclass=Singleton):
     def mettre_a_jour_code_de_parrainage(self, pseudo: str, nouveau_code: str) -> bool:
         """Met à jour le code de parrainage pour un joueur donné"""
         try:
-            with DBConnection().connection as connection:
+            with DBConnection().connexion() as connection:
                 with connection.cursor() as cursor:
                     cursor.execute(
                         """
@@ -289,7 +311,7 @@ class JoueurDao(metaclass=Singleton):
             si le joueur n'existe pas.
         """
         try:
-            with DBConnection().connection as connection:
+            with DBConnection().connexion() as connection:
                 with connection.cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cursor:
                     cursor.execute(
                         """
@@ -310,7 +332,7 @@ class JoueurDao(metaclass=Singleton):
     def pseudo_existe(self, pseudo: str) -> bool:
         """Vérifie si un pseudo existe déjà"""
         try:
-            with DBConnection().connection as connection:
+            with DBConnection().connexion() as connection:
                 with connection.cursor() as cursor:
                     cursor.execute(
                         """
@@ -336,7 +358,7 @@ class JoueurDao(metaclass=Singleton):
         joueurs: list
             liste des pseudos des joueurs vérifiant les critères."""
         try:
-            with DBConnection().connection as connection:
+            with DBConnection().connexion() as connection:
                 with connection.cursor() as cursor:
                     cursor.execute(
                         "SELECT pseudo                          "
@@ -353,6 +375,55 @@ class JoueurDao(metaclass=Singleton):
             joueurs = [row["pseudo"] for row in res]
             return joueurs
 
+    @log
+    def crediter_auto_lot(self, montant: int, seuil: int = 50, taille_lot: int = 1000) -> list[str]:
+        """Crédite et date en une seule requête un lot de joueurs éligibles au crédit
+        automatique (portefeuille <= seuil, pas crédité depuis 7 jours).
+
+        Les lignes verrouillées par une autre transaction sont sautées (SKIP LOCKED) :
+        plusieurs lots peuvent être traités sans attente ni double crédit.
+
+        Parameters
+        ----------
+        montant: int
+            valeur ajoutée au portefeuille de chaque joueur
+        seuil: int
+            portefeuille maximal pour être crédité
+        taille_lot: int
+            nombre maximal de joueurs crédités par la requête
+
+        Returns
+        -------
+        list[str]
+            pseudos des joueurs crédités"""
+        try:
+            with DBConnection().connexion() as connection:
+                with connection.cursor() as cursor:
+                    cursor.execute(
+                        """
+                        WITH lot AS (
+                            SELECT pseudo
+                              FROM joueurs
+                             WHERE portefeuille <= %(seuil)s
+                               AND (date_dernier_credit_auto IS NULL
+                                    OR date_dernier_credit_auto < NOW() - INTERVAL '7 days')
+                             LIMIT %(taille_lot)s
+                               FOR UPDATE SKIP LOCKED
+                        )
+                        UPDATE joueurs AS j
+                           SET portefeuille = j.portefeuille + %(montant)s,
+                               date_dernier_credit_auto = NOW()
+                          FROM lot
+                         WHERE j.pseudo = lot.pseudo
+                        RETURNING j.pseudo;
+                        """,
+                        {"montant": montant, "seuil": seuil, "taille_lot": taille_lot},
+                    )
+                    return [row["pseudo"] for row in cursor.fetchall()]
+        except Exception as e:
+            logging.info(e)
+            raise
+
     @log
     def crediter(self, pseudo: str, montant: int):
         """Crédite portefeuille d'un joueur en lui ajoutant un montant.
@@ -363,7 +434,7 @@ class JoueurDao(metaclass=Singleton):
         montant: int
             valeur dont on veut augmenter la valeur du portefeuille du joueur"""
         try:
-            with DBConnection().connection as connection:
+            with DBConnection().connexion() as connection:
                 with connection.cursor() as cursor:
                     query = f"UPDATE joueurs SET portefeuille = portefeuille + %(montant)s WHERE pseudo = %(pseudo)s;"
                     cursor.execute(query, {"montant": montant, "pseudo": pseudo})
@@ -382,7 +453,7 @@ class JoueurDao(metaclass=Singleton):
             pseudo du joueur dont on veut modifier la date de mise à jour du dernier crédit auto.
         """
         try:
-            with DBConnection().connection as connection:
+            with DBConnection().connexion() as connection:
                 with connection.cursor() as cursor:
                     query = f"UPDATE joueurs SET date_dernier_credit_auto = NOW() WHERE pseudo = %(pseudo)s;"
                     cursor.execute(query, {"pseudo": pseudo})
@@ -408,7 +479,7 @@ class JoueurDao(metaclass=Singleton):
             True si la mise à jour a réussi, False sinon.
         """
         try:
-            with DBConnection().connection as connection:
+            with DBConnection().connexion() as connection:
                 with connection.cursor() as cursor:
                     cursor.execute(
                         """
@@ -422,3 +493,61 @@ class JoueurDao(metaclass=Singleton):
         except Exception as e:
             logging.exception(e)
             return False
+
+    @log
+    def regler_main(
+        self, soldes: dict[str, int], statistiques: dict[tuple[str, str], int] | None = None
+    ) -> int:
+        """
+        Enregistre le règlement d'une main en une seule requête, donc une seule transaction :
+        les soldes finaux des joueurs et, éventuellement, leurs incréments de statistiques.
+
+        Parameters
+        ----------
+        soldes : dict[str, int]
+            Solde final de chaque joueur (pseudo -> portefeuille).
+        statistiques : dict[tuple[str, str], int] | None
+            Incréments de statistiques par (pseudo, statistique) à appliquer en même temps.
+
+        Returns
+        -------
+        int
+            Nombre de portefeuilles mis à jour.
+        """
+        champs, lignes_stats = StatistiqueDao.preparer_lot(statistiques or {})
+        if not soldes and not lignes_stats:
+            return 0
+
+        try:
+            with DBConnection().connexion() as connection:
+                with connection.cursor() as cursor:
+                    # requêtes de modification chaînées : tout est appliqué ou rien
+                    ctes = []
+                    if soldes:
+                        valeurs = ", ".join(
+                            cursor.mogrify("(%s, %s)", ligne).decode()
+                            for ligne in soldes.items()
+                        )
+                        ctes.append(
+                            "maj_soldes AS ("
+                            " UPDATE joueurs AS j SET portefeuille = v.portefeuille"
+                            f" FROM (VALUES {valeurs}) AS v(pseudo, portefeuille)"
+                            " WHERE j.pseudo = v.pseudo RETURNING j.pseudo)"
+                        )
+                    if lignes_stats:
+                        gabarit = "(" + ", ".join(["%s"] * (len(champs) + 1)) + ")"
+                        valeurs = ", ".join(
+                            cursor.mogrify(gabarit, ligne).decode() for ligne in lignes_stats
+                        )
+                        ctes.append(
+                            "maj_stats AS ("
+                            f" {StatistiqueDao.requete_lot(champs, valeurs)} RETURNING s.pseudo)"
+                        )
+                    nb_soldes = "(SELECT COUNT(*) FROM maj_soldes)" if soldes else "0"
+                    cursor.execute(
+                        f"WITH {', '.join(ctes)} SELECT {nb_soldes} AS nb_soldes;"
+                    )
+                    return cursor.fetchone()["nb_soldes"]
+        except Exception as e:
+            logging.exception(e)
+            raise
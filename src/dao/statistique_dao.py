@@ -1,5 +1,7 @@
 import logging
 
+from psycopg2.extras import execute_values
+
 from src.utils.singleton import Singleton
 from src.utils.log_decorator import log
 
@@ -31,7 +33,7 @@ class StatistiqueDao(metaclass=Singleton):
         pseudo: str
             pseudo du joueur que l'on souhaite ajouter dans la base de données, dans la table player_stats"""
         try:
-            with DBConnection().connection as connection:
+            with DBConnection().connexion() as connection:
                 with connection.cursor() as cursor:
                     cursor.execute(
                         """
@@ -60,7 +62,7 @@ class StatistiqueDao(metaclass=Singleton):
             dictionnaire contenant toutes les statistiques du joueur
         """
         try:
-            with DBConnection().connection as connection:
+            with DBConnection().connexion() as connection:
                 with connection.cursor() as cursor:
                     cursor.execute(
                         "SELECT *                           "
@@ -128,7 +130,7 @@ class StatistiqueDao(metaclass=Singleton):
             raise ValueError(f"Champ '{stat_a_mettre_a_jour}' non autorisé pour la mise à jour.")
 
         try:
-            with DBConnection().connection as connection:
+            with DBConnection().connexion() as connection:
                 with connection.cursor() as cursor:
                     query = f"UPDATE joueurs_statistiques SET {stat_a_mettre_a_jour} = %(valeur)s WHERE pseudo = %(pseudo)s;"
                     cursor.execute(query, {"valeur": valeur, "pseudo": pseudo})
@@ -151,7 +153,7 @@ class StatistiqueDao(metaclass=Singleton):
         if stat_a_incrementer not in self.CHAMPS_AUTORISES:
             raise ValueError(f"Champ '{stat_a_incrementer}' non autorisé pour la mise à jour.")
         try:
-            with DBConnection().connection as connection:
+            with DBConnection().connexion() as connection:
                 with connection.cursor() as cursor:
                     query = f"UPDATE joueurs_statistiques SET {stat_a_incrementer} = {stat_a_incrementer} + %(valeur)s WHERE pseudo = %(pseudo)s;"
                     cursor.execute(query, {"valeur": valeur, "pseudo": pseudo})
@@ -159,6 +161,123 @@ class StatistiqueDao(metaclass=Singleton):
             logging.info(e)
             raise
 
+    @classmethod
+    def preparer_lot(cls, deltas: dict[tuple[str, str], int]) -> tuple[list[str], list[tuple]]:
+        """Transforme des incréments (pseudo, statistique) en lignes pour une clause VALUES.
+
+        Parameters
+        ----------
+        deltas: dict[tuple[str, str], int]
+            incrément à appliquer pour chaque couple (pseudo, statistique)
+
+        Returns
+        -------
+        tuple[list[str], list[tuple]]
+            statistiques concernées, puis une ligne (pseudo, incréments...) par joueur"""
+        champs = sorted({champ for _, champ in deltas})
+        for champ in champs:
+            if champ not in cls.CHAMPS_AUTORISES:
+                raise ValueError(f"Champ '{champ}' non autorisé pour la mise à jour.")
+
+        lignes = {}
+        for (pseudo, champ), valeur in deltas.items():
+            lignes.setdefault(pseudo, dict.fromkeys(champs, 0))[champ] += valeur
+        return champs, [(pseudo, *(ligne[c] for c in champs)) for pseudo, ligne in lignes.items()]
+
+    @staticmethod
+    def requete_lot(champs: list[str], valeurs: str) -> str:
+        """Requête UPDATE ... FROM (VALUES ...) appliquant les incréments d'un lot."""
+        affectations = ", ".join(f"{c} = s.{c} + v.{c}" for c in champs)
+        colonnes = ", ".join(["pseudo", *champs])
+        return (
+            f"UPDATE joueurs_statistiques AS s SET {affectations} "
+            f"FROM (VALUES {valeurs}) AS v({colonnes}) WHERE s.pseudo = v.pseudo"
+        )
+
+    @log
+    def incrementer_statistiques_lot(self, deltas: dict[tuple[str, str], int]) -> int:
+        """Applique en une seule requête un lot d'incréments de statistiques.
+
+        Parameters
+        ----------
+        deltas: dict[tuple[str, str], int]
+            incrément à appliquer pour chaque couple (pseudo, statistique)
+
+        Returns
+        -------
+        int
+            nombre de joueurs mis à jour"""
+        champs, valeurs = self.preparer_lot(deltas)
+        if not valeurs:
+            return 0
+        try:
+            with DBConnection().connexion() as connection:
+                with connection.cursor() as cursor:
+                    execute_values(
+                        cursor, self.requete_lot(champs, "%s") + ";", valeurs,
+                        page_size=len(valeurs),
+                    )
+                    return cursor.rowcount
+        except Exception as e:
+            logging.info(e)
+            raise
+
+    @log
+    def mettre_a_jour_meilleurs_classements(self, pseudos: list[str] | None = None) -> int:
+        """Met à jour en une seule requête le meilleur classement des joueurs.
+
+        Le rang de chaque joueur est calculé par RANK() sur la valeur des portefeuilles
+        (les ex aequo partagent le même rang) ; seuls les joueurs dont le rang actuel
+        améliore leur meilleur classement sont modifiés.
+
+        Parameters
+        ----------
+        pseudos: list[str] | None
+            joueurs à classer (tous par défaut). Le rang de chacun est alors compté sur
+            l'index des portefeuilles, sans classer toute la table.
+
+        Returns
+        -------
+        int
+            nombre de joueurs dont le meilleur classement a changé"""
+        if pseudos is None:
+            rangs = """
+                SELECT pseudo,
+                       RANK() OVER (ORDER BY portefeuille DESC) AS rang
+                  FROM joueurs
+                 WHERE portefeuille IS NOT NULL
+            """
+        else:
+            if not pseudos:
+                return 0
+            rangs = """
+                SELECT j.pseudo,
+                       1 + (SELECT COUNT(*)
+                              FROM joueurs AS a
+                             WHERE a.portefeuille > j.portefeuille) AS rang
+                  FROM joueurs AS j
+                 WHERE j.pseudo = ANY(%(pseudos)s)
+                   AND j.portefeuille IS NOT NULL
+            """
+        try:
+            with DBConnection().connexion() as connection:
+                with connection.cursor() as cursor:
+                    cursor.execute(
+                        f"""
+                        UPDATE joueurs_statistiques AS s
+                           SET meilleur_classement = LEAST(s.meilleur_classement, r.rang)
+                          FROM ({rangs}) AS r
+                         WHERE s.pseudo = r.pseudo
+                           AND (s.meilleur_classement IS NULL
+                                OR r.rang < s.meilleur_classement);
+                        """,
+                        {"pseudos": list(pseudos or [])},
+                    )
+                    return cursor.rowcount
+        except Exception as e:
+            logging.info(e)
+            raise
+
     @log
     def recuperer_top_joueurs(self, limite: int = 10) -> list[dict]:
         """Renvoie la liste des meilleurs joueurs selon leur meilleur classement.
@@ -172,7 +291,7 @@ class StatistiqueDao(metaclass=Singleton):
         ------
         dict ou list"""
         try:
-            with DBConnection().connection as connection:
+            with DBConnection().connexion() as connection:
                 with connection.cursor() as cursor:
                     cursor.execute(
                         """
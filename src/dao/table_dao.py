@@ -27,7 +27,7 @@ class TableDao(metaclass=Singleton):
         id: int
             identifiant de la table dont on veut connaitre les joueurs"""
         try:
-            with DBConnection().connection as connection:
+            with DBConnection().connexion() as connection:
                 with connection.cursor() as cursor:
                     cursor.execute(
                         "SELECT *                           "
@@ -55,7 +55,7 @@ class TableDao(metaclass=Singleton):
         
         
         try:
-            with DBConnection().connection as connection:
+            with DBConnection().connexion() as connection:
                 with connection.cursor() as cursor:
                     query = f"UPDATE table_joueurs SET {joueur} = %(valeur)s WHERE id = %(id)s;"
                     cursor.execute(query, {"pseudo": pseudo, "id": id})
@@ -1,13 +1,31 @@
+from datetime import datetime
+
 from apscheduler.schedulers.background import BackgroundScheduler
 
 from src.service.joueur_service import JoueurService
 import pytz
 
-def lancer_auto_credit():
+
+def lancer_auto_credit(rattrapage: bool = True):
     """
     Fonction qui automatise le rechargement des portefeuilles de façon régulière.
+    Le rattrapage au démarrage est une tâche du scheduler : il s'exécute dans son thread,
+    sans retarder le démarrage du serveur.
+
+    Parameters
+    ----------
+    rattrapage : bool
+        False si l'appelant se charge lui-même du rattrapage au démarrage
+
+    Returns
+    -------
+    BackgroundScheduler
+        scheduler démarré, à arrêter à la fermeture du serveur
     """
-    scheduler = BackgroundScheduler(timezone=pytz.timezone("Europe/Paris"))
-    JoueurService().credit_auto()
+    fuseau = pytz.timezone("Europe/Paris")
+    scheduler = BackgroundScheduler(timezone=fuseau)
+    if rattrapage:
+        scheduler.add_job(JoueurService().credit_auto, "date", run_date=datetime.now(fuseau))
     scheduler.add_job(JoueurService().credit_auto, "cron", hour=15, minute=30)
     scheduler.start()
+    return scheduler
@@ -0,0 +1,35 @@
+from apscheduler.schedulers.background import BackgroundScheduler
+
+from src.dao.accumulateur_statistique import AccumulateurStatistique
+from src.dao.file_ecriture import FileEcriture
+from src.dao.statistique_dao import StatistiqueDao
+import pytz
+
+
+def vider_statistiques():
+    """
+    Soumet l'écriture des statistiques en attente à la file d'écriture, pour qu'elle reste
+    ordonnée avec les règlements de mains.
+    """
+    FileEcriture().soumettre(AccumulateurStatistique().vider)
+
+
+def mettre_a_jour_classements():
+    """
+    Soumet la mise à jour des meilleurs classements à la file d'écriture.
+    Rattrape les changements de portefeuille faits hors des mains (crédit automatique,
+    parrainage).
+    """
+    FileEcriture().soumettre(StatistiqueDao().mettre_a_jour_meilleurs_classements)
+
+
+def lancer_flush_statistiques(intervalle_secondes: int = 30, intervalle_classement: int = 300):
+    """
+    Fonction qui écrit régulièrement en base les statistiques accumulées en mémoire,
+    et met à jour les meilleurs classements.
+    """
+    scheduler = BackgroundScheduler(timezone=pytz.timezone("Europe/Paris"))
+    scheduler.add_job(vider_statistiques, "interval", seconds=intervalle_secondes)
+    scheduler.add_job(mettre_a_jour_classements, "interval", seconds=intervalle_classement)
+    scheduler.start()
+    return scheduler
@@ -0,0 +1,45 @@
+import asyncio
+import logging
+from functools import partial
+
+
+async def nettoyer_tables(tables_service, verrou_table, delai: float | None = None) -> list[int]:
+    """
+    Ferme les tables inactives une à une, chacune sous son verrou : une route qui joue
+    sur la table termine avant que la table ne soit fermée.
+    """
+    if delai is None:
+        delai = tables_service.DELAI_INACTIVITE
+    fermees = []
+    for id_table in tables_service.tables_fermables(delai):
+        async with verrou_table(id_table):
+            fermees += tables_service.nettoyer_tables_inactives(delai, ids=[id_table])
+    return fermees
+
+
+async def _repeter(tache, intervalle_secondes: int) -> None:
+    while True:
+        await asyncio.sleep(intervalle_secondes)
+        try:
+            await tache()
+        except Exception as e:
+            logging.exception(e)
+
+
+def lancer_nettoyage_tables(tables_service, verrou_table, intervalle_secondes: int = 60,
+                            matchmaking=None, intervalle_matchmaking: int = 5) -> asyncio.Future:
+    """
+    Fonction qui ferme régulièrement les tables ouvertes en plus du nombre initial
+    et restées vides plus longtemps que TableService.DELAI_INACTIVITE.
+    Si un service de placement est donné, sa file d'attente est servie et les joueurs
+    seuls à leur table sont regroupés entre deux mains.
+
+    Les tâches tournent dans la boucle asyncio du serveur et prennent les verrous des tables
+    comme les routes : elles ne modifient jamais une partie en même temps qu'elles.
+    À appeler depuis la boucle ; la tâche renvoyée est à annuler à la fermeture du serveur.
+    """
+    taches = [_repeter(partial(nettoyer_tables, tables_service, verrou_table), intervalle_secondes)]
+    if matchmaking is not None:
+        taches.append(_repeter(matchmaking.servir_file, intervalle_matchmaking))
+        taches.append(_repeter(matchmaking.reequilibrer, intervalle_matchmaking))
+    return asyncio.gather(*taches)
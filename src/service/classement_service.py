@@ -0,0 +1,159 @@
+import bisect
+import threading
+import time
+
+from src.utils.singleton import Singleton
+from src.utils.log_decorator import log
+
+from src.dao.joueur_dao import JoueurDao
+from src.dao.accumulateur_statistique import AccumulateurStatistique
+
+
+class ClassementService(metaclass=Singleton):
+    """
+    Classement des joueurs par portefeuille.
+
+    Les meilleurs joueurs sont gardés en mémoire, triés, et mis à jour à chaque règlement
+    de main : les premières pages et le rang d'un joueur du haut du classement sont servis
+    sans requête. Les pages plus profondes sont lues en base puis gardées en cache quelques
+    secondes.
+    """
+
+    TAILLE_TOP = 100
+    # le haut du classement est relu en base périodiquement, pour prendre en compte les
+    # changements de portefeuille faits hors des mains (crédit automatique, parrainage...)
+    DUREE_TOP = 300
+    DUREE_CACHE = 30
+
+    def __init__(self, taille_top: int = TAILLE_TOP, dao: JoueurDao | None = None):
+        self.taille_top = taille_top
+        self.dao = dao or JoueurDao()
+        self._verrou = threading.Lock()
+        # clés (-portefeuille, pseudo) triées, et portefeuille de chaque joueur présent
+        self._cles: list[tuple[int, str]] = []
+        self._portefeuilles: dict[str, int] = {}
+        # True si tous les joueurs de la base sont dans le top
+        self._complet = False
+        self._charge_le: float | None = None
+        self._cache: dict[tuple[int, int], tuple[float, list[dict]]] = {}
+        AccumulateurStatistique().abonner_reglement(self.mettre_a_jour_soldes)
+
+    # ---------------------------
+    # Mise à jour
+    # ---------------------------
+    def _charger(self) -> None:
+        """Relit le haut du classement en base (avec une marge pour absorber les baisses)."""
+        lignes = self.dao.classement_par_portefeuille(limit=2 * self.taille_top)
+        with self._verrou:
+            self._portefeuilles = {l["pseudo"]: l["portefeuille"] for l in lignes}
+            self._cles = sorted((-p, pseudo) for pseudo, p in self._portefeuilles.items())
+            self._complet = len(lignes) < 2 * self.taille_top
+            self._charge_le = time.monotonic()
+            self._cache.clear()
+
+    def _a_jour(self) -> None:
+        with self._verrou:
+            a_charger = (
+                self._charge_le is None
+                or time.monotonic() - self._charge_le > self.DUREE_TOP
+                or (not self._complet and len(self._cles) < self.taille_top)
+            )
+        if a_charger:
+            self._charger()
+
+    def mettre_a_jour_soldes(self, soldes: dict[str, int]) -> None:
+        """
+        Répercute les soldes d'un règlement de main sur le haut du classement.
+
+        Le top en mémoire contient toujours exactement les premiers joueurs de la base :
+        un joueur qui en sort par le bas est retiré, car un joueur absent du top pourrait
+        désormais le précéder.
+        """
+        with self._verrou:
+            if self._charge_le is None:
+                return
+            for pseudo, portefeuille in soldes.items():
+                ancien = self._portefeuilles.pop(pseudo, None)
+                if ancien is not None:
+                    self._cles.pop(bisect.bisect_left(self._cles, (-ancien, pseudo)))
+                cle = (-portefeuille, pseudo)
+                if self._complet or (self._cles and cle < self._cles[-1]):
+                    bisect.insort(self._cles, cle)
+                    self._portefeuilles[pseudo] = portefeuille
+            # borne la taille : ce qui dépasse n'est plus complet
+            if len(self._cles) > 2 * self.taille_top:
+                for _, pseudo in self._cles[2 * self.taille_top:]:
+                    del self._portefeuilles[pseudo]
+                del self._cles[2 * self.taille_top:]
+                self._complet = False
+            self._cache.clear()
+
+    # ---------------------------
+    # Lecture
+    # ---------------------------
+    def _rang(self, portefeuille: int) -> int:
+        """Rang dans le top (ex aequo au même rang), comme RANK() en base."""
+        return 1 + bisect.bisect_left(self._cles, (-portefeuille, ""))
+
+    @log
+    def page(self, limit: int = 50, offset: int = 0) -> list[dict]:
+        """
+        Page du classement.
+
+        Parameters
+        ----------
+        limit : int
+            nombre de joueurs renvoyés
+        offset : int
+            nombre de joueurs sautés depuis le haut du classement
+
+        Returns
+        -------
+        list[dict]
+            rang, pseudo et portefeuille de chaque joueur de la page
+        """
+        self._a_jour()
+        with self._verrou:
+            if self._complet or offset + limit <= len(self._cles):
+                return [
+                    {"rang": self._rang(-cle[0]), "pseudo": cle[1], "portefeuille": -cle[0]}
+                    for cle in self._cles[offset:offset + limit]
+                ]
+            en_cache = self._cache.get((limit, offset))
+            if en_cache and time.monotonic() - en_cache[0] < self.DUREE_CACHE:
+                return en_cache[1]
+
+        lignes = self.dao.classement_par_portefeuille(limit=limit, offset=offset)
+        page = []
+        for ligne in lignes:
+            # rang partagé avec la ligne précédente en cas d'égalité
+            if page and page[-1]["portefeuille"] == ligne["portefeuille"]:
+                rang = page[-1]["rang"]
+            elif not page:
+                rang = self.dao.rang_par_portefeuille(ligne["pseudo"])["rang"]
+            else:
+                rang = offset + len(page) + 1
+            page.append({"rang": rang, "pseudo": ligne["pseudo"], "portefeuille": ligne["portefeuille"]})
+        with self._verrou:
+            self._cache[(limit, offset)] = (time.monotonic(), page)
+        return page
+
+    @log
+    def rang_joueur(self, pseudo: str) -> dict | None:
+        """
+        Rang d'un joueur dans le classement.
+
+        Returns
+        -------
+        dict | None
+            rang, pseudo et portefeuille du joueur, None s'il n'existe pas
+        """
+        self._a_jour()
+        with self._verrou:
+            portefeuille = self._portefeuilles.get(pseudo)
+            if portefeuille is not None:
+                return {"rang": self._rang(portefeuille), "pseudo": pseudo, "portefeuille": portefeuille}
+        ligne = self.dao.rang_par_portefeuille(pseudo)
+        if ligne is None:
+            return None
+        return {"rang": ligne["rang"], "pseudo": ligne["pseudo"], "portefeuille": ligne["portefeuille"]}
@@ -0,0 +1,143 @@
+from src.utils.log_decorator import log
+
+from src.business_object.equite import CalculateurEquite
+from src.business_object.equite_preflop import TableEquitePreflop, conseiller, indice_main, nom_main
+from src.business_object.partie import Partie
+
+
+class EquiteService:
+    """Service de calcul d'équité pour les joueurs et l'analyse des parties."""
+
+    @log
+    def calculer_equite(
+        self, mains: list, board: list, nb_tirages: int = CalculateurEquite.NB_TIRAGES_DEFAUT,
+        exact: bool | None = None
+    ) -> dict:
+        """
+        Équité de mains quelconques face à un board partiel.
+
+        Parameters
+        ----------
+        mains : list[list[Carte]]
+            cartes privées de chaque joueur
+        board : list[Carte]
+            cartes communes connues (0 à 5)
+        nb_tirages : int
+            nombre de boards tirés en mode Monte-Carlo
+        exact : bool | None
+            force ou interdit l'énumération exhaustive
+
+        Returns
+        -------
+        dict
+            résultat de CalculateurEquite.calculer
+        """
+        return CalculateurEquite(nb_tirages=nb_tirages).calculer(mains, board, exact)
+
+    @log
+    def equite_partie(
+        self, partie: Partie, nb_cartes_board: int | None = None,
+        nb_tirages: int = CalculateurEquite.NB_TIRAGES_DEFAUT
+    ) -> tuple[bool, dict | None, str]:
+        """
+        Équité des joueurs encore en jeu d'une partie à tapis.
+
+        Les cartes privées ne sont révélées que lorsque plus aucun joueur ne peut agir :
+        tous les joueurs en jeu sont à tapis ou la main est terminée. Comme passer_tour
+        déroule alors le board jusqu'à la river, nb_cartes_board permet de retrouver
+        l'équité à chaque étape (0 au preflop, 3 au flop, 4 à la turn).
+
+        Parameters
+        ----------
+        partie : Partie
+            partie concernée
+        nb_cartes_board : int | None
+            nombre de cartes du board à prendre en compte (tout le board par défaut)
+        nb_tirages : int
+            nombre de boards tirés en mode Monte-Carlo
+
+        Returns
+        -------
+        tuple[bool, dict | None, str]
+            succès, résultat (mode, nb_tirages, équité par pseudo) et message d'erreur
+        """
+        en_jeu = [j for j in partie.table.joueurs if j.actif and len(j.main) == 2]
+        if len(en_jeu) < 2:
+            return False, None, "Il faut au moins deux joueurs en jeu pour calculer une équité."
+
+        main_terminee = getattr(partie.etat, "finie", False)
+        if not main_terminee and any(j.solde > 0 for j in en_jeu):
+            return False, None, (
+                "L'équité n'est disponible que lorsque tous les joueurs en jeu sont à tapis."
+            )
+
+        board = list(partie.table.board)
+        if nb_cartes_board is not None:
+            if nb_cartes_board not in (0, 3, 4, 5) or nb_cartes_board > len(board):
+                return False, None, f"Nombre de cartes du board invalide ({nb_cartes_board})."
+            board = board[:nb_cartes_board]
+
+        try:
+            resultat = CalculateurEquite(nb_tirages=nb_tirages).calculer(
+                [j.main for j in en_jeu], board
+            )
+        except ValueError as e:
+            return False, None, str(e)
+
+        return True, {
+            "mode": resultat["mode"],
+            "nb_tirages": resultat["nb_tirages"],
+            "board": [str(c) for c in board],
+            "joueurs": {j.pseudo: equite for j, equite in zip(en_jeu, resultat["mains"])},
+        }, ""
+
+    def charger_table_preflop(self) -> int:
+        """
+        Ouvre la table des équités préflop (au démarrage, pour ne pas le faire à la
+        première demande).
+
+        Returns
+        -------
+        int
+            nombre de donnes tirées par équité de la table
+        """
+        return TableEquitePreflop.partagee().nb_tirages
+
+    @log
+    def conseil_preflop(self, partie: Partie, pseudo: str) -> tuple[bool, dict | None, str]:
+        """
+        Équité préflop de la main d'un joueur contre les adversaires encore en jeu,
+        lue dans la table précalculée, et action conseillée.
+
+        Returns
+        -------
+        tuple[bool, dict | None, str]
+            succès, conseil (main, nb_adversaires, equite, part_egale, cote, conseil)
+            et message d'erreur
+        """
+        joueur = partie.table.joueur(pseudo)
+        if joueur is None or len(joueur.main) != 2:
+            return False, None, "Le joueur n'a pas de main en cours à cette table."
+        if getattr(partie.etat, "finie", False) or partie.tour_actuel != "preflop":
+            return False, None, "Le conseil n'est disponible qu'au préflop."
+        if not joueur.actif:
+            return False, None, "Le joueur s'est couché."
+
+        adversaires = [j for j in partie.table.joueurs if j.actif and j is not joueur]
+        if not adversaires:
+            return False, None, "Aucun adversaire encore en jeu."
+        try:
+            table = TableEquitePreflop.partagee()
+        except (OSError, ValueError) as e:
+            return False, None, f"Table des équités préflop indisponible : {e}"
+        nb_adversaires = min(len(adversaires), table.nb_adversaires_max)
+
+        equite = table.equite(joueur.main, nb_adversaires)
+        pot = partie.comptage.pot + sum(j.mise for j in partie.table.joueurs)
+        a_suivre = max(partie.mise_max - joueur.mise, 0)
+        return True, {
+            "main": nom_main(indice_main(*joueur.main)),
+            "nb_adversaires": nb_adversaires,
+            "equite": equite,
+            **conseiller(equite, nb_adversaires, a_suivre, pot),
+        }, ""
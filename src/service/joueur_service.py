@@ -11,12 +11,15 @@ from src.utils.genere_code_parrainage import GenerateurDeCode
 from src.view.session import Session
 
 import logging
+import time
 
 
 class JoueurService:
     """Classe contenant les méthodes de service des Joueurs"""
 
     MONTANT_RECHARGEMENT_AUTO = 500
+    SEUIL_RECHARGEMENT_AUTO = 50
+    TAILLE_LOT_RECHARGEMENT_AUTO = 1000
 
     @log
     def creer(self, pseudo_joueur, mdp, code_parrain) -> Joueur:
@@ -207,27 +210,17 @@ class JoueurService:
         return JoueurDao().valeur_portefeuille(pseudo)
 
     @log
-    def mettre_a_jour_meilleur_classement_portefeuille(self):
+    def mettre_a_jour_meilleur_classement_portefeuille(self) -> int:
         """
         Met à jour le meilleur classement pour tous les joueurs en fonction
-        de la valeur actuelle de leur portefeuille.
-        """
-        dao_joueur = JoueurDao()
-        dao_stat = StatistiqueDao()
-
-        # Récupérer le classement actuel de tous les joueurs par portefeuille
-        classement_actuel = dao_joueur.classement_par_portefeuille()  # [{pseudo, portefeuille}, ...]
-
-        for i, joueur in enumerate(classement_actuel, start=1):
-            pseudo = joueur["pseudo"]
-
-            # Récupérer le meilleur classement enregistré
-            stats = dao_stat.trouver_statistiques_par_id(pseudo)
-            meilleur = stats.get("meilleur_classement")
+        de la valeur actuelle de leur portefeuille, en une seule requête.
 
-            # Mettre à jour si le classement actuel est meilleur (plus petit)
-            if meilleur is None or i < meilleur:
-                dao_stat.mettre_a_jour_statistique(pseudo, "meilleur_classement", i)
+        Returns
+        -------
+        int
+            nombre de joueurs dont le meilleur classement a été amélioré
+        """
+        return StatistiqueDao().mettre_a_jour_meilleurs_classements()
 
     @log
     def afficher_classement_joueur(self):
@@ -273,15 +266,45 @@ class JoueurService:
         return JoueurDao().code_de_parrainage_existe(code_parrainage)
 
     @log
-    def credit_auto(self):
+    def credit_auto(self, taille_lot: int = TAILLE_LOT_RECHARGEMENT_AUTO) -> dict:
         """
         Fonction de mise à jour "auto" des portefeuilles.
+        Les joueurs éligibles sont crédités et datés par lots, une requête par lot.
+
+        Parameters
+        ----------
+        taille_lot: int
+            nombre maximal de joueurs crédités par requête
+
+        Returns
+        -------
+        dict
+            nombre de joueurs crédités, nombre de lots et durée (en secondes)
         """
-        joueurs = JoueurDao().joueurs_a_crediter()
-        if not joueurs:
+        debut = time.perf_counter()
+        dao = JoueurDao()
+        nb_credites = 0
+        nb_lots = 0
+        while True:
+            credites = dao.crediter_auto_lot(
+                self.MONTANT_RECHARGEMENT_AUTO, self.SEUIL_RECHARGEMENT_AUTO, taille_lot
+            )
+            nb_lots += 1
+            nb_credites += len(credites)
+            # un joueur crédité est daté : il ne fait plus partie des lots suivants
+            if len(credites) < taille_lot:
+                break
+
+        bilan = {
+            "nb_credites": nb_credites,
+            "nb_lots": nb_lots,
+            "duree_s": round(time.perf_counter() - debut, 3),
+        }
+        if nb_credites:
+            logging.info(
+                f"Auto-crédit hebdo : {nb_credites} joueurs crédités de "
+                f"{self.MONTANT_RECHARGEMENT_AUTO} en {nb_lots} lots ({bilan['duree_s']} s)"
+            )
+        else:
             logging.info("Aucun joueur à créditer")
-        if joueurs is not None:
-            for pseudo in joueurs:
-                JoueurDao().crediter(pseudo, JoueurService().MONTANT_RECHARGEMENT_AUTO)
-                JoueurDao().maj_date_credit_auto(pseudo)
-                logging.info(f"Auto-crédut hebdo : {pseudo}, montant {JoueurService().MONTANT_RECHARGEMENT_AUTO}")
+        return bilan
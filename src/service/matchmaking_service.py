@@ -0,0 +1,308 @@
+import asyncio
+import heapq
+import itertools
+import threading
+import time
+from collections import defaultdict
+
+from src.utils.singleton import Singleton
+from src.utils.log_decorator import log
+
+from src.business_object.joueurs import Joueur
+from src.service.table_service import TableService
+
+
+class MatchmakingService(metaclass=Singleton):
+    """
+    File d'attente globale qui place les joueurs à une table de leur niveau de blind.
+
+    Pour chaque niveau, les tables sont rangées dans un tas : la prochaine table proposée
+    est celle où un joueur seul attend un adversaire, sinon la moins chargée. Le tas est
+    tenu à jour à chaque arrivée ou départ (les entrées périmées sont écartées à la lecture),
+    ce qui rend le choix d'une table en O(log n).
+
+    Les joueurs qui ne trouvent pas de place attendent dans une file par niveau, servie
+    dans l'ordre d'arrivée dès qu'une place se libère.
+
+    Les placements s'exécutent dans la boucle asyncio, sous le verrou de la table modifiée :
+    le même que celui des routes qui jouent sur la partie. Seule la lecture du portefeuille,
+    faite par l'appelant avant de demander une place, passe par un thread.
+    """
+
+    def __init__(self, tables_service: TableService | None = None, verrou_table=None):
+        """
+        Parameters
+        ----------
+        tables_service : TableService | None
+            pool de tables où placer les joueurs
+        verrou_table : callable | None
+            renvoie le verrou asyncio d'une table ; par défaut, un verrou propre au service
+        """
+        self.tables_service = tables_service or TableService()
+        self._verrous_locaux: defaultdict[int, asyncio.Lock] = defaultdict(asyncio.Lock)
+        self.verrou_table = verrou_table or self._verrous_locaux.__getitem__
+        # sérialise les placements (file d'attente, tables attribuées) ; pris avant
+        # le verrou d'une table, jamais après
+        self._verrou = asyncio.Lock()
+        # protège uniquement les tas : pris aussi par le rappel d'occupation du TableService
+        self._verrou_tas = threading.Lock()
+        # par blind : tas de (priorité, nb_joueurs, id_table)
+        self._tas: dict[int, list[tuple[int, int, int]]] = {}
+        # par blind : tas de (arrivée, numéro, joueur) des joueurs en attente
+        self._files: dict[int, list[tuple[float, int, Joueur]]] = {}
+        self._en_attente: dict[str, int] = {}
+        # table attribuée à chaque joueur placé par la file
+        self.places: dict[str, int] = {}
+        self._numero = itertools.count()
+
+        for id_table, blind in list(self.tables_service.blinds_tables.items()):
+            self._occupation_changee(id_table, blind, self.tables_service.nb_joueurs(id_table))
+        self.tables_service.abonner_occupation(self._occupation_changee)
+
+    # ---------------------------
+    # Tas des tables
+    # ---------------------------
+    @staticmethod
+    def _cle(nb_joueurs: int, id_table: int) -> tuple[int, int, int]:
+        # un joueur seul attend un adversaire : sa table passe avant les autres
+        return (0 if nb_joueurs == 1 else 1, nb_joueurs, id_table)
+
+    def _occupation_changee(self, id_table: int, blind: int, nb_joueurs: int) -> None:
+        if nb_joueurs >= self.tables_service.places_max:
+            return
+        with self._verrou_tas:
+            tas = self._tas.setdefault(blind, [])
+            heapq.heappush(tas, self._cle(nb_joueurs, id_table))
+            # les entrées périmées s'accumulent si les tables sont peu lues : on compacte
+            if len(tas) > 4 * len(self.tables_service.blinds_tables) + 16:
+                self._tas[blind] = [e for e in tas if self._entree_valide(e, blind)]
+                heapq.heapify(self._tas[blind])
+
+    def _entree_valide(self, entree: tuple[int, int, int], blind: int) -> bool:
+        _, nb_joueurs, id_table = entree
+        return (
+            self.tables_service.blinds_tables.get(id_table) == blind
+            and self.tables_service.nb_joueurs(id_table) == nb_joueurs
+        )
+
+    def choisir_table(self, blind: int, exclure: int | None = None) -> int | None:
+        """
+        Table non pleine du niveau de blind où placer un joueur, ouverte si besoin.
+
+        Parameters
+        ----------
+        blind : int
+            niveau de blind recherché
+        exclure : int | None
+            table à ne pas proposer (celle que le joueur quitte)
+
+        Returns
+        -------
+        int | None
+            identifiant de la table, None si le niveau n'a plus de place
+        """
+        choisie = None
+        with self._verrou_tas:
+            tas = self._tas.get(blind, [])
+            ecartee = None
+            while tas:
+                if not self._entree_valide(tas[0], blind):
+                    heapq.heappop(tas)
+                elif tas[0][2] == exclure:
+                    ecartee = heapq.heappop(tas)
+                else:
+                    choisie = tas[0][2]
+                    break
+            if ecartee is not None:
+                heapq.heappush(tas, ecartee)
+        if choisie is None:
+            choisie = self.tables_service.table_disponible(blind)
+        return None if choisie == exclure else choisie
+
+    # ---------------------------
+    # File d'attente
+    # ---------------------------
+    def _position(self, pseudo: str) -> int | None:
+        blind = self._en_attente.get(pseudo)
+        if blind is None:
+            return None
+        arrivee = next(a for a, _, j in self._files[blind] if j.pseudo == pseudo)
+        return 1 + sum(1 for a, _, _ in self._files[blind] if a < arrivee)
+
+    def _assis(self, pseudo: str, id_table: int) -> bool:
+        table = self.tables_service.get_table(id_table)
+        return table is not None and table.siege(pseudo) is not None
+
+    def _a_de_la_place(self, id_table: int, blind: int) -> bool:
+        return (
+            self.tables_service.blinds_tables.get(id_table) == blind
+            and self.tables_service.nb_joueurs(id_table) < self.tables_service.places_max
+        )
+
+    async def _placer(self, joueur: Joueur, blind: int) -> tuple[bool | None, int | None, str]:
+        """Tente d'asseoir le joueur ; None si aucune table n'a de place."""
+        while True:
+            id_table = self.choisir_table(blind)
+            if id_table is None:
+                return None, None, "Aucune place libre"
+            async with self.verrou_table(id_table):
+                # la table a pu se remplir (ou fermer) pendant l'attente du verrou
+                if not self._a_de_la_place(id_table, blind):
+                    continue
+                succes, _, message = self.tables_service.asseoir(joueur, id_table)
+            if succes:
+                self.places[joueur.pseudo] = id_table
+            return succes, id_table, message
+
+    def _reponse_placee(self, pseudo: str) -> dict:
+        id_table = self.places[pseudo]
+        return {"statut": "place", "id_table": id_table, "position": None,
+                "message": f"{pseudo} est à la table {id_table}."}
+
+    async def rejoindre_file(self, joueur: Joueur, blind: int) -> dict:
+        """
+        Place le joueur à une table du niveau de blind, ou le met en file d'attente.
+        Rappeler la méthode permet de suivre sa position ou de récupérer sa table.
+
+        Parameters
+        ----------
+        joueur : Joueur
+            joueur à placer, avec son portefeuille déjà lu
+        blind : int
+            niveau de blind demandé
+
+        Returns
+        -------
+        dict
+            statut ("place", "en_attente" ou "refuse"), id_table, position dans la file, message
+        """
+        pseudo = joueur.pseudo
+        async with self._verrou:
+            if pseudo in self.places and not self._assis(pseudo, self.places[pseudo]):
+                del self.places[pseudo]
+            if pseudo in self.places:
+                return self._reponse_placee(pseudo)
+            if blind not in self.tables_service.niveaux:
+                return {"statut": "refuse", "id_table": None, "position": None,
+                        "message": f"Aucune table à la blind {blind}."}
+            if pseudo not in self._en_attente:
+                succes, id_table, message = await self._placer(joueur, blind)
+                if succes is not None:
+                    return {"statut": "place" if succes else "refuse", "id_table": id_table,
+                            "position": None, "message": message}
+                heapq.heappush(self._files.setdefault(blind, []),
+                               (time.monotonic(), next(self._numero), joueur))
+                self._en_attente[pseudo] = blind
+            else:
+                await self._servir_file()
+                if pseudo in self.places:
+                    return self._reponse_placee(pseudo)
+            position = self._position(pseudo)
+            return {"statut": "en_attente", "id_table": None, "position": position,
+                    "message": f"{pseudo} est en position {position} dans la file."}
+
+    async def quitter_file(self, pseudo: str) -> bool:
+        """
+        Retire le joueur de la file d'attente et oublie sa table attribuée.
+
+        Returns
+        -------
+        bool
+            True si le joueur était en attente ou placé par la file
+        """
+        async with self._verrou:
+            place = self.places.pop(pseudo, None) is not None
+            blind = self._en_attente.pop(pseudo, None)
+            if blind is None:
+                return place
+            self._files[blind] = [e for e in self._files[blind] if e[2].pseudo != pseudo]
+            heapq.heapify(self._files[blind])
+            return True
+
+    async def servir_file(self) -> int:
+        """
+        Place les joueurs en attente, dans l'ordre d'arrivée, tant que leur niveau a de la place.
+
+        Returns
+        -------
+        int
+            nombre de joueurs sortis de la file
+        """
+        async with self._verrou:
+            return await self._servir_file()
+
+    async def _servir_file(self) -> int:
+        servis = 0
+        for blind, file in self._files.items():
+            while file:
+                joueur = file[0][2]
+                succes, _, _ = await self._placer(joueur, blind)
+                if succes is None:
+                    break
+                heapq.heappop(file)
+                del self._en_attente[joueur.pseudo]
+                servis += 1
+        return servis
+
+    # ---------------------------
+    # Rééquilibrage
+    # ---------------------------
+    @log
+    def _deplacer(self, pseudo: str, depart: int, cible: int) -> bool:
+        """
+        Déplace le joueur, avec ses jetons, de la table depart à la table cible.
+        La table rejointe est publiée dans l'état de la partie quittée (champ deplacements),
+        ce qui prévient les clients abonnés à son flux. L'appelant tient les verrous des
+        deux tables.
+        """
+        service = self.tables_service
+        joueur = service.tables[depart].joueur(pseudo)
+        service.parties.get(depart).etat.deplacements[pseudo] = cible
+        service.quitter_table(pseudo, depart)
+        succes, _, _ = service.asseoir(joueur, cible)
+        if not succes:
+            service.asseoir(joueur, depart)
+        return succes
+
+    async def reequilibrer(self) -> list[tuple[str, int, int]]:
+        """
+        Entre deux mains, regroupe les joueurs seuls à leur table avec d'autres joueurs
+        du même niveau, pour que leur partie puisse démarrer. Seuls les joueurs placés par
+        la file sont déplacés : une table choisie par le joueur n'est pas changée.
+
+        Returns
+        -------
+        list[tuple[str, int, int]]
+            (pseudo, table quittée, table rejointe) de chaque joueur déplacé
+        """
+        deplaces = []
+        service = self.tables_service
+        async with self._verrou:
+            for pseudo, id_table in list(self.places.items()):
+                if not self._seul_entre_deux_mains(pseudo, id_table):
+                    continue
+                blind = service.blinds_tables[id_table]
+                cible = self.choisir_table(blind, exclure=id_table)
+                if cible is None or service.nb_joueurs(cible) == 0:
+                    continue
+                # verrous pris dans l'ordre des identifiants : pas d'interblocage
+                premier, second = (self.verrou_table(i) for i in sorted((id_table, cible)))
+                async with premier, second:
+                    # la situation a pu changer pendant l'attente des verrous
+                    if not self._seul_entre_deux_mains(pseudo, id_table) or not (
+                        service.nb_joueurs(cible) > 0 and self._a_de_la_place(cible, blind)
+                    ):
+                        continue
+                    if self._deplacer(pseudo, id_table, cible):
+                        self.places[pseudo] = cible
+                        deplaces.append((pseudo, id_table, cible))
+        return deplaces
+
+    def _seul_entre_deux_mains(self, pseudo: str, id_table: int) -> bool:
+        service = self.tables_service
+        if self.places.get(pseudo) != id_table or service.nb_joueurs(id_table) != 1:
+            return False
+        if not self._assis(pseudo, id_table):
+            return False
+        partie = service.parties.get(id_table) if service.parties.creee(id_table) else None
+        return partie is None or partie.etat.finie
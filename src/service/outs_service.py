@@ -0,0 +1,41 @@
+from src.utils.log_decorator import log
+
+from src.business_object.outs import calculer_outs
+from src.business_object.partie import Partie
+
+
+class OutsService:
+    """Service des outs : cartes qui améliorent la main d'un joueur au flop et à la turn."""
+
+    @log
+    def outs_joueur(self, partie: Partie, pseudo: str) -> tuple[bool, dict | None, str]:
+        """
+        Outs et probabilités d'amélioration de la main d'un joueur, au flop ou à la turn.
+
+        Les cartes inconnues du joueur sont toutes celles qui ne sont ni dans sa main ni
+        au board. Le calcul est gardé en cache par main et par board : les consultations
+        répétées pendant un même tour sont immédiates.
+
+        Parameters
+        ----------
+        partie : Partie
+            partie concernée
+        pseudo : str
+            joueur dont on calcule les outs
+
+        Returns
+        -------
+        tuple[bool, dict | None, str]
+            succès, résultat de calculer_outs et message d'erreur
+        """
+        joueur = partie.table.joueur(pseudo)
+        if joueur is None or len(joueur.main) != 2:
+            return False, None, "Le joueur n'a pas de main en cours à cette table."
+        if getattr(partie.etat, "finie", False) or partie.tour_actuel not in ("flop", "turn"):
+            return False, None, "Les outs ne sont disponibles qu'au flop et à la turn."
+        if not joueur.actif:
+            return False, None, "Le joueur s'est couché."
+        try:
+            return True, calculer_outs(joueur.main, list(partie.table.board)), ""
+        except ValueError as e:
+            return False, None, str(e)
@@ -16,7 +16,8 @@ class PartieService:
     # -----------------------------------------------------
     @log
     def voir_etat_partie(self) -> tuple[bool, str]:
-        self.partie._mettre_a_jour_etat()
+        # l'état est déjà synchronisé après chaque changement : pas de reconstruction ici
+        self.partie.etat_publie()
         return True, self.partie.etat, ""
 
     # -----------------------------------------------------
@@ -24,7 +25,7 @@ class PartieService:
     # -----------------------------------------------------
     @log
     def miser(self, pseudo: str, montant: int) -> tuple[bool, str]:
-        joueur = next((j for j in self.partie.table.joueurs if j.pseudo == pseudo), None)
+        joueur = self.partie.table.joueur(pseudo)
         if not joueur:
             return False, self.partie.etat, f"Le joueur '{pseudo}' n'existe pas."
         if not joueur.actif:
@@ -44,19 +45,9 @@ class PartieService:
                 f"Tu peux miser la grosse blinde, deux fois celle-ci ou plus"
             )
 
-        limite_max = self.partie.mise_max_autorisee()
-        if montant + joueur.mise > limite_max:
-            return False, self.partie.etat, (
-                f"Tu ne peux pas miser plus que {limite_max}, "
-                "car un joueur ne peut pas suivre davantage."
-            )
-
         # Action
         self.partie.actions_joueur(pseudo, "miser", montant)
 
-        # Tour suivant
-        self.partie._mettre_a_jour_etat()
-
         return True, self.partie.etat, ""
 
     # -----------------------------------------------------
@@ -64,7 +55,7 @@ class PartieService:
     # -----------------------------------------------------
     @log
     def suivre(self, pseudo: str) -> tuple[bool, str]:
-        joueur = next((j for j in self.partie.table.joueurs if j.pseudo == pseudo), None)
+        joueur = self.partie.table.joueur(pseudo)
 
         if not joueur:
             return False, self.partie.etat, f"Le joueur '{pseudo}' n'existe pas."
@@ -81,9 +72,6 @@ class PartieService:
         # Action
         self.partie.actions_joueur(pseudo, "suivre")
 
-        # Tour suivant
-        self.partie._mettre_a_jour_etat()
-
         return True, self.partie.etat, ""
 
     # -----------------------------------------------------
@@ -91,7 +79,7 @@ class PartieService:
     # -----------------------------------------------------
     @log
     def se_coucher(self, pseudo: str) -> tuple[bool, str]:
-        joueur = next((j for j in self.partie.table.joueurs if j.pseudo == pseudo), None)
+        joueur = self.partie.table.joueur(pseudo)
 
         if not joueur:
             return False, self.partie.etat, f"Le joueur '{pseudo}' n'existe pas."
@@ -101,9 +89,6 @@ class PartieService:
         # Action
         self.partie.actions_joueur(pseudo, "se_coucher")
 
-        # Tour suivant
-        self.partie._mettre_a_jour_etat()
-
         return True, self.partie.etat, ""
 
     # -----------------------------------------------------
@@ -111,24 +96,15 @@ class PartieService:
     # -----------------------------------------------------
     @log
     def all_in(self, pseudo: str) -> tuple[bool, str]:
-        joueur = next((j for j in self.partie.table.joueurs if j.pseudo == pseudo), None)
+        joueur = self.partie.table.joueur(pseudo)
 
         if not joueur:
             return False, self.partie.etat, f"Le joueur '{pseudo}' n'existe pas."
         if not joueur.actif:
             return False, self.partie.etat, f"Le joueur '{pseudo}' n'est pas actif."
-        limite_max = self.partie.mise_max_autorisee()
-        if joueur.solde + joueur.mise > limite_max:
-            return False, self.partie.etat, (
-                f"Tu ne peux pas all-in car tu as plus que {limite_max}, "
-                f"à la place tu peux miser {limite_max-joueur.mise}."
-            )
         # Action
         self.partie.actions_joueur(pseudo, "all-in")
 
-        # Tour suivant
-        self.partie._mettre_a_jour_etat()
-
         # S'assurer que resultats est une liste valide
         if self.partie.etat.resultats is None:
             self.partie.etat.resultats = []
@@ -143,10 +119,10 @@ class PartieService:
 
         etat = self.partie.etat
 
-        if joueur.solde < Partie.GROSSE_BLIND:
+        if joueur.solde < self.partie.GROSSE_BLIND:
             return False, etat, (
                 f"{joueur.pseudo} n'a pas assez de jetons "
-                f"(minimum {Partie.GROSSE_BLIND})."
+                f"(minimum {self.partie.GROSSE_BLIND})."
             )
 
         # Partie terminée
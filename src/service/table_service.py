@@ -1,3 +1,7 @@
+import os
+import threading
+import time
+
 from src.business_object.table import Table
 from src.business_object.joueurs import Joueur
 from src.business_object.partie import Partie
@@ -10,17 +14,300 @@ from src.utils.log_decorator import log
 from src.dao.joueur_dao import JoueurDao
 
 
+class RegistreParesseux(dict):
+    """
+    Dictionnaire dont les entrées connues sont créées à la première lecture.
+    Itérer dessus ne parcourt que les entrées déjà créées.
+
+    La création se fait sous un verrou, avec une nouvelle vérification une fois le verrou
+    pris : deux fils qui lisent la même entrée reçoivent le même objet.
+    """
+
+    def __init__(self, connues, fabrique, verrou=None):
+        super().__init__()
+        self.connues = connues
+        self.fabrique = fabrique
+        self._verrou = verrou or threading.RLock()
+
+    def __missing__(self, cle):
+        return self.creer(cle)
+
+    def creer(self, cle):
+        """Entrée de la clé connue, créée si elle n'existe pas encore."""
+        with self._verrou:
+            if super().__contains__(cle):
+                return super().__getitem__(cle)
+            if cle not in self.connues:
+                raise KeyError(cle)
+            valeur = self[cle] = self.fabrique(cle)
+            return valeur
+
+    def get(self, cle, defaut=None):
+        try:
+            return self[cle]
+        except KeyError:
+            return defaut
+
+    def creee(self, cle) -> bool:
+        """True si l'entrée existe déjà (sans la créer)"""
+        return super().__contains__(cle)
+
+
 class TableService(metaclass=Singleton):
+    """
+    Pool de tables réparties par niveau de blind.
+
+    Chaque niveau démarre avec un nombre de tables fixe ; quand toutes ses tables sont
+    pleines, une nouvelle table est ouverte. Les tables ouvertes en plus qui restent vides
+    trop longtemps sont fermées par nettoyer_tables_inactives. Les compteurs d'occupation de
+    chaque niveau sont tenus à jour à chaque arrivée ou départ, sans parcourir les tables.
+    """
+
+    # nombre maximal de tables par niveau de blind
+    TABLES_MAX_PAR_NIVEAU = 50
+    # durée (secondes) au-delà de laquelle une table ouverte en plus et vide est fermée
+    DELAI_INACTIVITE = 600
+
+    def __init__(self, nb_tables=10, blind=20, niveaux: dict[int, int] | None = None,
+                 places_max: int = Table.PLACES_MAX):
+        """
+        Initialise les tables avec un nombre de tables et un blind par défaut.
+        Tables et parties ne sont créées qu'à leur première utilisation.
+
+        Parameters
+        ----------
+        nb_tables: int
+            nombre de tables au niveau de blind par défaut
+        blind: int
+            blind par défaut
+        niveaux: dict[int, int] | None
+            nombre de tables initiales par blind ; remplace nb_tables et blind s'il est donné
+        places_max: int
+            nombre de places par table
+        """
+        self.niveaux_initiaux = niveaux or {blind: nb_tables}
+        self.blind = blind if niveaux is None else next(iter(self.niveaux_initiaux))
+        self.places_max = places_max
+        self._verrou = threading.RLock()
+        self._prochain_id = 1
+        # blind de chaque table déclarée, créée ou non
+        self.blinds_tables: dict[int, int] = {}
+        self._tables_initiales: set[int] = set()
+        self._derniere_activite: dict[int, float] = {}
+        # par blind : nombre de tables, de joueurs, de places et tables non pleines
+        self.niveaux: dict[int, dict] = {}
+        # rappels (id_table, blind, nb_joueurs) appelés à chaque ouverture ou changement d'occupation
+        self._observateurs = []
+        # rappels (id_table) appelés après la fermeture d'une table
+        self._fermetures = []
+
+        self.tables = RegistreParesseux(self.blinds_tables, self._creer_table, self._verrou)
+        self.parties = RegistreParesseux(
+            self.blinds_tables,
+            lambda i: Partie(id=i, table=self.tables[i], grosse_blind=self.blinds_tables[i]),
+            self._verrou,
+        )
+        for blind_niveau, nombre in self.niveaux_initiaux.items():
+            for _ in range(nombre):
+                self._tables_initiales.add(self._declarer_table(blind_niveau))
+
+    @property
+    def nb_tables(self) -> int:
+        return len(self.blinds_tables)
+
+    @staticmethod
+    def niveaux_depuis_env(defaut: str = "20:10") -> dict[int, int]:
+        """
+        Lit la variable d'environnement TABLES_NIVEAUX, de la forme "20:10,50:3"
+        (blind:nombre de tables initiales).
+        """
+        niveaux = {}
+        for element in os.environ.get("TABLES_NIVEAUX", defaut).split(","):
+            blind, nombre = element.split(":")
+            niveaux[int(blind)] = int(nombre)
+        return niveaux
+
+    # ---------------------------
+    # Pool de tables
+    # ---------------------------
+    def _declarer_table(self, blind: int) -> int:
+        """Réserve un identifiant de table au niveau de blind donné (la table est créée plus tard)."""
+        with self._verrou:
+            id_table = self._prochain_id
+            self._prochain_id += 1
+            self.blinds_tables[id_table] = blind
+            niveau = self.niveaux.setdefault(
+                blind, {"tables": 0, "joueurs": 0, "places": 0, "libres": set()}
+            )
+            niveau["tables"] += 1
+            niveau["places"] += self.places_max
+            niveau["libres"].add(id_table)
+            self._derniere_activite[id_table] = time.monotonic()
+            self._notifier(id_table, blind, 0)
+            return id_table
+
+    def _creer_table(self, id_table: int) -> Table:
+        table = Table(id=id_table, blind=self.blinds_tables[id_table], places_max=self.places_max)
+        table.surveillant = self._occupation_changee
+        return table
+
+    def _occupation_changee(self, table: Table, variation: int) -> None:
+        """Met à jour les compteurs du niveau de la table, et ouvre une table si toutes sont pleines."""
+        with self._verrou:
+            niveau = self.niveaux.get(table.blind)
+            if niveau is None or table.id not in self.blinds_tables:
+                return
+            niveau["joueurs"] += variation
+            self._derniere_activite[table.id] = time.monotonic()
+            if table.est_pleine():
+                niveau["libres"].discard(table.id)
+            else:
+                niveau["libres"].add(table.id)
+            self._notifier(table.id, table.blind, len(table.joueurs))
+            if not niveau["libres"] and niveau["tables"] < self.TABLES_MAX_PAR_NIVEAU:
+                self._declarer_table(table.blind)
+
+    def abonner_occupation(self, rappel) -> None:
+        """
+        Enregistre un rappel appelé avec (id_table, blind, nb_joueurs) à l'ouverture d'une table
+        et à chaque arrivée ou départ. Le rappel est appelé sous le verrou du pool : il ne doit
+        pas rappeler le TableService.
+        """
+        self._observateurs.append(rappel)
+
+    def abonner_fermeture(self, rappel) -> None:
+        """
+        Enregistre un rappel appelé avec l'identifiant de chaque table fermée par
+        nettoyer_tables_inactives, hors du verrou du pool.
+        """
+        self._fermetures.append(rappel)
+
+    def desabonner_fermeture(self, rappel) -> None:
+        if rappel in self._fermetures:
+            self._fermetures.remove(rappel)
+
+    def _notifier(self, id_table: int, blind: int, nb_joueurs: int) -> None:
+        for rappel in self._observateurs:
+            rappel(id_table, blind, nb_joueurs)
+
+    def nb_joueurs(self, id_table: int) -> int:
+        """Nombre de joueurs assis à la table (0 si elle n'est pas encore créée)"""
+        if self.tables.creee(id_table):
+            return len(self.tables[id_table].joueurs)
+        return 0
+
+    def table_disponible(self, blind: int) -> int | None:
+        """
+        Identifiant d'une table non pleine du niveau de blind, ouverte si besoin.
 
-    def __init__(self, nb_tables=10, blind=20):
+        Returns
+        -------
+        int | None
+            None si le niveau n'existe pas ou a atteint son nombre maximal de tables
+        """
+        with self._verrou:
+            niveau = self.niveaux.get(blind)
+            if niveau is None:
+                return None
+            if niveau["libres"]:
+                return min(niveau["libres"])
+            if niveau["tables"] < self.TABLES_MAX_PAR_NIVEAU:
+                return self._declarer_table(blind)
+            return None
+
+    def _fermable(self, id_table: int, maintenant: float, delai: float) -> bool:
+        if id_table not in self.blinds_tables or id_table in self._tables_initiales:
+            return False
+        if self.tables.creee(id_table) and self.tables[id_table].joueurs:
+            return False
+        if maintenant - self._derniere_activite[id_table] < delai:
+            return False
+        # chaque niveau garde au moins une table non pleine
+        return self.niveaux[self.blinds_tables[id_table]]["libres"] != {id_table}
+
+    def tables_fermables(self, delai: float = DELAI_INACTIVITE) -> list[int]:
+        """Tables que nettoyer_tables_inactives fermerait maintenant, sans les fermer."""
+        maintenant = time.monotonic()
+        with self._verrou:
+            return [i for i in self.blinds_tables if self._fermable(i, maintenant, delai)]
+
+    @log
+    def nettoyer_tables_inactives(self, delai: float = DELAI_INACTIVITE,
+                                  ids: list[int] | None = None) -> list[int]:
+        """
+        Ferme les tables ouvertes en plus du nombre initial, vides depuis plus de delai secondes.
+        Chaque niveau garde au moins une table non pleine.
+
+        Parameters
+        ----------
+        delai : float
+            durée d'inactivité (secondes) au-delà de laquelle une table est fermée
+        ids : list[int] | None
+            tables à examiner (toutes par défaut)
+
+        Returns
+        -------
+        list[int]
+            identifiants des tables fermées
+        """
+        maintenant = time.monotonic()
+        fermees = []
+        with self._verrou:
+            for id_table in list(self.blinds_tables if ids is None else ids):
+                if not self._fermable(id_table, maintenant, delai):
+                    continue
+                niveau = self.niveaux[self.blinds_tables.pop(id_table)]
+                del self._derniere_activite[id_table]
+                self.tables.pop(id_table, None)
+                self.parties.pop(id_table, None)
+                niveau["tables"] -= 1
+                niveau["places"] -= self.places_max
+                niveau["libres"].discard(id_table)
+                fermees.append(id_table)
+        for id_table in fermees:
+            for rappel in self._fermetures:
+                rappel(id_table)
+        return fermees
+
+    def occupation_niveaux(self) -> list[dict]:
+        """
+        Occupation de chaque niveau de blind.
+
+        Returns
+        -------
+        list[dict]
+            blind, nombre de tables, de joueurs assis, de places et de tables non pleines
         """
-        Initialise les tables avec un nombre de tables et un blind par défaut
+        with self._verrou:
+            return [
+                {
+                    "blind": blind,
+                    "tables": niveau["tables"],
+                    "joueurs": niveau["joueurs"],
+                    "places": niveau["places"],
+                    "tables_libres": len(niveau["libres"]),
+                }
+                for blind, niveau in sorted(self.niveaux.items())
+            ]
+
+    @log
+    def prechauffer(self) -> int:
         """
-        self.tables = {}
-        self.parties = {}
-        for i in range(1, nb_tables + 1):
-            self.tables[i] = Table(id=i, blind=blind)
-            self.parties[i] = Partie(id=i, table=self.tables[i])
+        Crée toutes les tables et parties d'avance.
+
+        Returns
+        -------
+        int
+            nombre de parties prêtes
+        """
+        for id_table in list(self.blinds_tables):
+            try:
+                # crée la partie et sa table
+                self.parties.creer(id_table)
+            except KeyError:
+                # table fermée entre-temps
+                pass
+        return len(self.parties)
 
     @log
     def get_table(self, id_table: int):
@@ -58,25 +345,41 @@ class TableService(metaclass=Singleton):
             EtatPartie: état actuel de la partie
             str: message d'information
         """
-        # Récupérer le solde depuis la DAO
+        return self.asseoir(Joueur(pseudo, self.lire_solde(pseudo)), id_table)
+
+    def lire_solde(self, pseudo: str) -> int:
+        """Portefeuille du joueur lu en base (1000 s'il est inconnu)."""
         solde = JoueurDao().valeur_portefeuille(pseudo)
         if solde is None:
             solde = 1000
-        joueur = Joueur(pseudo, solde)
+        return solde
+
+    @log
+    def asseoir(self, joueur: Joueur, id_table: int):
+        """
+        Assied un joueur déjà construit à la table et l'ajoute à la partie associée,
+        sans accès à la base : l'appelant tient le verrou de la table.
+
+        Returns
+        -------
+        tuple[bool, EtatPartie, str]
+            comme rejoindre_table
+        """
+        pseudo = joueur.pseudo
         # Récupérer la table
         table = self.get_table(id_table)
 
         if not table:
             return False, None, f"La table {id_table} n'existe pas."
-        print("good")
 
-        if any(j.pseudo == pseudo for j in table.joueurs):
+        if table.siege(pseudo) is not None:
             partie = self.parties.get(id_table)
             return False, partie.etat, f"{pseudo} est déjà à la table {id_table}."
 
         # Ajouter le joueur à la table
-        if joueur.solde < Partie.GROSSE_BLIND:
-            return False, None, f"{pseudo} n'a pas assez de jetons (minimum {Partie.GROSSE_BLIND})."
+        partie = self.parties.get(id_table)
+        if joueur.solde < partie.GROSSE_BLIND:
+            return False, None, f"{pseudo} n'a pas assez de jetons (minimum {partie.GROSSE_BLIND})."
         code_table = table.ajouter_joueur(joueur)  # 1=ok, 2=table pleine, etc.
         if code_table != 1:
             return False, None, "Impossible de rejoindre la table (pleine ou erreur)."
@@ -84,6 +387,8 @@ class TableService(metaclass=Singleton):
         # Ajouter le joueur à la partie associée
         partie = self.parties.get(id_table)
         partie.table = table
+        # le joueur revient : il n'est plus signalé comme déplacé
+        partie.etat.deplacements.pop(pseudo, None)
 
         if partie is None:
             return True, None, f"{pseudo} ajouté à la table {id_table}, mais aucune partie n'est définie."
@@ -103,14 +408,17 @@ class TableService(metaclass=Singleton):
         Returns
         -------
         List[dict]: liste de dictionnaire où chaque élément de la liste est un dictionnaire correspondant à la table"""
-        return [
-            {
-                "id": t.id,
-                "nb_joueurs": len(t.joueurs),
-                "blind": t.blind
-            }
-            for t in self.tables.values()
-        ]
+        # les tables déclarées mais pas encore créées sont vides : on ne les crée pas
+        with self._verrou:
+            return [
+                {
+                    "id": id_table,
+                    "nb_joueurs": self.nb_joueurs(id_table),
+                    "blind": blind,
+                    "places_max": self.places_max,
+                }
+                for id_table, blind in self.blinds_tables.items()
+            ]
 
     @log
     def quitter_table(self, pseudo: str, id_table: int):
@@ -122,16 +430,17 @@ class TableService(metaclass=Singleton):
             return 2  # Table non trouvée
 
         # Supprimer le joueur de la table
-        for j in table.joueurs:
-            if j.pseudo == pseudo:
-                table.supprimer_joueur(j)
-                break
+        joueur = table.joueur(pseudo)
+        if joueur is not None:
+            table.supprimer_joueur(joueur)
 
         # Mettre à jour la partie associée
         partie = self.parties.get(id_table)
         if partie:
-            # Supprimer le joueur de la liste des joueurs de la partie
-            partie.table.joueurs = [j for j in partie.table.joueurs if j.pseudo != pseudo]
+            # Supprimer le joueur de la table de la partie, si ce n'est pas la même
+            joueur = partie.table.joueur(pseudo)
+            if joueur is not None:
+                partie.table.supprimer_joueur(joueur)
             # Mettre à jour l'état de la partie
             partie._mettre_a_jour_etat()
 
@@ -157,11 +466,14 @@ class TableService(metaclass=Singleton):
         """
         etat = []
 
-        for id_table, table in self.tables.items():
-            etat.append({
-                "table": id_table,
-                "blind": table.blind,
-                "joueurs": [j.pseudo for j in table.joueurs]
-            })
+        with self._verrou:
+            for id_table, blind in self.blinds_tables.items():
+                # une table pas encore créée est vide : inutile de la créer
+                joueurs = self.tables[id_table].joueurs if self.tables.creee(id_table) else []
+                etat.append({
+                    "table": id_table,
+                    "blind": blind,
+                    "joueurs": [j.pseudo for j in joueurs]
+                })
 
         return etat
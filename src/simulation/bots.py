@@ -0,0 +1,121 @@
+import random
+
+from abc import ABC, abstractmethod
+
+from src.business_object.cartes import combinaisons
+from src.business_object.equite_preflop import TableEquitePreflop, conseiller
+
+
+class Bot(ABC):
+    """
+    Stratégie de jeu d'un joueur simulé.
+
+    choisir renvoie une action légale pour Partie.actions_joueur : ("suivre", None),
+    ("se_coucher", None), ("all-in", None) ou ("miser", montant).
+    """
+
+    def __init__(self, graine: int | None = None):
+        self.rng = random.Random(graine)
+
+    @abstractmethod
+    def choisir(self, partie, joueur) -> tuple[str, int | None]:
+        """Action choisie par le bot quand c'est à son tour de jouer"""
+        pass
+
+    @staticmethod
+    def a_suivre(partie, joueur) -> int:
+        """Jetons à ajouter pour égaliser la mise maximale"""
+        return max(partie.mise_max - joueur.mise, 0)
+
+    @staticmethod
+    def relance(partie, joueur) -> tuple[str, int | None]:
+        """Relance au double de la mise maximale (au moins deux grosses blinds), ou tapis."""
+        cible = max(2 * partie.mise_max, 2 * partie.GROSSE_BLIND)
+        montant = cible - joueur.mise
+        if montant >= joueur.solde:
+            return "all-in", None
+        return "miser", montant
+
+    def suivre_ou_tapis(self, partie, joueur) -> tuple[str, int | None]:
+        if self.a_suivre(partie, joueur) >= joueur.solde:
+            return "all-in", None
+        return "suivre", None
+
+
+class BotPassif(Bot):
+    """Suit toujours (check ou call), ne relance jamais."""
+
+    def choisir(self, partie, joueur):
+        return self.suivre_ou_tapis(partie, joueur)
+
+
+class BotAleatoire(Bot):
+    """Se couche, suit, relance ou part à tapis au hasard, avec des probabilités fixées."""
+
+    def __init__(self, graine: int | None = None, couche: float = 0.15, relance: float = 0.15,
+                 tapis: float = 0.02):
+        super().__init__(graine)
+        self.couche = couche
+        self.relance_proba = relance
+        self.tapis = tapis
+
+    def choisir(self, partie, joueur):
+        tirage = self.rng.random()
+        if tirage < self.tapis:
+            return "all-in", None
+        tirage -= self.tapis
+        if tirage < self.couche and self.a_suivre(partie, joueur) > 0:
+            return "se_coucher", None
+        tirage -= self.couche
+        if tirage < self.relance_proba:
+            return self.relance(partie, joueur)
+        return self.suivre_ou_tapis(partie, joueur)
+
+
+class BotAgressif(BotAleatoire):
+    """Relance souvent et se couche rarement : beaucoup de pots multiples et de tapis."""
+
+    def __init__(self, graine: int | None = None):
+        super().__init__(graine, couche=0.05, relance=0.4, tapis=0.08)
+
+
+class BotEquite(Bot):
+    """
+    Joue selon la force de sa main : au préflop, le conseil tiré de la table des équités
+    précalculées ; ensuite, la meilleure main suivie par la partie (relance à partir d'une
+    double paire, suit avec une paire, se couche sinon).
+    """
+
+    def choisir(self, partie, joueur):
+        a_suivre = self.a_suivre(partie, joueur)
+        if partie.tour_actuel == "preflop":
+            table = TableEquitePreflop.partagee()
+            adversaires = sum(1 for j in partie.table.joueurs if j.actif and j is not joueur)
+            nb_adversaires = min(max(adversaires, 1), table.nb_adversaires_max)
+            pot = partie.comptage.pot + sum(j.mise for j in partie.table.joueurs)
+            conseil = conseiller(
+                table.equite(joueur.main, nb_adversaires), nb_adversaires, a_suivre, pot
+            )["conseil"]
+        else:
+            main = partie.meilleure_main(joueur.pseudo)
+            force = main.combinaison.value if main is not None else 0
+            if force >= combinaisons.DOUBLE_PAIRE.value:
+                conseil = "relancer"
+            elif force >= combinaisons.PAIRE.value:
+                conseil = "suivre"
+            else:
+                conseil = "se_coucher"
+
+        if conseil == "relancer":
+            return self.relance(partie, joueur)
+        if conseil == "se_coucher" and a_suivre > 0:
+            return "se_coucher", None
+        return self.suivre_ou_tapis(partie, joueur)
+
+
+STRATEGIES = {
+    "passif": BotPassif,
+    "aleatoire": BotAleatoire,
+    "agressif": BotAgressif,
+    "equite": BotEquite,
+}
@@ -0,0 +1,43 @@
+from concurrent.futures import Future
+
+from src.dao.statistique_dao import StatistiqueDao
+
+
+class StatistiquesMemoire:
+    """
+    Remplace AccumulateurStatistique (et la base derrière) pour jouer des mains sans
+    base de données : statistiques et portefeuilles sont gardés dans des dictionnaires.
+    """
+
+    def __init__(self):
+        self.statistiques: dict[tuple[str, str], int] = {}
+        self.portefeuilles: dict[str, int] = {}
+        self.nb_reglements = 0
+
+    def incrementer_statistique(self, pseudo: str, stat_a_incrementer: str, valeur: int = 1):
+        if stat_a_incrementer not in StatistiqueDao.CHAMPS_AUTORISES:
+            raise ValueError(f"Champ '{stat_a_incrementer}' non autorisé pour la mise à jour.")
+        cle = (pseudo, stat_a_incrementer)
+        self.statistiques[cle] = self.statistiques.get(cle, 0) + valeur
+
+    def fusionner(self, autre: "StatistiquesMemoire") -> None:
+        """Ajoute les statistiques et portefeuilles d'un autre simulateur (tables distinctes)."""
+        for cle, valeur in autre.statistiques.items():
+            self.statistiques[cle] = self.statistiques.get(cle, 0) + valeur
+        self.portefeuilles.update(autre.portefeuilles)
+        self.nb_reglements += autre.nb_reglements
+
+    def vider(self, soldes: dict[str, int] | None = None) -> int:
+        if soldes:
+            self.portefeuilles.update(soldes)
+            self.nb_reglements += 1
+        return 0
+
+
+class FileImmediate:
+    """Remplace FileEcriture : les écritures sont exécutées tout de suite, dans le thread appelant."""
+
+    def soumettre(self, fonction, *args, **kwargs) -> Future:
+        futur = Future()
+        futur.set_result(fonction(*args, **kwargs))
+        return futur
@@ -0,0 +1,283 @@
+import random
+import sys
+import time
+import tracemalloc
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+
+from src.business_object.joueurs import Joueur
+from src.business_object.partie import Partie
+from src.business_object.table import Table
+
+from src.simulation.bots import STRATEGIES
+from src.simulation.dao_memoire import FileImmediate, StatistiquesMemoire
+
+
+class ErreurSimulation(Exception):
+    """Incohérence du moteur détectée pendant une simulation (jetons perdus, main bloquée...)"""
+
+
+class TableSimulee:
+    """
+    Une table jouée par des bots, sans base de données ni API.
+
+    Le paquet et chaque bot ont leur propre générateur, initialisé à partir de la graine et
+    du numéro de table : une table joue les mêmes mains quel que soit le processus qui la
+    simule ou les tables simulées à côté.
+    """
+
+    # au-delà, une main est considérée comme bloquée
+    ACTIONS_MAX_PAR_MAIN = 500
+
+    def __init__(self, id_table: int, nb_joueurs: int, strategie: str = "aleatoire",
+                 cave: int = 1000, blind: int = 20, graine: int = 0):
+        self.cave = cave
+        self.stats = StatistiquesMemoire()
+        self.joueurs = [Joueur(f"bot{id_table}_{i}", cave) for i in range(nb_joueurs)]
+        self.bots = {
+            j.pseudo: STRATEGIES[strategie](graine=f"{graine}:{id_table}:{i}")
+            for i, j in enumerate(self.joueurs)
+        }
+        table = Table(id=id_table, blind=blind, places_max=nb_joueurs)
+        table.deck.rng = random.Random(f"{graine}:{id_table}")
+        for j in self.joueurs:
+            table.ajouter_joueur(j)
+        self.partie = Partie(
+            id=id_table, table=table, grosse_blind=blind,
+            stats_dao=self.stats, file_ecriture=FileImmediate(),
+        )
+        # jetons en jeu : caves initiales, plus les recaves
+        self.jetons_attendus = cave * nb_joueurs
+        self.recaves = 0
+
+    def _nouvelle_main(self) -> None:
+        """Lance la main suivante ; si moins de deux joueurs ont de quoi jouer, tout le monde recave."""
+        if self.partie.gestion_rejouer():
+            return
+        for j in self.joueurs:
+            self.jetons_attendus += self.cave - j.solde
+            j.solde = self.cave
+        self.recaves += 1
+        self.partie.table.joueurs = list(self.joueurs)
+        if not self.partie.gestion_rejouer():
+            raise ErreurSimulation(f"Table {self.partie.id} : impossible de relancer une main.")
+
+    def jouer_main(self, latences: "Latences") -> int:
+        """
+        Joue une main complète et vérifie la conservation des jetons.
+
+        Returns
+        -------
+        int
+            nombre d'actions jouées
+        """
+        partie = self.partie
+        self._nouvelle_main()
+        actions = 0
+        while not partie.etat.finie:
+            pseudo = partie.etat.joueur_courant
+            if pseudo is None or actions >= self.ACTIONS_MAX_PAR_MAIN:
+                raise ErreurSimulation(
+                    f"Table {partie.id} : main bloquée au tour {partie.tour_actuel} "
+                    f"après {actions} actions."
+                )
+            action, montant = self.bots[pseudo].choisir(partie, partie.table.joueur(pseudo))
+            debut = time.perf_counter_ns()
+            partie.actions_joueur(pseudo, action, montant)
+            latences.ajouter(time.perf_counter_ns() - debut)
+            actions += 1
+        self.verifier_conservation()
+        return actions
+
+    def verifier_conservation(self) -> None:
+        """Vérifie qu'aucun jeton n'a été créé ni perdu pendant la main."""
+        total = sum(j.solde + j.mise for j in self.joueurs)
+        if total != self.jetons_attendus:
+            raise ErreurSimulation(
+                f"Table {self.partie.id} : {total} jetons en jeu au lieu de {self.jetons_attendus}."
+            )
+
+
+class Latences:
+    """
+    Échantillon borné des latences d'action (échantillonnage par réservoir).
+    Le tableau est alloué d'avance pour ne pas fausser la mesure des blocs conservés.
+    """
+
+    def __init__(self, taille: int = 100_000, graine: int = 0):
+        self.taille = taille
+        self.nb = 0
+        self.valeurs = array("q", bytes(8 * taille))
+        self._rng = random.Random(graine)
+
+    def ajouter(self, ns: int) -> None:
+        if self.nb < self.taille:
+            self.valeurs[self.nb] = ns
+        else:
+            i = self._rng.randrange(self.nb + 1)
+            if i < self.taille:
+                self.valeurs[i] = ns
+        self.nb += 1
+
+    @classmethod
+    def fusionner(cls, echantillons: list["Latences"], taille: int = 100_000,
+                  graine: int = 0) -> "Latences":
+        """
+        Regroupe les échantillons de plusieurs processus : chacun contribue en proportion
+        du nombre de latences qu'il a mesurées.
+        """
+        rng = random.Random(graine)
+        total = sum(e.nb for e in echantillons)
+        valeurs = []
+        for e in echantillons:
+            disponibles = list(e.valeurs[:min(e.nb, e.taille)])
+            k = min(len(disponibles), round(taille * e.nb / total)) if total else 0
+            valeurs += rng.sample(disponibles, k)
+        fusion = cls(taille=len(valeurs), graine=graine)
+        fusion.valeurs = array("q", valeurs)
+        fusion.nb = total
+        return fusion
+
+    def centile(self, p: float) -> float:
+        """Centile p (entre 0 et 100) en microsecondes"""
+        if not self.nb:
+            return 0.0
+        tries = sorted(self.valeurs[:min(self.nb, self.taille)])
+        return tries[min(int(len(tries) * p / 100), len(tries) - 1)] / 1000
+
+
+def _jouer_tables(ids_tables: list[int], mains: list[int], joueurs_par_table: int,
+                  strategie: str, blind: int, graine: int, echauffement: int,
+                  profil_memoire: bool) -> dict:
+    """
+    Joue les mains d'un lot de tables, à tour de rôle, dans le processus courant.
+    Fonction de module pour pouvoir être envoyée aux processus de travail.
+    """
+    tables = [TableSimulee(i, joueurs_par_table, strategie, blind=blind, graine=graine)
+              for i in ids_tables]
+    # l'échauffement se fait sur une table à part pour ne pas décaler les tirages des autres
+    chauffe = TableSimulee(0, joueurs_par_table, strategie, blind=blind, graine=graine)
+    for _ in range(echauffement):
+        chauffe.jouer_main(Latences(taille=1))
+
+    latences = Latences(graine=graine)
+    restantes = list(mains)
+    if profil_memoire:
+        tracemalloc.start()
+    blocs_avant = sys.getallocatedblocks()
+    actions = 0
+    debut = time.perf_counter()
+    while any(restantes):
+        for k, table in enumerate(tables):
+            if restantes[k]:
+                actions += table.jouer_main(latences)
+                restantes[k] -= 1
+    duree = time.perf_counter() - debut
+
+    stats = StatistiquesMemoire()
+    for table in tables:
+        stats.fusionner(table.stats)
+    resultat = {
+        "mains": sum(mains),
+        "actions": actions,
+        "duree_s": duree,
+        "blocs": sys.getallocatedblocks() - blocs_avant,
+        "recaves": sum(t.recaves for t in tables),
+        "latences": latences,
+        "statistiques": stats,
+    }
+    if profil_memoire:
+        resultat["memoire_max_ko"] = tracemalloc.get_traced_memory()[1] / 1024
+        tracemalloc.stop()
+    return resultat
+
+
+class Simulateur:
+    """
+    Joue des mains en boucle sur plusieurs tables de bots et mesure le débit du moteur.
+
+    Chaque table joue ses mains avec ses propres générateurs et la conservation des jetons
+    est vérifiée à la fin de chaque main. Avec plusieurs processus, les tables sont réparties
+    entre eux (elles sont indépendantes) et leurs mesures et statistiques fusionnées à la fin.
+    """
+
+    def __init__(self, nb_tables: int = 4, joueurs_par_table: int = 5,
+                 strategie: str = "aleatoire", blind: int = 20, graine: int = 0,
+                 nb_processus: int = 1):
+        self.nb_tables = nb_tables
+        self.joueurs_par_table = joueurs_par_table
+        self.strategie = strategie
+        self.blind = blind
+        self.graine = graine
+        self.nb_processus = max(1, min(nb_processus, nb_tables))
+        # statistiques de jeu fusionnées de toutes les tables, après jouer
+        self.statistiques = StatistiquesMemoire()
+
+    def _lots(self, nb_mains: int) -> list[tuple[list[int], list[int]]]:
+        """Répartit les tables entre processus, et les mains entre tables."""
+        mains = {
+            i + 1: nb_mains // self.nb_tables + (i < nb_mains % self.nb_tables)
+            for i in range(self.nb_tables)
+        }
+        lots = []
+        for p in range(self.nb_processus):
+            ids = list(range(p + 1, self.nb_tables + 1, self.nb_processus))
+            lots.append((ids, [mains[i] for i in ids]))
+        return lots
+
+    def jouer(self, nb_mains: int, profil_memoire: bool = False, echauffement: int = 0) -> dict:
+        """
+        Joue nb_mains mains (réparties sur les tables) et renvoie le rapport de mesure.
+
+        Parameters
+        ----------
+        nb_mains : int
+            nombre total de mains
+        profil_memoire : bool
+            suit aussi le pic de mémoire avec tracemalloc (ralentit fortement la simulation)
+        echauffement : int
+            mains jouées par processus avant la mesure (construction des tables d'évaluation)
+
+        Returns
+        -------
+        dict
+            mains, actions, durée, débits, latences p50/p99 (µs), blocs mémoire conservés
+            par main (fuites), recaves et, si demandé, pic de mémoire (Ko) du processus le
+            plus gourmand
+        """
+        parametres = (self.joueurs_par_table, self.strategie, self.blind, self.graine,
+                      echauffement, profil_memoire)
+        debut = time.perf_counter()
+        if self.nb_processus == 1:
+            resultats = [_jouer_tables(*lot, *parametres) for lot in self._lots(nb_mains)]
+        else:
+            with ProcessPoolExecutor(max_workers=self.nb_processus) as executeur:
+                futurs = [executeur.submit(_jouer_tables, *lot, *parametres)
+                          for lot in self._lots(nb_mains)]
+                resultats = [f.result() for f in futurs]
+        # en parallèle, le débit se mesure sur la durée totale (démarrage des processus compris)
+        duree = time.perf_counter() - debut if self.nb_processus > 1 else resultats[0]["duree_s"]
+
+        self.statistiques = StatistiquesMemoire()
+        for r in resultats:
+            self.statistiques.fusionner(r["statistiques"])
+        latences = Latences.fusionner([r["latences"] for r in resultats], graine=self.graine)
+        actions = sum(r["actions"] for r in resultats)
+
+        rapport = {
+            "tables": self.nb_tables,
+            "processus": self.nb_processus,
+            "mains": nb_mains,
+            "actions": actions,
+            "duree_s": round(duree, 3),
+            "mains_par_s": round(nb_mains / duree, 1) if duree else 0.0,
+            "actions_par_s": round(actions / duree, 1) if duree else 0.0,
+            "latence_p50_us": round(latences.centile(50), 1),
+            "latence_p99_us": round(latences.centile(99), 1),
+            "blocs_conserves_par_main": round(sum(r["blocs"] for r in resultats) / nb_mains, 2)
+            if nb_mains else 0.0,
+            "recaves": sum(r["recaves"] for r in resultats),
+        }
+        if profil_memoire:
+            rapport["memoire_max_ko"] = round(max(r["memoire_max_ko"] for r in resultats), 1)
+        return rapport
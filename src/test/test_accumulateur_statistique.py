@@ -0,0 +1,97 @@
+from unittest.mock import MagicMock
+
+import pytest
+
+from src.dao.accumulateur_statistique import AccumulateurStatistique
+
+
+@pytest.fixture
+def accumulateur(monkeypatch):
+    acc = AccumulateurStatistique()
+    monkeypatch.setattr(acc, "dao", MagicMock())
+    monkeypatch.setattr(acc, "joueur_dao", MagicMock())
+    monkeypatch.setattr(acc, "_deltas", {})
+    monkeypatch.setattr(acc, "_soldes", {})
+    return acc
+
+
+def test_incrementer_agrege_sans_base(accumulateur):
+    accumulateur.incrementer_statistique("alice", "nombre_mises")
+    accumulateur.incrementer_statistique("alice", "nombre_mises")
+    accumulateur.incrementer_statistique("bob", "nombre_folds", 3)
+    assert accumulateur.en_attente() == {
+        ("alice", "nombre_mises"): 2,
+        ("bob", "nombre_folds"): 3,
+    }
+    accumulateur.dao.incrementer_statistiques_lot.assert_not_called()
+
+
+def test_incrementer_champ_interdit(accumulateur):
+    with pytest.raises(ValueError):
+        accumulateur.incrementer_statistique("alice", "mdp")
+
+
+def test_vider_un_seul_lot(accumulateur):
+    accumulateur.incrementer_statistique("alice", "nombre_mises")
+    accumulateur.incrementer_statistique("bob", "nombre_suivis")
+    assert accumulateur.vider() == 2
+    accumulateur.dao.incrementer_statistiques_lot.assert_called_once_with({
+        ("alice", "nombre_mises"): 1,
+        ("bob", "nombre_suivis"): 1,
+    })
+    assert accumulateur.en_attente() == {}
+    # rien en attente : pas de requête
+    assert accumulateur.vider() == 0
+    assert accumulateur.dao.incrementer_statistiques_lot.call_count == 1
+
+
+def test_vider_echec_conserve_les_increments(accumulateur):
+    accumulateur.dao.incrementer_statistiques_lot.side_effect = Exception("base indisponible")
+    accumulateur.incrementer_statistique("alice", "nombre_mises")
+    assert accumulateur.vider() == 0
+    accumulateur.incrementer_statistique("alice", "nombre_mises")
+    assert accumulateur.en_attente() == {("alice", "nombre_mises"): 2}
+
+
+def test_vider_avec_soldes_une_seule_transaction(accumulateur):
+    accumulateur.incrementer_statistique("alice", "nombre_victoire_abattage")
+    accumulateur.vider(soldes={"alice": 1200, "bob": 800})
+    accumulateur.joueur_dao.regler_main.assert_called_once_with(
+        {"alice": 1200, "bob": 800}, {("alice", "nombre_victoire_abattage"): 1}
+    )
+    accumulateur.dao.incrementer_statistiques_lot.assert_not_called()
+
+
+def test_vider_avec_soldes_echec_garde_le_solde_le_plus_recent(accumulateur):
+    accumulateur.joueur_dao.regler_main.side_effect = Exception("base indisponible")
+    accumulateur.vider(soldes={"alice": 1200})
+    accumulateur.joueur_dao.regler_main.side_effect = None
+    accumulateur.vider(soldes={"alice": 900})
+    accumulateur.joueur_dao.regler_main.assert_called_with({"alice": 900}, {})
+
+
+def test_vider_avec_soldes_met_a_jour_les_classements(accumulateur):
+    accumulateur.vider({"alice": 120, "bob": 80})
+    accumulateur.joueur_dao.regler_main.assert_called_once()
+    # seuls les joueurs de la main sont classés, pas toute la table
+    accumulateur.dao.mettre_a_jour_meilleurs_classements.assert_called_once_with(["alice", "bob"])
+
+
+def test_echec_classement_n_annule_pas_le_reglement(accumulateur):
+    accumulateur.dao.mettre_a_jour_meilleurs_classements.side_effect = Exception("verrou")
+    accumulateur.incrementer_statistique("alice", "nombre_mises")
+    assert accumulateur.vider({"alice": 120}) == 1
+    assert accumulateur.en_attente() == {}
+
+
+def test_abonnes_prevenus_apres_reglement(accumulateur, monkeypatch):
+    monkeypatch.setattr(accumulateur, "_abonnes_reglement", [])
+    recus = []
+    accumulateur.abonner_reglement(recus.append)
+    accumulateur.vider({"alice": 120})
+    assert recus == [{"alice": 120}]
+
+    # règlement en échec : rien n'est annoncé
+    accumulateur.joueur_dao.regler_main.side_effect = Exception("base indisponible")
+    accumulateur.vider({"alice": 90})
+    assert recus == [{"alice": 120}]
@@ -1,5 +1,7 @@
 from fastapi.testclient import TestClient
 from src.api.api_main import app
+from src.api.var_utiles import tables_service
+from src.business_object.joueurs import Joueur
 
 client = TestClient(app)
 
@@ -16,3 +18,33 @@ def test_routes_exist():
     assert "/" in paths
     # Vérifie au moins un endpoint lié aux joueurs
     assert any("joueur" in p for p in paths)
+
+
+def test_sante_vivant():
+    response = client.get("/sante/vivant")
+    assert response.status_code == 200
+    assert response.json() == {"statut": "ok"}
+
+
+def test_sante_pret_avant_initialisation():
+    # sans démarrage du serveur, l'initialisation n'a pas été lancée
+    response = client.get("/sante/pret")
+    assert response.status_code == 503
+    assert response.json()["pret"] is False
+
+
+def test_voir_mes_cartes_table_inconnue():
+    response = client.get("/joueur_en_jeu/voir_mes_cartes", params={"partie": 10_000, "pseudo": "zoe"})
+    assert response.status_code == 404
+
+
+def test_voir_mes_cartes_sans_cartes():
+    table = tables_service.tables[1]
+    zoe = Joueur("zoe", 1000)
+    table.ajouter_joueur(zoe)
+    try:
+        response = client.get("/joueur_en_jeu/voir_mes_cartes", params={"partie": 1, "pseudo": "zoe"})
+    finally:
+        table.supprimer_joueur(zoe)
+    assert response.status_code == 200
+    assert response.json() == "Le joueur n'a pas de cartes"
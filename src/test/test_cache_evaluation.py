@@ -0,0 +1,83 @@
+import pytest
+from src.business_object.cartes import Carte, valeurs, couleurs
+from src.business_object.cache_evaluation import CacheEvaluations
+from src.business_object.evaluateur import EvaluateurMain
+
+
+@pytest.fixture
+def cache_evaluateur():
+    EvaluateurMain.activer_cache(10)
+    yield EvaluateurMain.cache
+    EvaluateurMain.activer_cache(None)
+
+
+def main_couleur(couleur_privee, couleur_board):
+    return [
+        Carte(couleur_privee, valeurs.AS), Carte(couleur_privee, valeurs.ROI),
+        Carte(couleur_board, valeurs.DEUX), Carte(couleur_board, valeurs.SEPT),
+        Carte(couleur_board, valeurs.NEUF), Carte(couleurs.TREFLE, valeurs.DIX),
+        Carte(couleurs.CARREAU, valeurs.DIX),
+    ]
+
+
+def test_cle_identique_a_une_permutation_des_couleurs_pres():
+    assert CacheEvaluations.cle(main_couleur(couleurs.COEUR, couleurs.COEUR)) == \
+        CacheEvaluations.cle(main_couleur(couleurs.PIQUE, couleurs.PIQUE))
+    # couleur d'un côté, cartes dépareillées de l'autre : pas la même main
+    assert CacheEvaluations.cle(main_couleur(couleurs.COEUR, couleurs.COEUR)) != \
+        CacheEvaluations.cle(main_couleur(couleurs.COEUR, couleurs.PIQUE))
+
+
+def test_obtenir_compte_succes_et_echecs():
+    cache = CacheEvaluations(taille=4)
+    appels = []
+
+    def calculer():
+        appels.append(1)
+        return "resultat"
+
+    assert cache.obtenir(main_couleur(couleurs.COEUR, couleurs.COEUR), calculer) == "resultat"
+    assert cache.obtenir(main_couleur(couleurs.PIQUE, couleurs.PIQUE), calculer) == "resultat"
+    assert len(appels) == 1
+    stats = cache.statistiques()
+    assert (stats["succes"], stats["echecs"], stats["taux_succes"]) == (1, 1, 50.0)
+
+
+def test_eviction_de_la_moins_recemment_utilisee():
+    cache = CacheEvaluations(taille=2)
+    a = main_couleur(couleurs.COEUR, couleurs.COEUR)
+    b = main_couleur(couleurs.COEUR, couleurs.PIQUE)
+    c = a[:5]
+    cache.obtenir(a, lambda: "a")
+    cache.obtenir(b, lambda: "b")
+    cache.obtenir(a, lambda: "a")
+    cache.obtenir(c, lambda: "c")
+
+    # b, la moins récemment utilisée, a été évincée
+    assert cache.statistiques()["evictions"] == 1
+    assert cache.obtenir(a, lambda: "recalcul") == "a"
+    assert cache.obtenir(b, lambda: "recalcul") == "recalcul"
+
+
+def test_taille_invalide():
+    with pytest.raises(ValueError):
+        CacheEvaluations(taille=0)
+
+
+def test_evaluateur_utilise_le_cache(cache_evaluateur):
+    for moteur in EvaluateurMain.MOTEURS:
+        attendu = EvaluateurMain(main_couleur(couleurs.COEUR, couleurs.COEUR), moteur).evalue_main()
+        resultat = EvaluateurMain(main_couleur(couleurs.PIQUE, couleurs.PIQUE), moteur).evalue_main()
+        assert resultat is attendu
+    # une entrée par moteur : chacun évalue la main une fois
+    assert cache_evaluateur.statistiques()["succes"] == 2
+    assert cache_evaluateur.statistiques()["echecs"] == 2
+
+
+def test_cache_distingue_les_moteurs(cache_evaluateur):
+    cartes = main_couleur(couleurs.COEUR, couleurs.COEUR)
+    tables = EvaluateurMain(cartes, "tables").evalue_main()
+    classique = EvaluateurMain(cartes, "classique").evalue_main()
+    # le moteur classique ne renseigne pas de rang : ce n'est pas le résultat des tables
+    assert tables.rang is not None
+    assert classique.rang is None
@@ -74,3 +74,45 @@ def test_deck_ajouter():
     deck.ajouter(carte)
     assert len(deck) == 1
     assert deck.cartes[0] == carte
+
+
+def test_carte_unique_par_couleur_et_valeur():
+    carte1 = Carte(couleurs.COEUR, valeurs.AS)
+    carte2 = Carte(valeur=valeurs.AS, couleur=couleurs.COEUR)
+    assert carte1 is carte2
+    # nom ou valeur de l'enum acceptés
+    assert Carte("COEUR", "AS") is carte1
+    assert Carte("Coeur", "As") is carte1
+
+
+def test_carte_identifiant():
+    deck = Deck()
+    deck.remplir()
+    ids = sorted(c.id for c in deck.cartes)
+    assert ids == list(range(52))
+    carte = Carte(couleurs.PIQUE, valeurs.DEUX)
+    assert Carte.depuis_id(carte.id) is carte
+
+
+def test_carte_non_modifiable():
+    carte = Carte(couleurs.PIQUE, valeurs.DEUX)
+    with pytest.raises(AttributeError):
+        carte.valeur = valeurs.AS
+
+
+def test_carte_pickle_conserve_l_instance():
+    import pickle
+
+    carte = Carte(couleurs.TREFLE, valeurs.DAME)
+    assert pickle.loads(pickle.dumps(carte)) is carte
+
+
+def test_deck_melanger_sur_place():
+    deck = Deck()
+    deck.remplir()
+    tableau = deck.ids
+    deck.tirer()
+    deck.melanger()
+    assert deck.ids is tableau
+    assert len(deck) == 51
+    assert len(set(c.id for c in deck.cartes)) == 51
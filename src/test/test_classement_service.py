@@ -0,0 +1,89 @@
+from unittest.mock import MagicMock
+
+import pytest
+
+from src.service.classement_service import ClassementService
+
+
+class FakeJoueurDao:
+    """Classement en mémoire, trié comme la requête SQL"""
+
+    def __init__(self, portefeuilles):
+        self.portefeuilles = dict(portefeuilles)
+        self.lectures = 0
+
+    def classement_par_portefeuille(self, limit=None, offset=0):
+        self.lectures += 1
+        lignes = sorted(self.portefeuilles.items(), key=lambda x: (-x[1], x[0]))
+        fin = offset + limit if limit else None
+        return [{"pseudo": p, "portefeuille": v} for p, v in lignes[offset:fin]]
+
+    def rang_par_portefeuille(self, pseudo):
+        if pseudo not in self.portefeuilles:
+            return None
+        valeur = self.portefeuilles[pseudo]
+        rang = 1 + sum(1 for v in self.portefeuilles.values() if v > valeur)
+        return {"pseudo": pseudo, "portefeuille": valeur, "rang": rang}
+
+
+@pytest.fixture
+def joueurs():
+    return {f"j{i:02d}": 1000 - 10 * i for i in range(30)}
+
+
+@pytest.fixture
+def service(monkeypatch, joueurs):
+    monkeypatch.setattr(
+        "src.service.classement_service.AccumulateurStatistique", MagicMock()
+    )
+    # instance hors singleton : chaque test part d'un classement vide
+    service = ClassementService.__new__(ClassementService)
+    service.__init__(taille_top=5, dao=FakeJoueurDao(joueurs))
+    return service
+
+
+def test_page_du_haut_servie_depuis_la_memoire(service):
+    premiere = service.page(limit=3)
+    assert [j["pseudo"] for j in premiere] == ["j00", "j01", "j02"]
+    assert [j["rang"] for j in premiere] == [1, 2, 3]
+    lectures = service.dao.lectures
+    service.page(limit=3, offset=2)
+    assert service.dao.lectures == lectures
+
+
+def test_page_profonde_mise_en_cache(service):
+    page = service.page(limit=5, offset=20)
+    assert [j["rang"] for j in page] == [21, 22, 23, 24, 25]
+    lectures = service.dao.lectures
+    assert service.page(limit=5, offset=20) == page
+    assert service.dao.lectures == lectures
+
+
+def test_rang_ex_aequo(service):
+    service.dao.portefeuilles["j01"] = 1000
+    service._charger()
+    assert service.rang_joueur("j00")["rang"] == 1
+    assert service.rang_joueur("j01")["rang"] == 1
+    assert service.rang_joueur("j02")["rang"] == 3
+
+
+def test_rang_hors_du_top_et_inconnu(service):
+    assert service.rang_joueur("j25")["rang"] == 26
+    assert service.rang_joueur("personne") is None
+
+
+def test_reglement_fait_entrer_un_joueur_dans_le_top(service):
+    service.page(limit=1)
+    service.dao.portefeuilles["j20"] = 5000
+    service.mettre_a_jour_soldes({"j20": 5000})
+    lectures = service.dao.lectures
+    assert service.page(limit=2)[0] == {"rang": 1, "pseudo": "j20", "portefeuille": 5000}
+    assert service.dao.lectures == lectures
+
+
+def test_reglement_fait_sortir_un_joueur_du_top(service):
+    service.page(limit=1)
+    service.dao.portefeuilles["j00"] = 0
+    service.mettre_a_jour_soldes({"j00": 0})
+    assert service.page(limit=1)[0]["pseudo"] == "j01"
+    assert service.rang_joueur("j00")["rang"] == 30
@@ -79,3 +79,53 @@ def test_distrib_pots_plusieurs_gagnants(comptage, table_exemple):
     assert bob.solde == 1150
     assert comptage.pot == 0
     assert comptage.pots_perso == {}
+
+
+@pytest.fixture
+def trois_joueurs():
+    return Joueur("Alice", 0), Joueur("Bob", 0), Joueur("Chloe", 0)
+
+
+def test_construire_pots_tapis_inegaux(comptage, trois_joueurs):
+    alice, bob, chloe = trois_joueurs
+    comptage.ajouter_pot_perso(alice, 50)
+    comptage.ajouter_pot_perso(bob, 200)
+    comptage.ajouter_pot_perso(chloe, 120)
+    pots = comptage.construire_pots([alice, bob, chloe])
+    assert [p["montant"] for p in pots] == [150, 140, 80]
+    assert pots[0]["eligibles"] == [alice, chloe, bob]
+    assert pots[1]["eligibles"] == [chloe, bob]
+    assert pots[2]["eligibles"] == [bob]
+
+
+def test_construire_pots_mise_morte_couche(comptage, trois_joueurs):
+    alice, bob, chloe = trois_joueurs
+    # Chloé s'est couchée après avoir misé 30 : sa mise reste dans le pot principal
+    comptage.ajouter_pot_perso(chloe, 30)
+    comptage.ajouter_pot_perso(alice, 100)
+    comptage.ajouter_pot_perso(bob, 100)
+    pots = comptage.construire_pots([alice, bob])
+    assert pots == [{"montant": 230, "eligibles": [alice, bob]}]
+
+
+def test_repartir_pots_meilleure_main_eligible(comptage, trois_joueurs):
+    alice, bob, chloe = trois_joueurs
+    comptage.ajouter_pot_perso(alice, 50)
+    comptage.ajouter_pot_perso(bob, 200)
+    comptage.ajouter_pot_perso(chloe, 120)
+    # Alice a la meilleure main mais n'est éligible qu'au pot principal
+    comptage.repartir_pots([[alice], [chloe], [bob]], [alice, bob, chloe])
+    assert (alice.solde, chloe.solde, bob.solde) == (150, 140, 80)
+    assert comptage.pot == 0
+    assert comptage.contributions == {}
+
+
+def test_repartir_pots_jeton_indivisible(comptage, trois_joueurs):
+    alice, bob, chloe = trois_joueurs
+    comptage.ajouter_pot_perso(alice, 33)
+    comptage.ajouter_pot_perso(bob, 33)
+    comptage.ajouter_pot_perso(chloe, 33)
+    attributions = comptage.repartir_pots([[alice, bob], [chloe]], [bob, chloe, alice])
+    # 99 jetons pour deux gagnants : le jeton en trop va au premier dans l'ordre
+    assert attributions[0]["gagnants"] == [bob, alice]
+    assert attributions[0]["gains"] == {bob: 50, alice: 49}
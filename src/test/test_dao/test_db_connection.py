@@ -0,0 +1,91 @@
+import threading
+from unittest.mock import MagicMock
+
+import psycopg2
+import pytest
+from psycopg2 import pool
+
+from src.dao.db_connection import DBConnection
+
+
+class FakePool:
+    """Pool minimal : fabrique des connexions factices et garde trace des retours."""
+
+    def __init__(self, minconn, maxconn, **kwargs):
+        self.libres = []
+        self.rendues = []
+
+    def getconn(self):
+        if self.libres:
+            return self.libres.pop()
+        connexion = MagicMock()
+        connexion.closed = 0
+        return connexion
+
+    def putconn(self, connexion, close=False):
+        self.rendues.append((connexion, close))
+        if not close:
+            self.libres.append(connexion)
+
+
+@pytest.fixture
+def db(monkeypatch):
+    for var in ("HOST", "PORT", "DATABASE", "USER", "PASSWORD", "SCHEMA"):
+        monkeypatch.setenv(f"POSTGRES_{var}", "test")
+    monkeypatch.setenv("POSTGRES_POOL_MAX", "2")
+    monkeypatch.setenv("POSTGRES_POOL_TIMEOUT", "0.05")
+    monkeypatch.setattr("src.dao.db_connection.pool.ThreadedConnectionPool", FakePool)
+    # instance indépendante du singleton
+    instance = DBConnection.__new__(DBConnection)
+    instance.__init__()
+    return instance
+
+
+def test_connexion_empruntee_puis_rendue(db):
+    with db.connexion() as connexion:
+        assert db.metriques()["en_cours"] == 1
+    assert db._pool.rendues == [(connexion, False)]
+    metriques = db.metriques()
+    assert metriques["emprunts"] == 1
+    assert metriques["en_cours"] == 0
+    assert metriques["max_en_cours"] == 1
+
+
+def test_connexion_fermee_remplacee(db):
+    cassee = db._pool.getconn()
+    cassee.closed = 1
+    db._pool.libres.append(cassee)
+    with db.connexion() as connexion:
+        assert connexion is not cassee
+    assert (cassee, True) in db._pool.rendues
+    assert db.metriques()["reconnexions"] == 1
+
+
+def test_erreur_reseau_ferme_la_connexion(db):
+    with pytest.raises(psycopg2.OperationalError):
+        with db.connexion() as connexion:
+            raise psycopg2.OperationalError("connexion perdue")
+    assert db._pool.rendues == [(connexion, True)]
+
+
+def test_pool_epuise_attente_expiree(db):
+    liberer = threading.Event()
+    pris = threading.Barrier(3)
+
+    def occuper():
+        with db.connexion():
+            pris.wait()
+            liberer.wait()
+
+    threads = [threading.Thread(target=occuper) for _ in range(2)]
+    for t in threads:
+        t.start()
+    pris.wait()
+    with pytest.raises(pool.PoolError):
+        with db.connexion():
+            pass
+    assert db.metriques()["taux_utilisation"] == 1
+    liberer.set()
+    for t in threads:
+        t.join()
+    assert db.metriques()["attentes_expirees"] == 1
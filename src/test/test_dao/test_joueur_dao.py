@@ -22,7 +22,7 @@ def test_verifier_joueurs_existent():
     """Vérifie que la table players contient bien les joueurs attendus"""
     
     # GIVEN / WHEN
-    with DBConnection().connection as connection:
+    with DBConnection().connexion() as connection:
         with connection.cursor() as cursor:
             cursor.execute("SELECT pseudo, mdp, portefeuille, code_parrainage FROM joueurs;")
             joueurs = cursor.fetchall()
@@ -191,7 +191,7 @@ def test_se_connecter_ok():
     pseudo = "arthur"
     mdp = "5e5273fdb85dc5d8ed9b10759ffcde9c82936ef8333b67ccc2a3aa0be58e7b7c"
     from src.dao.db_connection import DBConnection
-    with DBConnection().connection as conn:
+    with DBConnection().connexion() as conn:
         with conn.cursor() as cur:
             cur.execute("SELECT pseudo, mdp FROM joueurs;")
             print("DEBUG contenu players:", cur.fetchall())
@@ -417,14 +417,14 @@ def test_maj_date_ok():
     import datetime
 
     # WHEN
-    with DBConnection().connection as conn:
+    with DBConnection().connexion() as conn:
         with conn.cursor() as cur:
             cur.execute("SELECT date_dernier_credit_auto FROM joueurs WHERE pseudo=%s;", (pseudo,))
             avant = cur.fetchall()[0]['date_dernier_credit_auto']
 
     JoueurDao().maj_date_credit_auto(pseudo)
 
-    with DBConnection().connection as conn:
+    with DBConnection().connexion() as conn:
         with conn.cursor() as cur:
             cur.execute("SELECT date_dernier_credit_auto FROM joueurs WHERE pseudo=%s;", (pseudo,))
             apres = cur.fetchall()[0]['date_dernier_credit_auto']
@@ -444,6 +444,26 @@ def test_maj_date_credit_auto_joueur_inexistant():
     except Exception:
         pytest.fail("maj_date_credit_auto a levé une exception pour un pseudo inexistant")
 
+def test_crediter_auto_lot_ok():
+    """Crédite et date en une requête les joueurs éligibles, une seule fois."""
+    # GIVEN
+    pseudo = "jean"
+    with DBConnection().connexion() as conn:
+        with conn.cursor() as cur:
+            cur.execute(
+                "UPDATE joueurs SET portefeuille = 10, date_dernier_credit_auto = NULL "
+                "WHERE pseudo = %s;", (pseudo,)
+            )
+
+    # WHEN
+    credites = JoueurDao().crediter_auto_lot(500, seuil=50, taille_lot=10)
+
+    # THEN
+    assert pseudo in credites
+    assert JoueurDao().valeur_portefeuille(pseudo) == 510
+    # déjà crédité : le lot suivant est vide
+    assert JoueurDao().crediter_auto_lot(500, seuil=50, taille_lot=10) == []
+
 def test_deconnecter_ok():
     pseudo = "arthur"
     JoueurDao().se_connecter(pseudo, "5e5273fdb85dc5d8ed9b10759ffcde9c82936ef8333b67ccc2a3aa0be58e7b7c")
@@ -455,3 +475,28 @@ def test_deconnecter_inexistant():
 
 
 
+
+
+def test_regler_main_soldes_et_statistiques():
+    """Soldes et statistiques d'une main sont écrits ensemble."""
+    # GIVEN
+    mains_avant = StatistiqueDao().trouver_statistiques_par_id("arthur")["nombre_total_mains_jouees"]
+
+    # WHEN
+    nb = JoueurDao().regler_main(
+        {"arthur": 1234, "maxence": 4321},
+        {("arthur", "nombre_total_mains_jouees"): 1},
+    )
+
+    # THEN
+    assert nb == 2
+    assert JoueurDao().valeur_portefeuille("arthur") == 1234
+    assert JoueurDao().valeur_portefeuille("maxence") == 4321
+    stats = StatistiqueDao().trouver_statistiques_par_id("arthur")
+    assert stats["nombre_total_mains_jouees"] == mains_avant + 1
+
+
+def test_regler_main_champ_interdit():
+    """Un champ de statistique non autorisé est refusé avant tout accès à la base."""
+    with pytest.raises(ValueError):
+        JoueurDao().regler_main({"arthur": 10}, {("arthur", "mdp"): 1})
@@ -151,6 +151,41 @@ def test_recuperer_top_joueurs_limite():
     assert len(top_joueurs) <= 5
 
 
+def test_mettre_a_jour_meilleurs_classements():
+    """
+    Le meilleur classement de chaque joueur n'est jamais moins bon que son rang actuel
+    """
+    # WHEN
+    StatistiqueDao().mettre_a_jour_meilleurs_classements()
+    # THEN
+    classement = JoueurDao().classement_par_portefeuille()
+    for joueur in classement:
+        rang = 1 + sum(1 for j in classement if j["portefeuille"] > joueur["portefeuille"])
+        stats = StatistiqueDao().trouver_statistiques_par_id(joueur["pseudo"])
+        if stats:
+            assert stats["meilleur_classement"] <= rang
+    # rien n'a changé depuis : aucune ligne modifiée
+    assert StatistiqueDao().mettre_a_jour_meilleurs_classements() == 0
+
+
+def test_mettre_a_jour_meilleurs_classements_des_joueurs_donnes():
+    """
+    Classer quelques joueurs leur donne le même rang que le classement de toute la table
+    """
+    # GIVEN
+    classement = JoueurDao().classement_par_portefeuille()
+    pseudos = [j["pseudo"] for j in classement[:2]]
+    # WHEN
+    StatistiqueDao().mettre_a_jour_meilleurs_classements(pseudos)
+    # THEN
+    for joueur in classement[:2]:
+        rang = 1 + sum(1 for j in classement if j["portefeuille"] > joueur["portefeuille"])
+        stats = StatistiqueDao().trouver_statistiques_par_id(joueur["pseudo"])
+        if stats:
+            assert stats["meilleur_classement"] <= rang
+    assert StatistiqueDao().mettre_a_jour_meilleurs_classements([]) == 0
+
+
 def test_mettre_a_jour_statistique_exception_db(monkeypatch):
     """
     Vérifie qu'une exception DB est levée si update échoue
@@ -159,10 +194,9 @@ def test_mettre_a_jour_statistique_exception_db(monkeypatch):
     stat = "nombre_folds"
     valeur = 10
 
-    # Patch DBConnection pour lever une exception sur l'attribut .connection
+    # Patch DBConnection pour lever une exception à l'emprunt d'une connexion
     class FakeDB:
-        @property
-        def connection(self):
+        def connexion(self):
             raise Exception("DB error")
 
     monkeypatch.setattr("src.dao.statistique_dao.DBConnection", lambda: FakeDB())
@@ -177,10 +211,9 @@ def test_incrementer_statistique_exception_db(monkeypatch):
     pseudo = "maxence"
     stat = "nombre_mises"
 
-    # Patch DBConnection pour lever une exception sur l'attribut .connection
+    # Patch DBConnection pour lever une exception à l'emprunt d'une connexion
     class FakeDB:
-        @property
-        def connection(self):
+        def connexion(self):
             raise Exception("DB error")
 
     monkeypatch.setattr("src.dao.statistique_dao.DBConnection", lambda: FakeDB())
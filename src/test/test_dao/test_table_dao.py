@@ -18,7 +18,7 @@ def test_obtenir_joueurs_tables_ok(dao):
     mock_connection.cursor.return_value.__enter__.return_value = mock_cursor
     
     with patch("src.dao.table_dao.DBConnection") as mock_db:
-        mock_db.return_value.connection.__enter__.return_value = mock_connection
+        mock_db.return_value.connexion.return_value.__enter__.return_value = mock_connection
 
         result = dao.obtenir_joueurs_tables(1)
 
@@ -30,7 +30,7 @@ def test_obtenir_joueurs_tables_ok(dao):
 def test_obtenir_joueurs_tables_exception(dao):
     # Simuler une exception lors de l'accès à la DB
     with patch("src.dao.table_dao.DBConnection") as mock_db:
-        mock_db.return_value.connection.__enter__.side_effect = Exception("DB error")
+        mock_db.return_value.connexion.return_value.__enter__.side_effect = Exception("DB error")
         with pytest.raises(Exception, match="DB error"):
             dao.obtenir_joueurs_tables(1)
 
@@ -0,0 +1,49 @@
+import asyncio
+
+from src.api.demarrage import Demarrage
+
+
+def _lancer(etapes):
+    demarrage = Demarrage()
+
+    async def scenario():
+        await demarrage.lancer(etapes)
+
+    asyncio.run(scenario())
+    return demarrage
+
+
+def test_pas_pret_avant_lancement():
+    assert Demarrage().pret() is False
+
+
+def test_etapes_executees_dans_l_ordre():
+    ordre = []
+    demarrage = _lancer([
+        ("a", lambda: ordre.append("a") or 1, True),
+        ("b", lambda: ordre.append("b") or 2, True),
+    ])
+    assert ordre == ["a", "b"]
+    assert demarrage.pret() is True
+    assert demarrage.etapes["b"]["resultat"] == 2
+    assert demarrage.etapes["a"]["duree_s"] >= 0
+
+
+def test_echec_obligatoire_bloque_la_disponibilite():
+    def echoue():
+        raise RuntimeError("base indisponible")
+
+    demarrage = _lancer([("base", echoue, True), ("tables", lambda: 10, True)])
+    assert demarrage.pret() is False
+    assert demarrage.etapes["base"]["erreur"] == "base indisponible"
+    # l'étape suivante est tout de même exécutée
+    assert demarrage.etapes["tables"]["statut"] == "ok"
+
+
+def test_echec_facultatif_n_empeche_pas_d_etre_pret():
+    def echoue():
+        raise RuntimeError("crédit impossible")
+
+    demarrage = _lancer([("tables", lambda: 10, True), ("credit", echoue, False)])
+    assert demarrage.pret() is True
+    assert demarrage.rapport()["etapes"]["credit"]["statut"] == "echec"
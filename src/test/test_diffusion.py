@@ -0,0 +1,75 @@
+import asyncio
+import json
+
+from src.api.diffusion import flux_etat, evenement_sse
+from src.business_object.partie import Partie
+from src.business_object.joueurs import Joueur
+from src.business_object.table import Table
+from src.service.table_service import TableService
+
+
+def _partie():
+    table = Table(id=1)
+    table.ajouter_joueur(Joueur("Alice", solde=100))
+    table.ajouter_joueur(Joueur("Bob", solde=100))
+    partie = Partie(id=1, table=table)
+    partie.initialiser_blinds()
+    return partie
+
+
+def _donnees(evenement: str) -> dict:
+    ligne = next(l for l in evenement.splitlines() if l.startswith("data: "))
+    return json.loads(ligne[len("data: "):])
+
+
+def test_evenement_sse_format():
+    evenement = evenement_sse({"version": 7, "pot": 30})
+    assert evenement.startswith("id: 7\nevent: etat\n")
+    assert evenement.endswith("\n\n")
+    assert _donnees(evenement) == {"version": 7, "pot": 30}
+
+
+def test_flux_envoie_etat_courant_puis_changements():
+    partie = _partie()
+
+    async def scenario():
+        flux = flux_etat(partie, delai_maintien=0.01)
+        initial = _donnees(await flux.__anext__())
+        # sans changement : commentaire de maintien de connexion
+        assert await flux.__anext__() == ": maintien\n\n"
+
+        partie.actions_joueur(partie.etat.joueur_courant, "suivre")
+        suivant = _donnees(await flux.__anext__())
+        await flux.aclose()
+        return initial, suivant
+
+    initial, suivant = asyncio.run(scenario())
+    assert suivant["version"] == initial["version"] + 1
+    # le générateur fermé se désabonne de la partie
+    assert partie._abonnes == []
+
+
+def test_flux_termine_a_la_fermeture_de_la_table():
+    TableService._instances = {}
+    tables = TableService(niveaux={20: 1}, places_max=2)
+    alice, bob = Joueur("Alice", solde=100), Joueur("Bob", solde=100)
+    tables.tables[1].ajouter_joueur(alice)
+    tables.tables[1].ajouter_joueur(bob)
+    # la table 1 est pleine : la table 2 est ouverte en plus
+    partie = tables.parties[2]
+    tables.tables[1].supprimer_joueur(bob)
+
+    async def scenario():
+        flux = flux_etat(partie, delai_maintien=0.01, tables_service=tables)
+        await flux.__anext__()
+        assert tables.nettoyer_tables_inactives(delai=0) == [2]
+        evenements = [e async for e in flux]
+        return evenements
+
+    evenements = asyncio.run(scenario())
+    TableService._instances = {}
+    # le flux s'arrête de lui-même sur l'événement de fermeture
+    assert evenements[-1].startswith("event: fermee\n")
+    assert json.loads(evenements[-1].split("data: ")[1]) == {"id_partie": 2}
+    # le flux terminé ne retient plus la partie
+    assert partie._abonnes == [] and tables._fermetures == []
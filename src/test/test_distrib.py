@@ -98,3 +98,38 @@ def test_distribuer_river_un_joueur():
     # La river ne doit pas être distribuée
     assert d.river is None
     assert d.tour_actuel == "preflop"
+
+
+def test_deck_melange_au_premier_tirage(joueurs):
+    d = Distrib(joueurs=joueurs)
+    assert len(d.deck.cartes) == 0
+    d.distribuer_mains()
+    assert len(d.deck.cartes) == 52 - 2 * len(joueurs)
+
+
+def test_resultat_suit_chaque_carte_du_board(distrib):
+    from src.business_object.evaluateur import EvaluateurMain
+
+    distrib.distribuer_mains()
+    joueur = distrib.joueurs[0]
+    assert distrib.resultat(joueur.pseudo) is None
+
+    board = []
+    for distribuer, nouvelles in (
+        (distrib.distribuer_flop, lambda: distrib.flop),
+        (distrib.distribuer_turn, lambda: [distrib.turn]),
+        (distrib.distribuer_river, lambda: [distrib.river]),
+    ):
+        distribuer()
+        board += nouvelles()
+        attendu = EvaluateurMain(joueur.main + board).evalue_main()
+        assert distrib.resultat(joueur.pseudo).cle == attendu.cle
+        assert distrib.resultat(joueur.pseudo, joueur.main + board).cle == attendu.cle
+
+
+def test_resultat_refuse_des_cartes_differentes(distrib):
+    distrib.distribuer_mains()
+    distrib.distribuer_flop()
+    joueur, autre = distrib.joueurs[:2]
+    assert distrib.resultat(joueur.pseudo, autre.main + distrib.flop) is None
+    assert distrib.resultat("inconnu") is None
@@ -0,0 +1,206 @@
+import random
+
+import numpy as np
+import pytest
+
+from src.business_object.cartes import Carte, valeurs, couleurs
+from src.business_object.equite import CalculateurEquite
+from src.business_object.equite_preflop import (
+    NB_MAINS, TableEquitePreflop, calculer_equites, cartes_representantes, conseiller,
+    ecrire_table, indice_main, nom_main
+)
+from src.business_object.evaluateur_tables import rang_ids
+from src.business_object.evaluateur_vectorise import rangs_mains
+from src.business_object.joueurs import Joueur
+from src.business_object.partie import Partie
+from src.business_object.table import Table
+from src.service.equite_service import EquiteService
+
+
+def carte(valeur, couleur):
+    """Créer une carte."""
+    return Carte(valeur=valeur, couleur=couleur)
+
+
+@pytest.mark.parametrize("nb_cartes", [5, 6, 7])
+def test_rangs_mains_identiques_a_rang_ids(nb_cartes):
+    rng = random.Random(7)
+    mains = [rng.sample(range(52), nb_cartes) for _ in range(3000)]
+    rangs = rangs_mains(np.array(mains))
+    assert rangs.tolist() == [rang_ids(main) for main in mains]
+
+
+def test_equite_river_deterministe():
+    board = [
+        carte(valeurs.DEUX, couleurs.COEUR),
+        carte(valeurs.SEPT, couleurs.PIQUE),
+        carte(valeurs.NEUF, couleurs.CARREAU),
+        carte(valeurs.VALET, couleurs.TREFLE),
+        carte(valeurs.QUATRE, couleurs.COEUR),
+    ]
+    as_ = [carte(valeurs.AS, couleurs.PIQUE), carte(valeurs.AS, couleurs.COEUR)]
+    rois = [carte(valeurs.ROI, couleurs.PIQUE), carte(valeurs.ROI, couleurs.COEUR)]
+    resultat = CalculateurEquite().calculer([as_, rois], board)
+    assert resultat["mode"] == "exact"
+    assert resultat["nb_tirages"] == 1
+    assert resultat["mains"][0]["victoire"] == 100
+    assert resultat["mains"][1]["defaite"] == 100
+
+
+def test_equite_turn_exacte():
+    # 5 rivers (parmi 44) font gagner la seconde main : 2 Rois (brelan) et 3 Dames (double paire)
+    board = [
+        carte(valeurs.DEUX, couleurs.COEUR),
+        carte(valeurs.SEPT, couleurs.PIQUE),
+        carte(valeurs.NEUF, couleurs.CARREAU),
+        carte(valeurs.ROI, couleurs.TREFLE),
+    ]
+    as_ = [carte(valeurs.AS, couleurs.PIQUE), carte(valeurs.AS, couleurs.COEUR)]
+    rois = [carte(valeurs.ROI, couleurs.PIQUE), carte(valeurs.DAME, couleurs.COEUR)]
+    resultat = CalculateurEquite().calculer([as_, rois], board)
+    assert resultat["mode"] == "exact"
+    assert resultat["nb_tirages"] == 44
+    assert resultat["mains"][1]["victoire"] == round(5 / 44 * 100, 2)
+
+
+def test_equite_partage_egalite():
+    board = [
+        carte(valeurs.DIX, couleurs.COEUR),
+        carte(valeurs.VALET, couleurs.COEUR),
+        carte(valeurs.DAME, couleurs.COEUR),
+        carte(valeurs.ROI, couleurs.COEUR),
+        carte(valeurs.AS, couleurs.COEUR),
+    ]
+    main1 = [carte(valeurs.DEUX, couleurs.PIQUE), carte(valeurs.TROIS, couleurs.PIQUE)]
+    main2 = [carte(valeurs.DEUX, couleurs.TREFLE), carte(valeurs.TROIS, couleurs.TREFLE)]
+    resultat = CalculateurEquite().calculer([main1, main2], board)
+    assert resultat["mains"][0] == {"victoire": 0, "egalite": 100, "defaite": 0, "equite": 50}
+
+
+def test_equite_monte_carlo_preflop():
+    as_ = [carte(valeurs.AS, couleurs.PIQUE), carte(valeurs.AS, couleurs.COEUR)]
+    rois = [carte(valeurs.ROI, couleurs.CARREAU), carte(valeurs.ROI, couleurs.TREFLE)]
+    resultat = CalculateurEquite(nb_tirages=40000, graine=1).calculer([as_, rois], [])
+    assert resultat["mode"] == "monte_carlo"
+    assert resultat["nb_tirages"] == 40000
+    # AA contre KK : environ 82 % d'équité
+    assert 80 < resultat["mains"][0]["equite"] < 84
+    total = sum(resultat["mains"][0][k] for k in ("victoire", "egalite", "defaite"))
+    assert total == pytest.approx(100)
+
+
+def test_equite_carte_en_double():
+    as_ = [carte(valeurs.AS, couleurs.PIQUE), carte(valeurs.AS, couleurs.COEUR)]
+    with pytest.raises(ValueError):
+        CalculateurEquite().calculer([as_, as_], [])
+
+
+def test_equite_partie_a_tapis():
+    table = Table(id=1, blind=20)
+    partie = Partie(id=1, table=table)
+    alice, bob = Joueur("alice", 0), Joueur("bob", 0)
+    alice.main = [carte(valeurs.AS, couleurs.PIQUE), carte(valeurs.AS, couleurs.COEUR)]
+    bob.main = [carte(valeurs.ROI, couleurs.PIQUE), carte(valeurs.ROI, couleurs.COEUR)]
+    table.joueurs = [alice, bob]
+    table.board = [
+        carte(valeurs.DEUX, couleurs.TREFLE),
+        carte(valeurs.SEPT, couleurs.PIQUE),
+        carte(valeurs.NEUF, couleurs.CARREAU),
+        carte(valeurs.VALET, couleurs.TREFLE),
+    ]
+    fait, equite, _ = EquiteService().equite_partie(partie, nb_cartes_board=3)
+    assert fait
+    assert equite["mode"] == "exact"
+    assert len(equite["board"]) == 3
+    assert equite["joueurs"]["alice"]["equite"] > 90
+
+
+def test_equite_partie_refusee_si_joueur_peut_agir():
+    table = Table(id=1, blind=20)
+    partie = Partie(id=1, table=table)
+    partie.etat.finie = False
+    alice, bob = Joueur("alice", 100), Joueur("bob", 0)
+    alice.main = [carte(valeurs.AS, couleurs.PIQUE), carte(valeurs.AS, couleurs.COEUR)]
+    bob.main = [carte(valeurs.ROI, couleurs.PIQUE), carte(valeurs.ROI, couleurs.COEUR)]
+    table.joueurs = [alice, bob]
+    fait, equite, message = EquiteService().equite_partie(partie)
+    assert not fait
+    assert equite is None
+    assert "tapis" in message
+
+
+def test_indices_mains_de_depart():
+    noms = [nom_main(i) for i in range(NB_MAINS)]
+    assert len(set(noms)) == NB_MAINS
+    for i in range(NB_MAINS):
+        id1, id2 = cartes_representantes(i)
+        assert indice_main(Carte.depuis_id(id1), Carte.depuis_id(id2)) == i
+    assert nom_main(indice_main(carte(valeurs.AS, couleurs.PIQUE), carte(valeurs.ROI, couleurs.PIQUE))) == "AKs"
+    assert nom_main(indice_main(carte(valeurs.DEUX, couleurs.PIQUE), carte(valeurs.SEPT, couleurs.COEUR))) == "72o"
+
+
+def test_table_preflop_ecrite_puis_relue(tmp_path):
+    chemin = str(tmp_path / "equite.bin")
+    equites = [[i / 10, 50.0, 33.33, 25.0] for i in range(NB_MAINS)]
+    ecrire_table(chemin, equites, nb_tirages=123)
+    table = TableEquitePreflop(chemin)
+    assert table.nb_tirages == 123
+    assert table.equite_indice(168, 1) == 16.8
+    assert table.equite_indice(5, 3) == 33.33
+    with pytest.raises(ValueError):
+        table.equite_indice(5, 5)
+
+
+def test_table_preflop_tronquee(tmp_path):
+    chemin = tmp_path / "equite.bin"
+    ecrire_table(str(chemin), [[50.0] * 4] * NB_MAINS, nb_tirages=1)
+    chemin.write_bytes(chemin.read_bytes()[:-2])
+    with pytest.raises(ValueError):
+        TableEquitePreflop(str(chemin))
+
+
+def test_table_preflop_livree_coherente():
+    table = TableEquitePreflop.partagee()
+    as_ = [carte(valeurs.AS, couleurs.PIQUE), carte(valeurs.AS, couleurs.COEUR)]
+    sept_deux = [carte(valeurs.SEPT, couleurs.PIQUE), carte(valeurs.DEUX, couleurs.COEUR)]
+    assert 84 < table.equite(as_, 1) < 86.5
+    assert table.equite(sept_deux, 1) < 36
+    # plus il y a d'adversaires, moins une main gagne souvent
+    assert [table.equite(as_, n) for n in range(1, 5)] == sorted(
+        (table.equite(as_, n) for n in range(1, 5)), reverse=True
+    )
+
+
+def test_calculer_equites_proche_de_la_table_livree():
+    indice = indice_main(carte(valeurs.AS, couleurs.PIQUE), carte(valeurs.AS, couleurs.COEUR))
+    equites = calculer_equites(indice, nb_tirages=4000, graine=1)
+    livree = TableEquitePreflop.partagee()
+    for n, equite in enumerate(equites, start=1):
+        assert abs(equite - livree.equite_indice(indice, n)) < 3
+
+
+def test_conseiller():
+    assert conseiller(85.0, 1, 20, 30)["conseil"] == "relancer"
+    assert conseiller(45.0, 1, 10, 30)["conseil"] == "suivre"
+    refus = conseiller(30.0, 1, 100, 30)
+    assert refus["conseil"] == "se_coucher"
+    assert refus["cote"] == round(100 * 100 / 130, 2)
+
+
+def test_conseil_preflop_partie():
+    alice, bob = Joueur("alice", 1000), Joueur("bob", 1000)
+    table = Table(id=1, blind=20)
+    table.ajouter_joueur(alice)
+    table.ajouter_joueur(bob)
+    partie = Partie(id=1, table=table)
+    partie.initialiser_blinds()
+    alice.main = [carte(valeurs.AS, couleurs.PIQUE), carte(valeurs.AS, couleurs.COEUR)]
+
+    fait, conseil, _ = EquiteService().conseil_preflop(partie, "alice")
+    assert fait
+    assert conseil["main"] == "AA"
+    assert conseil["nb_adversaires"] == 1
+    assert conseil["conseil"] == "relancer"
+
+    fait, conseil, message = EquiteService().conseil_preflop(partie, "inconnu")
+    assert not fait and conseil is None
@@ -314,3 +314,147 @@ def test_quinte_basse_as():
     # convertir les valeurs numériques en enums pour comparer
     straight_enums = set(evaluateur._numerique_to_enum(v) for v in straight_vals)
     assert straight_enums == {valeurs.AS, valeurs.DEUX, valeurs.TROIS, valeurs.QUATRE, valeurs.CINQ}
+
+
+def test_moteur_inconnu():
+    cartes = [carte(v, couleurs.COEUR) for v in list(valeurs)[:5]]
+    with pytest.raises(ValueError):
+        EvaluateurMain(cartes, moteur="inexistant")
+
+
+def test_moteur_tables_meme_combinaison_que_classique():
+    import random
+    from src.business_object.cartes import Deck
+
+    random.seed(42)
+    deck = Deck()
+    deck.remplir()
+    for _ in range(2000):
+        cartes = random.sample(deck.cartes, 5)
+        tables = EvaluateurMain(cartes, moteur="tables").evalue_main()
+        classique = EvaluateurMain(cartes, moteur="classique").evalue_main()
+        assert tables.combinaison == classique.combinaison
+
+
+def test_moteur_tables_double_brelan_donne_full():
+    cartes = [
+        carte(valeurs.TROIS, couleurs.COEUR),
+        carte(valeurs.TROIS, couleurs.PIQUE),
+        carte(valeurs.TROIS, couleurs.CARREAU),
+        carte(valeurs.CINQ, couleurs.TREFLE),
+        carte(valeurs.CINQ, couleurs.COEUR),
+        carte(valeurs.CINQ, couleurs.PIQUE),
+        carte(valeurs.ROI, couleurs.CARREAU)
+    ]
+    resultat = EvaluateurMain(cartes, moteur="tables").evalue_main()
+    assert resultat.combinaison == combinaisons.FULL
+    assert resultat.tiebreaker_cards == [valeurs.CINQ, valeurs.TROIS]
+
+
+def test_moteur_tables_quinte_basse_plus_faible():
+    quinte_basse = [
+        carte(valeurs.AS, couleurs.COEUR),
+        carte(valeurs.DEUX, couleurs.PIQUE),
+        carte(valeurs.TROIS, couleurs.CARREAU),
+        carte(valeurs.QUATRE, couleurs.TREFLE),
+        carte(valeurs.CINQ, couleurs.COEUR)
+    ]
+    quinte_six = [
+        carte(valeurs.SIX, couleurs.COEUR),
+        carte(valeurs.DEUX, couleurs.PIQUE),
+        carte(valeurs.TROIS, couleurs.CARREAU),
+        carte(valeurs.QUATRE, couleurs.TREFLE),
+        carte(valeurs.CINQ, couleurs.COEUR)
+    ]
+    main1 = EvaluateurMain(quinte_basse, moteur="tables").evalue_main()
+    main2 = EvaluateurMain(quinte_six, moteur="tables").evalue_main()
+    assert main1.combinaison == combinaisons.QUINTE
+    assert main1.rang < main2.rang
+    assert EvaluateurMain.comparer_mains(main1, main2) == -1
+
+
+def test_moteur_tables_rang_coherent_avec_comparer_mains():
+    cartes1 = [
+        carte(valeurs.AS, couleurs.COEUR),
+        carte(valeurs.AS, couleurs.PIQUE),
+        carte(valeurs.ROI, couleurs.CARREAU),
+        carte(valeurs.CINQ, couleurs.TREFLE),
+        carte(valeurs.SEPT, couleurs.COEUR)
+    ]
+    cartes2 = [
+        carte(valeurs.AS, couleurs.CARREAU),
+        carte(valeurs.AS, couleurs.TREFLE),
+        carte(valeurs.DAME, couleurs.CARREAU),
+        carte(valeurs.CINQ, couleurs.PIQUE),
+        carte(valeurs.SEPT, couleurs.PIQUE)
+    ]
+    main1 = EvaluateurMain(cartes1).evalue_main()
+    main2 = EvaluateurMain(cartes2).evalue_main()
+    assert main1.rang > main2.rang
+    assert EvaluateurMain.comparer_mains(main1, main2) == 1
+    assert main1.tiebreaker_cards == [valeurs.AS, valeurs.ROI, valeurs.SEPT, valeurs.CINQ]
+
+
+def test_cle_identique_entre_moteurs():
+    mains = [
+        [carte(valeurs.AS, couleurs.COEUR), carte(valeurs.DEUX, couleurs.PIQUE),
+         carte(valeurs.TROIS, couleurs.CARREAU), carte(valeurs.QUATRE, couleurs.TREFLE),
+         carte(valeurs.CINQ, couleurs.COEUR), carte(valeurs.ROI, couleurs.PIQUE)],
+        [carte(valeurs.SEPT, couleurs.COEUR), carte(valeurs.SEPT, couleurs.PIQUE),
+         carte(valeurs.CINQ, couleurs.CARREAU), carte(valeurs.CINQ, couleurs.TREFLE),
+         carte(valeurs.AS, couleurs.COEUR), carte(valeurs.DEUX, couleurs.COEUR)],
+        [carte(valeurs.DIX, couleurs.COEUR), carte(valeurs.VALET, couleurs.COEUR),
+         carte(valeurs.DAME, couleurs.COEUR), carte(valeurs.ROI, couleurs.COEUR),
+         carte(valeurs.NEUF, couleurs.COEUR), carte(valeurs.DEUX, couleurs.PIQUE)],
+    ]
+    for cartes in mains:
+        tables = EvaluateurMain(cartes, moteur="tables").evalue_main()
+        classique = EvaluateurMain(cartes, moteur="classique").evalue_main()
+        assert tables.cle == classique.cle
+
+
+def test_classer_mains_ordre_complet_et_egalites():
+    board = [
+        carte(valeurs.DIX, couleurs.COEUR),
+        carte(valeurs.NEUF, couleurs.CARREAU),
+        carte(valeurs.HUIT, couleurs.TREFLE),
+        carte(valeurs.DEUX, couleurs.PIQUE),
+        carte(valeurs.TROIS, couleurs.PIQUE),
+    ]
+    mains = {
+        "alice": [carte(valeurs.VALET, couleurs.PIQUE), carte(valeurs.SEPT, couleurs.PIQUE)],
+        "bob": [carte(valeurs.AS, couleurs.TREFLE), carte(valeurs.QUATRE, couleurs.COEUR)],
+        "chloe": [carte(valeurs.AS, couleurs.CARREAU), carte(valeurs.QUATRE, couleurs.TREFLE)],
+        "david": [carte(valeurs.DIX, couleurs.PIQUE), carte(valeurs.CINQ, couleurs.COEUR)],
+    }
+    classement, resultats = EvaluateurMain.classer_mains(
+        {pseudo: cartes + board for pseudo, cartes in mains.items()}
+    )
+    # quinte, puis paire de dix, puis bob et chloe à égalité (hauteur As)
+    assert classement == [["alice"], ["david"], ["bob", "chloe"]]
+    assert resultats["alice"].combinaison == combinaisons.QUINTE
+    assert resultats["bob"].cle == resultats["chloe"].cle
+
+
+def test_main_incrementale_identique_a_l_evaluation_complete():
+    import random
+    from src.business_object import evaluateur_tables
+    from src.business_object.evaluateur_tables import MainIncrementale
+
+    rng = random.Random(3)
+    for _ in range(300):
+        ids = rng.sample(range(52), 7)
+        main = MainIncrementale(ids[:2])
+        assert main.rang is None
+        for n in range(3, 8):
+            main.ajouter(ids[n - 1])
+            if n >= 5:
+                assert main.rang == evaluateur_tables.rang_ids(ids[:n])
+
+
+def test_main_incrementale_limitee_a_sept_cartes():
+    from src.business_object.evaluateur_tables import MainIncrementale
+
+    main = MainIncrementale(range(7))
+    with pytest.raises(ValueError):
+        main.ajouter(8)
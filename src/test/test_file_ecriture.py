@@ -0,0 +1,87 @@
+import asyncio
+import threading
+
+import pytest
+
+from src.dao.file_ecriture import FileEcriture
+from src.api import var_utiles
+from src.api.var_utiles import oublier_verrou, verrou_table
+
+
+def test_soumettre_execute_dans_l_ordre():
+    file = FileEcriture()
+    ordre = []
+    futurs = [file.soumettre(ordre.append, i) for i in range(50)]
+    assert file.attendre(timeout=5)
+    assert ordre == list(range(50))
+    assert all(f.done() for f in futurs)
+    assert file.en_attente() == 0
+
+
+def test_soumettre_hors_thread_appelant():
+    thread_appelant = threading.get_ident()
+    futur = FileEcriture().soumettre(threading.get_ident)
+    assert futur.result(timeout=5) != thread_appelant
+
+
+def test_exception_transmise_au_futur_sans_arreter_la_file():
+    file = FileEcriture()
+
+    def echoue():
+        raise RuntimeError("base indisponible")
+
+    futur = file.soumettre(echoue)
+    with pytest.raises(RuntimeError):
+        futur.result(timeout=5)
+    assert file.soumettre(lambda: 42).result(timeout=5) == 42
+
+
+def test_attendre_expire():
+    file = FileEcriture()
+    debloque = threading.Event()
+    file.soumettre(debloque.wait, 5)
+    assert file.attendre(timeout=0.05) is False
+    debloque.set()
+    assert file.attendre(timeout=5) is True
+
+
+def test_verrou_table_unique_par_table(monkeypatch):
+    monkeypatch.setattr(var_utiles, "verrous_tables", {})
+    assert verrou_table(1) is verrou_table(1)
+    assert verrou_table(1) is not verrou_table(2)
+
+
+def test_verrou_table_inconnue(monkeypatch):
+    monkeypatch.setattr(var_utiles, "verrous_tables", {})
+    with pytest.raises(KeyError):
+        verrou_table(10_000)
+    assert var_utiles.verrous_tables == {}
+
+
+def test_verrou_oublie_a_la_fermeture(monkeypatch):
+    verrous = {}
+    monkeypatch.setattr(var_utiles, "verrous_tables", verrous)
+    verrou_table(1)
+    oublier_verrou(1)
+    assert verrous == {}
+    assert var_utiles.oublier_verrou in var_utiles.tables_service._fermetures
+
+
+def test_verrou_table_serialise_les_actions(monkeypatch):
+    monkeypatch.setattr(var_utiles, "verrous_tables", {})
+    journal = []
+
+    async def action(id_table, nom):
+        async with verrou_table(id_table):
+            journal.append(("debut", nom))
+            await asyncio.sleep(0.01)
+            journal.append(("fin", nom))
+
+    async def scenario():
+        await asyncio.gather(action(1, "a"), action(1, "b"), action(2, "c"))
+
+    asyncio.run(scenario())
+    # sur la table 1, b ne commence qu'une fois a terminé ; la table 2 n'attend pas
+    table_1 = [e for e in journal if e[1] in ("a", "b")]
+    assert table_1 == [("debut", "a"), ("fin", "a"), ("debut", "b"), ("fin", "b")]
+    assert journal.index(("debut", "c")) < journal.index(("fin", "a"))
@@ -1,10 +1,12 @@
+import threading
+import time
 import pytest
 from unittest.mock import patch, MagicMock
 from src.service.joueur_service import JoueurService
 from src.business_object.joueurs import Joueur  
 from src.service.connexion_service import ConnexionService
 from src.service.statistique_service import StatistiqueService
-from src.service.table_service import TableService
+from src.service.table_service import RegistreParesseux, TableService
 
 @pytest.fixture
 def service_table():
@@ -90,10 +92,15 @@ def test_generer_code_parrainage_existant(service):
 def test_credit_auto(service):
     with patch("src.service.joueur_service.JoueurDao") as mock_dao, \
          patch("src.service.joueur_service.logging") as mock_logging:
-        mock_dao.return_value.joueurs_a_crediter.return_value = ["Alice"]
-        service.credit_auto()
-        mock_dao.return_value.crediter.assert_called_with("Alice", service.MONTANT_RECHARGEMENT_AUTO)
-        mock_dao.return_value.maj_date_credit_auto.assert_called_with("Alice")
+        mock_dao.return_value.crediter_auto_lot.return_value = ["Alice"]
+        bilan = service.credit_auto()
+        mock_dao.return_value.crediter_auto_lot.assert_called_once_with(
+            service.MONTANT_RECHARGEMENT_AUTO, service.SEUIL_RECHARGEMENT_AUTO,
+            service.TAILLE_LOT_RECHARGEMENT_AUTO
+        )
+        mock_dao.return_value.crediter.assert_not_called()
+        assert bilan["nb_credites"] == 1
+        assert bilan["nb_lots"] == 1
 
 def test_creer_sans_code_parrainage_pseudo_existant(service):
     with patch.object(service, "pseudo_deja_utilise", return_value=True):
@@ -110,12 +117,22 @@ def test_creer_sans_code_parrainage_dao_echec(service):
 def test_credit_auto_plusieurs_joueurs(service):
     with patch("src.service.joueur_service.JoueurDao") as mock_dao, \
          patch("src.service.joueur_service.logging") as mock_logging:
-        mock_dao.return_value.joueurs_a_crediter.return_value = ["Alice", "Bob"]
-        service.credit_auto()
-        mock_dao.return_value.crediter.assert_any_call("Alice", service.MONTANT_RECHARGEMENT_AUTO)
-        mock_dao.return_value.crediter.assert_any_call("Bob", service.MONTANT_RECHARGEMENT_AUTO)
-        mock_dao.return_value.maj_date_credit_auto.assert_any_call("Alice")
-        mock_dao.return_value.maj_date_credit_auto.assert_any_call("Bob")
+        # lots pleins tant qu'il reste des joueurs, puis un lot incomplet
+        mock_dao.return_value.crediter_auto_lot.side_effect = [["Alice", "Bob"], ["Chloe"]]
+        bilan = service.credit_auto(taille_lot=2)
+        assert mock_dao.return_value.crediter_auto_lot.call_count == 2
+        assert bilan["nb_credites"] == 3
+        assert bilan["nb_lots"] == 2
+        assert bilan["duree_s"] >= 0
+
+
+def test_credit_auto_aucun_joueur(service):
+    with patch("src.service.joueur_service.JoueurDao") as mock_dao, \
+         patch("src.service.joueur_service.logging") as mock_logging:
+        mock_dao.return_value.crediter_auto_lot.return_value = []
+        bilan = service.credit_auto()
+        assert bilan["nb_credites"] == 0
+        mock_logging.info.assert_called_with("Aucun joueur à créditer")
 
 def test_generer_code_parrainage_aucun_joueur(service):
     with patch("service.joueur_service.JoueurDao") as mock_dao, \
@@ -283,6 +300,15 @@ def test_etat_tables(service_table):
     assert len(etat) == 2
     assert all("table" in t and "blind" in t and "joueurs" in t for t in etat)
 
+def test_lister_tables_ne_cree_pas_les_tables(service_table):
+    service_table.tables[1].joueurs.append(Joueur("Alice", 1000))
+    tables = service_table.lister_tables()
+    etat = service_table.etat_tables()
+    assert [t["nb_joueurs"] for t in tables] == [1, 0]
+    assert [e["joueurs"] for e in etat] == [["Alice"], []]
+    # la table 2 n'a jamais été utilisée : elle n'est toujours pas créée
+    assert not service_table.tables.creee(2)
+
 def test_get_table(service_table):
     table = service_table.get_table(1)
     assert table is not None
@@ -313,4 +339,92 @@ def test_se_connecter():
 
         # Vérifier que la connexion a réussi
         assert success is True
-        assert joueur["pseudo"] == "Alice"
\ No newline at end of file
+        assert joueur["pseudo"] == "Alice"
+
+def test_tables_creees_a_la_demande(service_table):
+    assert len(service_table.parties) == 0
+    partie = service_table.parties.get(2)
+    assert partie is service_table.parties[2]
+    assert partie.table is service_table.tables[2]
+    assert service_table.parties.get(3) is None
+    assert len(service_table.parties) == 1
+
+
+def test_registre_paresseux_une_creation_par_cle():
+    depart = threading.Barrier(2)
+    creations = []
+
+    def fabrique(cle):
+        creations.append(cle)
+        time.sleep(0.01)
+        return object()
+
+    registre = RegistreParesseux({1: 20}, fabrique)
+    lus = []
+
+    def lire():
+        depart.wait()
+        lus.append(registre[1])
+
+    fils = [threading.Thread(target=lire) for _ in range(2)]
+    for f in fils:
+        f.start()
+    for f in fils:
+        f.join()
+    # les deux fils reçoivent le même objet, créé une seule fois
+    assert creations == [1]
+    assert lus[0] is lus[1] is registre.creer(1)
+
+
+def test_prechauffer_tables(service_table):
+    assert service_table.prechauffer() == 2
+    assert service_table.parties.creee(1) and service_table.parties.creee(2)
+
+
+@pytest.fixture
+def service_niveaux():
+    TableService._instances = {}
+    return TableService(niveaux={20: 1, 50: 1}, places_max=2)
+
+
+def test_niveaux_initiaux(service_niveaux):
+    assert service_niveaux.nb_tables == 2
+    assert service_niveaux.parties[2].GROSSE_BLIND == 50
+    assert [n["blind"] for n in service_niveaux.occupation_niveaux()] == [20, 50]
+
+
+def test_table_ouverte_quand_niveau_plein(service_niveaux):
+    table = service_niveaux.tables[1]
+    table.ajouter_joueur(Joueur("Alice", 1000))
+    assert service_niveaux.nb_tables == 2
+    table.ajouter_joueur(Joueur("Bob", 1000))
+    # la seule table à 20 est pleine : une nouvelle est ouverte
+    assert service_niveaux.nb_tables == 3
+    assert service_niveaux.table_disponible(20) == 3
+    assert service_niveaux.tables[3].blind == 20
+    niveau_20 = service_niveaux.occupation_niveaux()[0]
+    assert niveau_20 == {"blind": 20, "tables": 2, "joueurs": 2, "places": 4, "tables_libres": 1}
+
+
+def test_nettoyer_tables_inactives(service_niveaux):
+    fermees = []
+    service_niveaux.abonner_fermeture(fermees.append)
+    table = service_niveaux.tables[1]
+    alice, bob = Joueur("Alice", 1000), Joueur("Bob", 1000)
+    table.ajouter_joueur(alice)
+    table.ajouter_joueur(bob)
+    # la table 3 ouverte en plus reste la seule libre : elle est gardée
+    assert service_niveaux.nettoyer_tables_inactives(delai=0) == []
+    table.supprimer_joueur(bob)
+    assert service_niveaux.nettoyer_tables_inactives(delai=0) == [3]
+    assert service_niveaux.get_table(3) is None
+    assert fermees == [3]
+    # les tables initiales ne sont jamais fermées
+    table.supprimer_joueur(alice)
+    assert service_niveaux.nettoyer_tables_inactives(delai=0) == []
+    assert service_niveaux.occupation_niveaux()[0]["tables"] == 1
+
+
+def test_niveaux_depuis_env(monkeypatch):
+    monkeypatch.setenv("TABLES_NIVEAUX", "20:10,50:4")
+    assert TableService.niveaux_depuis_env() == {20: 10, 50: 4}
@@ -0,0 +1,136 @@
+import asyncio
+
+import pytest
+from unittest.mock import patch
+
+from src.business_object.joueurs import Joueur
+from src.service.table_service import TableService
+from src.service.matchmaking_service import MatchmakingService
+from src.scheduler.nettoyage_tables import nettoyer_tables
+
+
+@pytest.fixture
+def tables():
+    TableService._instances = {}
+    service = TableService(niveaux={20: 2, 50: 1}, places_max=3)
+    yield service
+    TableService._instances = {}
+
+
+@pytest.fixture
+def matchmaking(tables):
+    MatchmakingService._instances = {}
+    with patch("src.service.table_service.JoueurDao") as mock_dao:
+        mock_dao.return_value.valeur_portefeuille.return_value = 1000
+        yield MatchmakingService(tables)
+    MatchmakingService._instances = {}
+
+
+def rejoindre(matchmaking, pseudo, blind):
+    return asyncio.run(matchmaking.rejoindre_file(Joueur(pseudo, 1000), blind))
+
+
+def test_joueur_seul_rejoint_par_le_suivant(matchmaking):
+    premier = rejoindre(matchmaking, "Alice", 20)
+    second = rejoindre(matchmaking, "Bob", 20)
+    assert premier["statut"] == second["statut"] == "place"
+    # Bob rejoint Alice plutôt qu'une table vide : la partie peut démarrer
+    assert premier["id_table"] == second["id_table"] == 1
+
+
+def test_table_la_moins_chargee(matchmaking):
+    rejoindre(matchmaking, "Alice", 20)
+    rejoindre(matchmaking, "Bob", 20)
+    # la table 1 a deux joueurs, la table 2 est vide
+    assert rejoindre(matchmaking, "Carl", 20)["id_table"] == 2
+    assert rejoindre(matchmaking, "Dina", 20)["id_table"] == 2
+
+
+def test_blind_respectee(matchmaking, tables):
+    resultat = rejoindre(matchmaking, "Alice", 50)
+    assert tables.blinds_tables[resultat["id_table"]] == 50
+    assert rejoindre(matchmaking, "Bob", 100)["statut"] == "refuse"
+
+
+def test_file_attente_servie_dans_l_ordre(matchmaking, tables):
+    tables.TABLES_MAX_PAR_NIVEAU = 1
+    for pseudo in ("Alice", "Bob", "Carl"):
+        assert rejoindre(matchmaking, pseudo, 50)["statut"] == "place"
+    assert rejoindre(matchmaking, "Dina", 50)["position"] == 1
+    assert rejoindre(matchmaking, "Eric", 50)["position"] == 2
+    assert rejoindre(matchmaking, "Dina", 50)["statut"] == "en_attente"
+
+    tables.quitter_table("Alice", 3)
+    assert asyncio.run(matchmaking.servir_file()) == 1
+    assert rejoindre(matchmaking, "Dina", 50)["statut"] == "place"
+    assert rejoindre(matchmaking, "Eric", 50)["position"] == 1
+
+
+def test_quitter_file(matchmaking, tables):
+    tables.TABLES_MAX_PAR_NIVEAU = 1
+    for pseudo in ("Alice", "Bob", "Carl", "Dina"):
+        rejoindre(matchmaking, pseudo, 50)
+    assert asyncio.run(matchmaking.quitter_file("Dina")) is True
+    tables.quitter_table("Alice", 3)
+    assert asyncio.run(matchmaking.servir_file()) == 0
+
+
+def test_reequilibrer_joueurs_seuls(matchmaking, tables):
+    rejoindre(matchmaking, "Alice", 20)
+    tables.rejoindre_table("Bob", 2)
+    alice = tables.tables[1].joueur("Alice")
+    alice.solde = 1234
+    deplaces = asyncio.run(matchmaking.reequilibrer())
+    assert deplaces == [("Alice", 1, 2)]
+    assert [j.pseudo for j in tables.tables[2].joueurs] == ["Bob", "Alice"]
+    # le joueur garde ses jetons (moins sa blind de la nouvelle main) : il n'est pas relu en base
+    assert tables.tables[2].joueur("Alice") is alice
+    assert alice.solde + alice.mise == 1234
+    assert rejoindre(matchmaking, "Alice", 20)["id_table"] == 2
+    # les clients de la table quittée apprennent où est parti le joueur
+    assert tables.parties[1].etat_publie()["deplacements"] == {"Alice": 2}
+
+
+def test_reequilibrer_ignore_les_tables_choisies(matchmaking, tables):
+    tables.rejoindre_table("Alice", 1)
+    tables.rejoindre_table("Bob", 2)
+    assert asyncio.run(matchmaking.reequilibrer()) == []
+    assert tables.nb_joueurs(1) == tables.nb_joueurs(2) == 1
+
+
+def test_placement_attend_le_verrou_de_la_table(matchmaking, tables):
+    async def scenario():
+        verrou = matchmaking.verrou_table(1)
+        await verrou.acquire()
+        placement = asyncio.ensure_future(matchmaking.rejoindre_file(Joueur("Alice", 1000), 20))
+        await asyncio.sleep(0.01)
+        # la table 1 est verrouillée (une action y est en cours) : personne n'y est assis
+        assert tables.nb_joueurs(1) == 0
+        verrou.release()
+        return await placement
+
+    assert asyncio.run(scenario())["id_table"] == 1
+    assert tables.nb_joueurs(1) == 1
+
+
+def test_nettoyer_tables_sous_verrou(matchmaking, tables):
+    tables.TABLES_MAX_PAR_NIVEAU = 2
+    for pseudo in ("Alice", "Bob", "Carl"):
+        rejoindre(matchmaking, pseudo, 50)
+    # la table 3 est pleine : la table 4 est ouverte, puis Alice part
+    asyncio.run(matchmaking.quitter_file("Alice"))
+    tables.quitter_table("Alice", 3)
+    assert tables.tables_fermables(delai=0) == [4]
+
+    async def scenario():
+        verrou = matchmaking.verrou_table(4)
+        await verrou.acquire()
+        nettoyage = asyncio.ensure_future(
+            nettoyer_tables(tables, matchmaking.verrou_table, delai=0)
+        )
+        await asyncio.sleep(0.01)
+        assert 4 in tables.blinds_tables
+        verrou.release()
+        return await nettoyage
+
+    assert asyncio.run(scenario()) == [4]
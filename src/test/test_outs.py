@@ -0,0 +1,73 @@
+import pytest
+from src.business_object.cartes import Carte, valeurs, couleurs
+from src.business_object.joueurs import Joueur
+from src.business_object.outs import calculer_outs, statistiques_cache
+from src.business_object.partie import Partie
+from src.business_object.table import Table
+from src.service.outs_service import OutsService
+
+
+def carte(valeur, couleur):
+    """Créer une carte."""
+    return Carte(valeur=valeur, couleur=couleur)
+
+
+MAIN = [carte(valeurs.AS, couleurs.COEUR), carte(valeurs.ROI, couleurs.COEUR)]
+FLOP = [
+    carte(valeurs.DEUX, couleurs.COEUR),
+    carte(valeurs.SEPT, couleurs.COEUR),
+    carte(valeurs.NEUF, couleurs.PIQUE),
+]
+
+
+def test_outs_tirage_couleur_au_flop():
+    outs = calculer_outs(MAIN, FLOP)
+    assert outs["combinaison"] == "HAUTEUR"
+    assert outs["nb_cartes_inconnues"] == 47
+    # 9 coeurs pour la couleur ; pour la paire, 3 As, 3 Rois, 3 Deux, 3 Sept et 2 Neuf
+    # (le Neuf de coeur donne déjà la couleur)
+    assert outs["par_combinaison"] == {"COULEUR": 9, "PAIRE": 14}
+    assert outs["nb_outs"] == 23
+    assert outs["prochaine_carte"] == round(100 * 23 / 47, 2)
+    assert outs["prochaine_carte"] < outs["jusqu_a_la_river"] < 100
+
+
+def test_outs_a_la_turn():
+    outs = calculer_outs(MAIN, FLOP + [carte(valeurs.DIX, couleurs.TREFLE)])
+    assert outs["nb_cartes_inconnues"] == 46
+    assert outs["jusqu_a_la_river"] is None
+    assert {"carte": str(carte(valeurs.DAME, couleurs.COEUR)), "combinaison": "COULEUR"} in outs["outs"]
+
+
+def test_outs_gardes_en_cache():
+    calculer_outs(MAIN, FLOP)
+    avant = statistiques_cache()["succes"]
+    # même main et même board, dans un autre ordre
+    calculer_outs(MAIN[::-1], FLOP[::-1])
+    assert statistiques_cache()["succes"] == avant + 1
+
+
+def test_outs_entrees_invalides():
+    with pytest.raises(ValueError):
+        calculer_outs(MAIN, FLOP[:2])
+    with pytest.raises(ValueError):
+        calculer_outs(MAIN, FLOP + [MAIN[0]])
+
+
+def test_outs_service_seulement_au_flop_et_a_la_turn():
+    alice, bob = Joueur("alice", 1000), Joueur("bob", 1000)
+    table = Table(id=1, blind=20)
+    table.ajouter_joueur(alice)
+    table.ajouter_joueur(bob)
+    partie = Partie(id=1, table=table)
+    partie.initialiser_blinds()
+
+    fait, outs, message = OutsService().outs_joueur(partie, "alice")
+    assert not fait and outs is None
+
+    partie.actions_joueur("alice", "suivre")
+    partie.actions_joueur("bob", "suivre")
+    assert partie.tour_actuel == "flop"
+    fait, outs, _ = OutsService().outs_joueur(partie, "alice")
+    assert fait
+    assert outs["nb_cartes_inconnues"] == 47
@@ -1,8 +1,10 @@
+from collections import deque
 import pytest
-from src.business_object.partie import Partie
+from src.business_object.partie import EtatPartie, Partie
 from src.business_object.joueurs import Joueur
 from src.business_object.table import Table
 from src.business_object.cartes import Carte, couleurs, valeurs
+from src.business_object.evaluateur import EvaluateurMain
 
 
 @pytest.fixture
@@ -105,6 +107,26 @@ def test_annoncer_resultats(setup_partie):
 
     assert partie.etat.pot > 0
 
+
+def test_annoncer_resultats_conserve_le_classement(setup_partie):
+    partie, j1, j2 = setup_partie
+    partie.initialiser_blinds()
+    j1.main = [Carte(couleurs.COEUR, valeurs.AS), Carte(couleurs.PIQUE, valeurs.AS)]
+    j2.main = [Carte(couleurs.PIQUE, valeurs.DAME), Carte(couleurs.PIQUE, valeurs.VALET)]
+    partie.table.board = [
+        Carte(couleurs.COEUR, valeurs.DEUX),
+        Carte(couleurs.CARREAU, valeurs.SEPT),
+        Carte(couleurs.TREFLE, valeurs.HUIT),
+        Carte(couleurs.CARREAU, valeurs.TROIS),
+        Carte(couleurs.TREFLE, valeurs.ROI),
+    ]
+
+    partie.annoncer_resultats()
+
+    assert partie.classement_abattage == [[j1], [j2]]
+    assert partie.mains_abattage[j1].cle > partie.mains_abattage[j2].cle
+    assert [r["pseudo"] for r in partie.etat.resultats] == ["Alice"]
+
 def test_rejouer_partie(setup_partie):
     partie, j1, j2 = setup_partie
     partie.initialiser_blinds()  # Distribue mains + initialise blinds
@@ -178,6 +200,21 @@ def test_relancer_si_possible_minimum_2(setup_partie):
     assert len(partie.table.joueurs) >= 2
     assert all(len(j.main) == 2 for j in partie.table.joueurs)
 
+def test_meilleure_main_disponible_des_le_flop(setup_partie):
+    partie, alice, bob = setup_partie
+    partie.initialiser_blinds()
+    assert partie.meilleure_main("Alice") is None
+
+    partie.actions_joueur("Alice", "suivre")
+    partie.actions_joueur("Bob", "suivre")
+
+    assert partie.tour_actuel == "flop"
+    main = partie.meilleure_main("Alice")
+    assert main is not None
+    attendu = EvaluateurMain(alice.main + partie.table.board).evalue_main()
+    assert main.cle == attendu.cle
+
+
 def test_definir_joueur_premier_postflop(setup_partie):
     partie, j1, j2 = setup_partie
 
@@ -304,3 +341,120 @@ def test_rejouer_redistribue_cartes(setup_partie):
 
     # --- Il doit y avoir un joueur courant défini ---
     assert partie.indice_joueur_courant is not None, "Le joueur courant n'a pas été défini."
+
+
+def test_abonnes_prevenus_a_chaque_changement(setup_partie):
+    partie, j1, j2 = setup_partie
+    recus = []
+    partie.abonner(recus.append)
+
+    partie.initialiser_blinds()
+    assert len(recus) == 1
+    partie.actions_joueur(partie.etat.joueur_courant, "suivre")
+    assert len(recus) == 2
+    assert recus[-1]["version"] > recus[0]["version"]
+    assert recus[-1]["joueur_courant"] == partie.etat.joueur_courant
+
+
+def test_consultation_sans_changement_non_publiee(setup_partie):
+    partie, j1, j2 = setup_partie
+    partie.initialiser_blinds()
+    recus = []
+    partie.abonner(recus.append)
+
+    partie._mettre_a_jour_etat()
+    partie._mettre_a_jour_etat()
+    assert recus == []
+
+    partie.desabonner(recus.append)
+    partie.actions_joueur(partie.etat.joueur_courant, "suivre")
+    assert recus == []
+
+
+def test_etat_publie_independant_de_l_etat(setup_partie):
+    partie, j1, j2 = setup_partie
+    partie.initialiser_blinds()
+    publie = partie.etat_publie()
+    partie.etat.joueurs[0]["solde"] = -1
+    assert publie["joueurs"][0]["solde"] != -1
+
+
+def test_changements_depuis_version_courante(setup_partie):
+    partie, j1, j2 = setup_partie
+    partie.initialiser_blinds()
+    assert partie.changements_depuis(partie.etat.version) is None
+
+
+def test_changements_depuis_renvoie_les_champs_modifies(setup_partie):
+    partie, j1, j2 = setup_partie
+    partie.initialiser_blinds()
+    version = partie.etat.version
+
+    partie.actions_joueur(partie.etat.joueur_courant, "suivre")
+    reponse = partie.changements_depuis(version)
+
+    assert reponse["version"] == partie.etat.version
+    assert reponse["complet"] is False
+    assert "joueurs" in reponse["changements"]
+    # les champs inchangés ne sont pas renvoyés
+    assert "liste_attente" not in reponse["changements"]
+    assert "pot" not in reponse["changements"]
+
+
+def test_changements_depuis_version_trop_ancienne(setup_partie, monkeypatch):
+    partie, j1, j2 = setup_partie
+    monkeypatch.setattr(partie, "historique", deque(maxlen=1))
+    partie.initialiser_blinds()
+    partie.actions_joueur(partie.etat.joueur_courant, "suivre")
+    partie.actions_joueur(partie.etat.joueur_courant, "suivre")
+
+    reponse = partie.changements_depuis(0)
+    assert reponse["complet"] is True
+    assert reponse["changements"]["joueurs"] == partie.etat.joueurs
+
+
+def test_etat_construit_une_fois_par_action(setup_partie, monkeypatch):
+    partie, j1, j2 = setup_partie
+    partie.initialiser_blinds()
+    partie.actions_joueur(partie.etat.joueur_courant, "se_coucher")
+    partie.reponse_rejouer("Alice", True)
+
+    instantanes = []
+    en_dict = EtatPartie.en_dict
+    monkeypatch.setattr(EtatPartie, "en_dict", lambda etat: instantanes.append(1) or en_dict(etat))
+    # la dernière réponse relance la main (blinds, nouvelle donne) : une seule publication
+    partie.reponse_rejouer("Bob", True)
+    assert partie.etat.finie is False
+    assert len(instantanes) == 1
+
+
+def test_anneau_saute_joueurs_couches():
+    joueurs = [Joueur(p, solde=100) for p in ("Alice", "Bob", "Carl", "Dina")]
+    table = Table(id=1)
+    for j in joueurs:
+        table.ajouter_joueur(j)
+    partie = Partie(id=1, table=table)
+    partie.initialiser_blinds()
+
+    ordre = []
+    for _ in range(4):
+        courant = partie.etat.joueur_courant
+        ordre.append(courant)
+        if courant == "Alice":
+            partie.actions_joueur(courant, "se_coucher")
+        else:
+            partie.actions_joueur(courant, "suivre")
+    # Alice couchée ne parle plus au tour suivant
+    assert "Alice" not in partie._dans_anneau
+    assert partie.tour_actuel == "flop"
+    assert partie.etat.joueur_courant != "Alice"
+    assert len(set(ordre)) == 4
+
+
+def test_joueur_suivant_ignore_arrivee_en_cours_de_main(setup_partie):
+    partie, j1, j2 = setup_partie
+    partie.initialiser_blinds()
+    partie.table.ajouter_joueur(Joueur("Carl", solde=100))
+    courant = partie.etat.joueur_courant
+    partie.actions_joueur(courant, "suivre")
+    assert partie.etat.joueur_courant in ("Alice", "Bob")
@@ -1,5 +1,6 @@
 # test_partie_service_pytest.py
 import pytest
+from unittest.mock import MagicMock
 from src.business_object.table import Table
 from src.business_object.partie import Partie, EtatPartie
 from src.business_object.joueurs import Joueur
@@ -170,11 +171,13 @@ def test_miser_mise_interdite_si_inferieure_au_minimum(monkeypatch):
     assert "grosse blinde" in msg.lower(), f"Message incorrect : {msg}"
 
 
-def test_miser_limite_max(monkeypatch):
+def test_miser_au_dela_du_plus_petit_tapis(monkeypatch):
     # --- Setup partie et service ---
     table = Table(id=1, blind=20)
     partie = Partie(id=1, table=table)
     service = PartieService(partie)
+    monkeypatch.setattr(partie.stats_dao, "incrementer_statistique", lambda *args: None)
+    monkeypatch.setattr(partie.stats_dao, "joueur_dao", MagicMock())
 
     # Ajouter joueurs
     joueur_pauvre = Joueur("pauvre", solde=50)
@@ -182,23 +185,22 @@ def test_miser_limite_max(monkeypatch):
     table.ajouter_joueur(joueur_pauvre)
     table.ajouter_joueur(joueur_riche)
 
-    # --- Test mise dépassant la limite ---
-    success, etat, msg = service.miser("riche", 60)
-    assert success is False, "La mise dépasse la limite max, devrait échouer"
-    assert "tu ne peux pas miser plus que" in msg.lower()
-    assert "50" in msg
+    partie.initialiser_blinds()
 
-    # --- Test mise égale à la limite (doit réussir) ---
-    success, etat, msg = service.miser("riche", 50)
-    assert success is True, "La mise égale à la limite max devrait réussir"
+    # --- Les pots secondaires permettent de miser plus que le plus petit tapis ---
+    success, etat, msg = service.miser("riche", 60)
+    assert success is True
     assert msg == ""
+    assert joueur_riche.mise == 70  # petite blinde + 60
 
 
-def test_all_in_limite_max(monkeypatch):
+def test_all_in_au_dela_du_plus_petit_tapis(monkeypatch):
     # --- Setup partie et service ---
     table = Table(id=1, blind=20)
     partie = Partie(id=1, table=table)
     service = PartieService(partie)
+    monkeypatch.setattr(partie.stats_dao, "incrementer_statistique", lambda *args: None)
+    monkeypatch.setattr(partie.stats_dao, "joueur_dao", MagicMock())
 
     # Ajouter joueurs
     joueur_pauvre = Joueur("pauvre", solde=50)
@@ -206,16 +208,22 @@ def test_all_in_limite_max(monkeypatch):
     table.ajouter_joueur(joueur_pauvre)
     table.ajouter_joueur(joueur_riche)
 
-    # --- Test all-in du joueur riche (doit échouer) ---
+    partie.initialiser_blinds()
+
+    # --- All-in du joueur riche (autorisé) ---
     success, etat, msg = service.all_in("riche")
-    assert success is False, "All-in dépasse la limite max, devrait échouer"
-    assert "tu ne peux pas all-in" in msg.lower()
-    assert "50" in msg
+    assert success is True
+    assert msg == ""
+    assert joueur_riche.solde == 0
 
-    # --- Test all-in du joueur pauvre (doit réussir) ---
+    # --- All-in du joueur pauvre pour moins que la mise : la main va au showdown ---
     success, etat, msg = service.all_in("pauvre")
-    assert success is True, "All-in inférieur à la limite max devrait réussir"
+    assert success is True
     assert msg == ""
+    assert etat.finie is True
+    # la part non suivie (150) revient toujours au joueur riche
+    assert joueur_riche.solde >= 150
+    assert joueur_riche.solde + joueur_pauvre.solde == 250
 
 # ---------------------------
 # TEST voir_etat_partie
@@ -0,0 +1,79 @@
+import pytest
+
+from src.business_object.joueurs import Joueur
+from src.simulation.bots import Bot, BotPassif, STRATEGIES
+from src.simulation.dao_memoire import FileImmediate, StatistiquesMemoire
+from src.simulation.simulateur import ErreurSimulation, Simulateur, TableSimulee, Latences
+
+
+@pytest.mark.parametrize("strategie", sorted(STRATEGIES))
+def test_simulation_conserve_les_jetons(strategie):
+    rapport = Simulateur(nb_tables=3, joueurs_par_table=4, strategie=strategie, graine=1).jouer(300)
+    assert rapport["mains"] == 300
+    assert rapport["actions"] > 0
+    assert rapport["mains_par_s"] > 0
+    assert rapport["latence_p50_us"] <= rapport["latence_p99_us"]
+
+
+def test_simulation_sans_base():
+    table = TableSimulee(1, nb_joueurs=3, strategie="aleatoire")
+    table.jouer_main(Latences(taille=10))
+    assert table.stats.nb_reglements == 1
+    assert set(table.stats.portefeuilles) == {j.pseudo for j in table.joueurs}
+
+
+def test_conservation_detecte_jetons_perdus():
+    table = TableSimulee(1, nb_joueurs=2)
+    table.joueurs[0].solde -= 1
+    with pytest.raises(ErreurSimulation):
+        table.verifier_conservation()
+
+
+def test_bot_passif_tapis_si_pas_assez():
+    table = TableSimulee(1, nb_joueurs=2)
+    partie = table.partie
+    joueur = Joueur("Court", 5)
+    partie.mise_max = 20
+    assert BotPassif().choisir(partie, joueur) == ("all-in", None)
+
+
+def test_latences_reservoir_borne():
+    latences = Latences(taille=10)
+    for ns in range(1000, 101_000, 1000):
+        latences.ajouter(ns)
+    assert latences.nb == 100
+    assert len(latences.valeurs) == 10
+    assert latences.centile(50) > 0
+
+
+def test_file_immediate():
+    stats = StatistiquesMemoire()
+    FileImmediate().soumettre(stats.vider, {"alice": 10}).result(0)
+    assert stats.portefeuilles == {"alice": 10}
+
+
+def test_simulation_parallele_deterministe():
+    sequentiel = Simulateur(nb_tables=4, joueurs_par_table=3, graine=7)
+    parallele = Simulateur(nb_tables=4, joueurs_par_table=3, graine=7, nb_processus=2)
+    rapport_seq = sequentiel.jouer(80)
+    rapport_par = parallele.jouer(80)
+    # mêmes mains jouées par table, quel que soit le découpage entre processus
+    assert rapport_par["processus"] == 2
+    assert rapport_seq["actions"] == rapport_par["actions"]
+    assert sequentiel.statistiques.statistiques == parallele.statistiques.statistiques
+    assert sequentiel.statistiques.portefeuilles == parallele.statistiques.portefeuilles
+
+
+def test_fusion_latences():
+    a, b = Latences(taille=10), Latences(taille=10)
+    for ns in range(1000, 31_000, 1000):
+        a.ajouter(ns)
+    b.ajouter(500_000)
+    fusion = Latences.fusionner([a, b], taille=10)
+    assert fusion.nb == 31
+    assert len(fusion.valeurs) == 10
+
+
+def test_bot_abstrait():
+    with pytest.raises(TypeError):
+        Bot()
@@ -46,7 +46,9 @@ def test_reset_table(table_vide, joueurs):
 
     assert table_vide.pot == 0
     assert table_vide.board == []
-    assert table_vide.deck is not ancien_deck
+    # le deck est réutilisé, rempli et mélangé sur place
+    assert table_vide.deck is ancien_deck
+    assert len(table_vide.deck) == 52
 
 
 def test_repr(table_vide, joueurs):
@@ -62,4 +64,26 @@ def test_supprimer_joueur_inexistant():
     joueur = Joueur("Alice", 1000)
     # On ne l'ajoute pas à la table, donc supprimer doit lever ValueError
     with pytest.raises(ValueError, match="Ce joueur n'est pas à la table."):
-        table.supprimer_joueur(joueur)
\ No newline at end of file
+        table.supprimer_joueur(joueur)
+
+def test_index_des_sieges(table_vide, joueurs):
+    for j in joueurs[:4]:
+        table_vide.ajouter_joueur(j)
+    assert table_vide.siege("Joueur3") == 2
+    assert table_vide.joueur("Joueur3") is joueurs[2]
+
+    table_vide.supprimer_joueur(joueurs[1])
+    assert table_vide.siege("Joueur2") is None
+    assert table_vide.siege("Joueur3") == 1
+
+    # les modifications directes de la liste tiennent aussi l'index à jour
+    table_vide.joueurs.append(joueurs[5])
+    assert table_vide.siege("Joueur6") == 3
+    table_vide.joueurs = [joueurs[5], joueurs[0]]
+    assert table_vide.siege("Joueur6") == 0
+    assert table_vide.joueur("Joueur3") is None
+
+
+def test_ajouter_meme_pseudo(table_vide):
+    table_vide.ajouter_joueur(Joueur("Alice", 1000))
+    assert table_vide.ajouter_joueur(Joueur("Alice", 500)) == 2
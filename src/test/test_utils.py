@@ -80,4 +80,90 @@ def test_initialiser_logs_cree_dossier(monkeypatch):
 
     # Vérifie que logging.info a été appelé pour les lignes de démarrage
     assert info_mock.call_count == 3
-    assert any("Lancement TestApp" in str(call) for call in info_mock.call_args_list)
\ No newline at end of file
+    assert any("Lancement TestApp" in str(call) for call in info_mock.call_args_list)
+
+@pytest.fixture
+def traces():
+    from src.utils.log_decorator import Traces
+    reglages = (Traces.niveau, Traces.echantillon, Traces.mesures)
+    Traces.reinitialiser()
+    yield Traces
+    Traces.configurer(*reglages)
+    Traces.reinitialiser()
+
+
+class _Compteur:
+    """Argument qui compte ses mises en forme"""
+    nb_str = 0
+
+    def __str__(self):
+        _Compteur.nb_str += 1
+        return "compteur"
+
+
+class _Service:
+    from src.utils.log_decorator import log
+
+    @log
+    def connecter(self, pseudo, mdp):
+        return [pseudo] * 5
+
+
+def test_log_desactive_ne_formate_rien(traces, caplog):
+    traces.configurer(niveau="DEBUG", mesures=True)
+    _Compteur.nb_str = 0
+    with caplog.at_level(logging.INFO):
+        resultat = _Service().connecter(_Compteur(), "secret")
+    assert len(resultat) == 5
+    assert _Compteur.nb_str == 0
+    assert caplog.records == []
+    assert traces.resume()["_Service.connecter"]["appels"] == 1
+
+
+def test_log_active_cache_mot_de_passe(traces, caplog):
+    traces.configurer(niveau="INFO")
+    with caplog.at_level(logging.INFO):
+        _Service().connecter("alice", "secret")
+    texte = caplog.text
+    assert "_Service.connecter('alice', '*****') - DEBUT" in texte
+    assert "secret" not in texte
+    assert "(5 elements)" in texte
+
+
+def test_log_echantillonnage(traces, caplog):
+    traces.configurer(niveau="INFO", echantillon=0.0)
+    with caplog.at_level(logging.INFO):
+        _Service().connecter("alice", "secret")
+    assert caplog.records == []
+
+
+def test_log_sans_mesures(traces):
+    traces.configurer(niveau="DEBUG", mesures=False)
+    _Service().connecter("alice", "secret")
+    assert traces.resume() == {}
+
+
+def test_histogramme_durees(traces):
+    for duree in (500, 1500, 1500, 3000, 1_000_000):
+        traces.enregistrer("Service.methode", duree)
+    resume = traces.resume()["Service.methode"]
+    assert resume["appels"] == 5
+    assert resume["max_us"] == 1000.0
+    assert resume["p50_us"] == 2.048
+    assert sum(resume["histogramme"].values()) == 5
+
+
+def test_reglages_traces_invalides(traces, monkeypatch):
+    from src.utils.log_decorator import _depuis_env, _lire_echantillon, _lire_niveau
+
+    with pytest.raises(ValueError):
+        traces.configurer(niveau="verbose")
+    with pytest.raises(ValueError):
+        traces.configurer(echantillon=2)
+    # une variable d'environnement invalide ne casse pas les méthodes décorées
+    monkeypatch.setenv("LOG_TRACES_NIVEAU", "verbose")
+    monkeypatch.setenv("LOG_TRACES_ECHANTILLON", "beaucoup")
+    assert _depuis_env("LOG_TRACES_NIVEAU", _lire_niveau, logging.DEBUG) == logging.DEBUG
+    assert _depuis_env("LOG_TRACES_ECHANTILLON", _lire_echantillon, 1.0) == 1.0
+    monkeypatch.setenv("LOG_TRACES_NIVEAU", "info")
+    assert _depuis_env("LOG_TRACES_NIVEAU", _lire_niveau, logging.DEBUG) == logging.INFO
@@ -120,6 +120,30 @@ def test_rejoindre_table(mock_session, mock_get, mock_post, mock_inquirer, mock_
 
 
 
+@patch("builtins.input", return_value="")
+@patch("src.view.menu_rejoindre_table_vue.time.sleep")
+@patch("src.view.menu_rejoindre_table_vue.inquirer.select")
+@patch("src.view.menu_rejoindre_table_vue.post")
+@patch("src.view.menu_rejoindre_table_vue.get")
+@patch("src.view.menu_rejoindre_table_vue.Session")
+def test_placement_automatique(mock_session, mock_get, mock_post, mock_inquirer, mock_sleep,
+                               mock_input, vue_rejoindre, capsys):
+    mock_session.return_value.joueur = "test_pseudo"
+    mock_get.return_value = [{"id": 2, "nb_joueurs": 5}]
+    mock_inquirer.return_value.execute.return_value = MenuRejoindreTableVue.PLACEMENT_AUTO
+    mock_post.side_effect = [
+        {"statut": "en_attente", "id_table": None, "position": 1, "message": ""},
+        {"statut": "place", "id_table": 3, "position": None, "message": "Table 3"},
+    ]
+
+    result = vue_rejoindre.choisir_menu()
+    captured = capsys.readouterr()
+
+    assert "position 1" in captured.out
+    assert isinstance(result, MenuTableVue)
+    assert result.id_table == 3
+
+
 # ---------------------- TESTS POUR MenuTableVue ----------------------
 
 @pytest.fixture
@@ -148,3 +172,34 @@ def test_afficher_etat_partie(mock_get, vue_table, capsys):
     assert "Flop" in captured.out
     assert etat["pot"] == 100
 
+
+
+@patch("src.view.menu_table_vue.get")
+@patch("src.view.menu_table_vue.ecouter")
+def test_attendre_mise_a_jour_utilise_le_flux(mock_ecouter, mock_get, vue_table):
+    vue_table.version = 3
+    mock_ecouter.return_value = iter([
+        {"version": 3, "joueur_courant": "autre"},
+        {"version": 4, "joueur_courant": "test_pseudo", "tour_actuel": "Flop", "pot": 40,
+         "mise_max": 20, "joueurs": [], "board": [], "finie": False},
+    ])
+
+    vue_table.attendre_mise_a_jour()
+    etat = vue_table.afficher_etat_partie()
+
+    # l'état poussé est affiché sans nouvelle requête
+    mock_get.assert_not_called()
+    assert etat["version"] == 4
+    assert vue_table.joueur_courant == "test_pseudo"
+
+
+@patch("builtins.input", return_value="")
+@patch("src.view.menu_table_vue.ecouter")
+def test_attendre_mise_a_jour_flux_perdu(mock_ecouter, mock_input, vue_table):
+    from src.client.api_client import APIError
+    mock_ecouter.side_effect = APIError("connexion refusée")
+
+    vue_table.attendre_mise_a_jour()
+    assert vue_table.flux is None
+    assert vue_table.etat_recu is None
+    mock_input.assert_called_once()
@@ -0,0 +1,39 @@
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+from src.business_object.equite_preflop import (
+    CHEMIN_DEFAUT, NB_MAINS, calculer_equites, ecrire_table, nom_main
+)
+
+
+def generer(chemin: str = CHEMIN_DEFAUT, nb_tirages: int = 50_000, graine: int = 0,
+            nb_processus: int | None = None) -> list[list[float]]:
+    """
+    Calcule l'équité des 169 mains de départ contre 1 à 4 adversaires et écrit la table.
+    Les mains sont réparties entre processus ; chacune a sa propre graine, le résultat ne
+    dépend donc pas du nombre de processus.
+    """
+    calcul = partial(calculer_equites, nb_tirages=nb_tirages, graine=graine)
+    with ProcessPoolExecutor(max_workers=nb_processus) as executeur:
+        equites = list(executeur.map(calcul, range(NB_MAINS)))
+    ecrire_table(chemin, equites, nb_tirages)
+    return equites
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Génère la table des équités préflop")
+    parser.add_argument("--sortie", default=CHEMIN_DEFAUT, help="fichier produit")
+    parser.add_argument("--tirages", type=int, default=50_000,
+                        help="donnes tirées par main et par nombre d'adversaires")
+    parser.add_argument("--graine", type=int, default=0)
+    parser.add_argument("--processus", type=int, default=os.cpu_count())
+    args = parser.parse_args()
+
+    debut = time.perf_counter()
+    equites = generer(args.sortie, args.tirages, args.graine, args.processus)
+    print(f"Table écrite dans {args.sortie} en {time.perf_counter() - debut:.1f} s")
+    for indice in sorted(range(NB_MAINS), key=lambda i: -equites[i][0])[:5]:
+        print(f"{nom_main(indice):<4} : " + " | ".join(f"{e:5.1f} %" for e in equites[indice]))
@@ -1,5 +1,9 @@
+import logging
 import logging.config
 import numbers
+import os
+import random
+import time
 
 from functools import wraps
 
@@ -25,59 +29,234 @@ class LogIndetation:
         return "    " * cls.current_indentation
 
 
-def log(func):
-    """Création d'un décorateur nommé log
-    Lorsque ce décorateur est appliqué à une méthode, cela affichera dans les logs :
-    - l'appel de cette méthode avec les valeurs de paramètres
-    - la sortie retournée par cette méthode
+def _lire_niveau(valeur: int | str) -> int:
+    """Niveau de log à partir de son nom ("INFO") ou de sa valeur numérique"""
+    if isinstance(valeur, int):
+        return valeur
+    texte = str(valeur).strip().upper()
+    if texte.isdigit():
+        return int(texte)
+    niveau = logging.getLevelName(texte)
+    # getLevelName renvoie la chaîne "Level XXX" pour un nom inconnu
+    if not isinstance(niveau, int):
+        raise ValueError(f"Niveau de log inconnu : {valeur!r}.")
+    return niveau
+
+
+def _lire_echantillon(valeur: float | str) -> float:
+    """Part des appels tracés, entre 0 et 1"""
+    try:
+        echantillon = float(valeur)
+    except (TypeError, ValueError):
+        raise ValueError(f"Échantillon de traces invalide : {valeur!r}.") from None
+    if not 0 <= echantillon <= 1:
+        raise ValueError(f"L'échantillon de traces doit être entre 0 et 1 : {valeur!r}.")
+    return echantillon
+
+
+def _depuis_env(variable: str, lire, defaut):
+    """Réglage lu dans une variable d'environnement ; valeur par défaut si elle est invalide"""
+    valeur = os.environ.get(variable)
+    if valeur is None:
+        return defaut
+    try:
+        return lire(valeur)
+    except ValueError as e:
+        logging.getLogger(__name__).warning("%s ignorée (%s), valeur par défaut utilisée.", variable, e)
+        return defaut
+
+
+class Traces:
     """
+    Réglages des traces d'appel posées par @log, et durées mesurées par méthode.
 
-    @wraps(func)
-    def wrapper(*args, **kwargs):
-        logger = logging.getLogger(__name__)
+    Réglables par variables d'environnement :
+    LOG_TRACES_NIVEAU (niveau des lignes DEBUT/FIN/Sortie, DEBUG par défaut : elles ne sont
+    écrites que si ce niveau est activé dans logging_config.yml), LOG_TRACES_ECHANTILLON
+    (part des appels tracés, entre 0 et 1) et LOG_TRACES_MESURES (0 pour ne pas mesurer
+    les durées).
+    """
 
-        LogIndetation.increase_indentation()
-        indentation = LogIndetation.get_indentation()
+    niveau = _depuis_env("LOG_TRACES_NIVEAU", _lire_niveau, logging.DEBUG)
+    echantillon = _depuis_env("LOG_TRACES_ECHANTILLON", _lire_echantillon, 1.0)
+    mesures = os.environ.get("LOG_TRACES_MESURES", "1") != "0"
 
-        # Recuperation des parametres de la methode
-        class_name = args[0].__class__.__name__ if args else ""
-        method_name = func.__name__
-        args_list = list(
-            [str(arg) if not isinstance(arg, numbers.Number) else arg for arg in args[1:]]
-            + list(kwargs.values())
-        )
+    # nom de méthode -> [appels, durée totale (ns), durée max (ns), histogramme]
+    # case k de l'histogramme : appels ayant duré moins de 2**k ns
+    durees: dict[str, list] = {}
+    NB_CASES = 40
+
+    @classmethod
+    def configurer(cls, niveau: int | str | None = None, echantillon: float | None = None,
+                   mesures: bool | None = None) -> None:
+        """
+        Modifie les réglages en cours d'exécution (les paramètres absents sont conservés).
+        Lève ValueError pour un niveau ou un échantillon invalide.
+        """
+        if niveau is not None:
+            cls.niveau = _lire_niveau(niveau)
+        if echantillon is not None:
+            cls.echantillon = _lire_echantillon(echantillon)
+        if mesures is not None:
+            cls.mesures = mesures
+
+    @classmethod
+    def enregistrer(cls, nom: str, duree_ns: int) -> None:
+        """
+        Ajoute une durée à l'histogramme de la méthode.
+        Sans verrou : sous forte concurrence, un appel peut exceptionnellement ne pas être compté.
+        """
+        mesure = cls.durees.get(nom)
+        if mesure is None:
+            mesure = cls.durees.setdefault(nom, [0, 0, 0, [0] * cls.NB_CASES])
+        mesure[0] += 1
+        mesure[1] += duree_ns
+        if duree_ns > mesure[2]:
+            mesure[2] = duree_ns
+        mesure[3][min(duree_ns.bit_length(), cls.NB_CASES - 1)] += 1
+
+    @staticmethod
+    def _centile(histogramme: list[int], appels: int, p: float) -> float:
+        """Borne haute (µs) de la case de l'histogramme contenant le centile p"""
+        seuil = appels * p / 100
+        cumul = 0
+        for k, nb in enumerate(histogramme):
+            cumul += nb
+            if cumul >= seuil:
+                return 2 ** k / 1000
+        return 2 ** (len(histogramme) - 1) / 1000
+
+    @classmethod
+    def resume(cls) -> dict[str, dict]:
+        """
+        Durées mesurées par méthode, de la plus coûteuse (temps total) à la moins coûteuse.
+
+        Returns
+        -------
+        dict[str, dict]
+            appels, temps total (ms), moyenne, maximum, p50 et p99 (µs, arrondis à la
+            puissance de 2 supérieure) et histogramme (borne haute en µs -> appels)
+        """
+        resume = {}
+        for nom, (appels, total, maximum, histogramme) in sorted(
+            list(cls.durees.items()), key=lambda e: -e[1][1]
+        ):
+            if not appels:
+                continue
+            resume[nom] = {
+                "appels": appels,
+                "total_ms": round(total / 1e6, 3),
+                "moyenne_us": round(total / appels / 1000, 2),
+                "max_us": round(maximum / 1000, 2),
+                "p50_us": cls._centile(histogramme, appels, 50),
+                "p99_us": cls._centile(histogramme, appels, 99),
+                "histogramme": {
+                    f"{2 ** k / 1000:g}": nb for k, nb in enumerate(histogramme) if nb
+                },
+            }
+        return resume
+
+    @classmethod
+    def reinitialiser(cls) -> None:
+        cls.durees = {}
 
+
+MOTS_DE_PASSE = ("password", "passwd", "pwd", "pass", "mot_de_passe", "mdp")
+
+
+class _Appel:
+    """Arguments d'un appel, mis en forme seulement si la ligne de log est écrite."""
+
+    __slots__ = ("args", "kwargs", "caches")
+
+    def __init__(self, args, kwargs, caches):
+        self.args = args
+        self.kwargs = kwargs
+        self.caches = caches
+
+    def __str__(self):
+        args_list = [
+            str(arg) if not isinstance(arg, numbers.Number) else arg for arg in self.args[1:]
+        ] + list(self.kwargs.values())
         # pour cacher les mots de passe
-        param_names = func.__code__.co_varnames[1 : func.__code__.co_argcount]
-        for i, v in enumerate(param_names):
-            if v in ["password", "passwd", "pwd", "pass", "mot_de_passe", "mdp"]:
+        for i in self.caches:
+            if i < len(args_list):
                 args_list[i] = "*****"
-
         # Transforme en tuple pour avoir un affichage avec des parentheses
-        args_list = tuple(args_list)
+        return str(tuple(args_list))
 
-        # Affichage dans le fichier de log
-        logger.info(f"{indentation}{class_name}.{method_name}{args_list} - DEBUT")
-        result = func(*args, **kwargs)
-        logger.info(f"{indentation}{class_name}.{method_name}{args_list} - FIN")
 
+class _Sortie:
+    """Résultat d'un appel, réduit et mis en forme seulement si la ligne de log est écrite."""
+
+    __slots__ = ("result",)
+
+    def __init__(self, result):
+        self.result = result
+
+    def __str__(self):
+        result = self.result
         # Reduction de l affichage de la sortie si trop longue
         if isinstance(result, list):
             result_str = str([str(item) for item in result[:3]])
             result_str += " ... (" + str(len(result)) + " elements)"
         elif isinstance(result, dict):
-            result_str = [(str(k), str(v)) for k, v in result.items()][:3]
+            result_str = str([(str(k), str(v)) for k, v in result.items()][:3])
             result_str += " ... (" + str(len(result)) + " elements)"
         elif isinstance(result, str) and len(result) > 50:
             result_str = result[:50]
             result_str += " ... (" + str(len(result)) + " caracteres)"
         else:
             result_str = str(result)
+        return result_str
+
 
-        logger.info(f"{indentation}   └─> Sortie : {result_str}")
+def log(func):
+    """Création d'un décorateur nommé log
+    Lorsque ce décorateur est appliqué à une méthode :
+    - sa durée est ajoutée à l'histogramme de la méthode (Traces.resume)
+    - si le niveau Traces.niveau est activé, les logs affichent (pour une part
+      Traces.echantillon des appels) l'appel avec les valeurs de paramètres et la sortie
+
+    Quand ni les mesures ni les traces ne sont actives, l'appel n'a presque aucun surcoût :
+    rien n'est mis en forme.
+    """
+    logger = logging.getLogger(__name__)
+    nom = func.__qualname__
+    method_name = func.__name__
+    param_names = func.__code__.co_varnames[1:func.__code__.co_argcount]
+    caches = tuple(i for i, v in enumerate(param_names) if v in MOTS_DE_PASSE)
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        tracer = logger.isEnabledFor(Traces.niveau) and (
+            Traces.echantillon >= 1 or random.random() < Traces.echantillon
+        )
+        if not tracer:
+            if not Traces.mesures:
+                return func(*args, **kwargs)
+            debut = time.perf_counter_ns()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                Traces.enregistrer(nom, time.perf_counter_ns() - debut)
 
-        LogIndetation.decrease_indentation()
+        LogIndetation.increase_indentation()
+        indentation = LogIndetation.get_indentation()
+        class_name = args[0].__class__.__name__ if args else ""
+        appel = _Appel(args, kwargs, caches)
 
+        # Affichage dans le fichier de log
+        logger.log(Traces.niveau, "%s%s.%s%s - DEBUT", indentation, class_name, method_name, appel)
+        debut = time.perf_counter_ns()
+        try:
+            result = func(*args, **kwargs)
+        finally:
+            if Traces.mesures:
+                Traces.enregistrer(nom, time.perf_counter_ns() - debut)
+            LogIndetation.decrease_indentation()
+        logger.log(Traces.niveau, "%s%s.%s%s - FIN", indentation, class_name, method_name, appel)
+        logger.log(Traces.niveau, "%s   └─> Sortie : %s", indentation, _Sortie(result))
         return result
 
-    return wrapper
\ No newline at end of file
+    return wrapper
@@ -46,7 +46,7 @@ class ResetDatabase(metaclass=Singleton):
         create_schema_sql = f"DROP SCHEMA IF EXISTS {schema} CASCADE; CREATE SCHEMA {schema};"
 
         try:
-            with DBConnection().connection as conn:
+            with DBConnection().connexion() as conn:
                 with conn.cursor() as cursor:
                     cursor.execute(create_schema_sql)
                     cursor.execute(f"SET search_path TO {schema};")
@@ -9,6 +9,9 @@ from src.utils.log_decorator import log
 class MenuJoueurVue(VueAbstraite):
     """Vue du menu du joueur via API"""
 
+    # nombre de joueurs affichés en haut du classement
+    TAILLE_CLASSEMENT = 20
+
     def __init__(self, titre, tables):
         super().__init__(titre)
         self.tables = tables
@@ -51,12 +54,22 @@ class MenuJoueurVue(VueAbstraite):
 
             case "Afficher le classement":
                 try:
-                    classement_joueur = get("/joueur_connecte/voir_classement")
+                    classement_joueur = get(
+                        "/joueur_connecte/voir_classement", params={"limit": self.TAILLE_CLASSEMENT}
+                    )
+                    # le joueur hors de la page affichée voit son rang sous le classement
+                    moi = None
+                    if all(j["pseudo"] != pseudo for j in classement_joueur):
+                        moi = get("/joueur_connecte/mon_classement", params={"pseudo": pseudo})
+                    lignes = classement_joueur + ([moi] if moi else [])
                     print("\nClassement des joueurs :")
                     print("-" * 40)
-                    max_pseudo_len = max(len(j["pseudo"]) for j in classement_joueur)
-                    max_credit_len = max(len(str(j["portefeuille"])) for j in classement_joueur)
-                    for i, joueur in enumerate(classement_joueur, start=1):
+                    max_pseudo_len = max(len(j["pseudo"]) for j in lignes)
+                    max_credit_len = max(len(str(j["portefeuille"])) for j in lignes)
+                    for position, joueur in enumerate(lignes, start=1):
+                        if joueur is moi:
+                            print("     ...")
+                        i = joueur.get("rang", position)
                         pseudo_joueur = joueur["pseudo"]
                         portefeuille = joueur["portefeuille"]
                         if pseudo_joueur == pseudo:
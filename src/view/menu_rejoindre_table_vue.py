@@ -1,3 +1,5 @@
+import time
+
 from InquirerPy import inquirer
 from src.view.vue_abstraite import VueAbstraite
 from src.view.session import Session
@@ -10,6 +12,10 @@ from src.utils.log_decorator import log
 class MenuRejoindreTableVue(VueAbstraite):
     """Vue du menu du joueur pour rejoindre une table"""
 
+    PLACEMENT_AUTO = "Placement automatique"
+    # secondes entre deux demandes de place quand le joueur est en file d'attente
+    DELAI_FILE = 3
+
     def __init__(self, message=""):
         super().__init__(message)
         self.pseudo = Session().joueur
@@ -31,7 +37,8 @@ class MenuRejoindreTableVue(VueAbstraite):
             return MenuJoueurVue("", None)
 
         # Construire la liste des choix avec ID + nombre de joueurs
-        choices = [f"{t['id']} (joueurs: {t['nb_joueurs']})" for t in tables]
+        choices = [self.PLACEMENT_AUTO]
+        choices += [f"{t['id']} (joueurs: {t['nb_joueurs']})" for t in tables]
         choices.append("Retour")
 
         choix = inquirer.select(
@@ -41,6 +48,8 @@ class MenuRejoindreTableVue(VueAbstraite):
 
         if choix == "Retour":
             return MenuJoueurVue("", None)
+        if choix == self.PLACEMENT_AUTO:
+            return self.placement_automatique()
 
         # Récupérer l'ID de la table sélectionnée
         id_table = int(choix.split(" ")[0])
@@ -64,3 +73,25 @@ class MenuRejoindreTableVue(VueAbstraite):
             print(f"\nErreur API : {e}\n")
             input("Appuyez sur Entrée pour revenir au menu précédent...")
             return self
+
+    def placement_automatique(self):
+        """Demande une place à la file de placement, en attendant tant que les tables sont pleines."""
+        try:
+            res = post("/joueur_connecte/rejoindre_file", params={"pseudo": self.pseudo})
+            while res["statut"] == "en_attente":
+                print(f"En file d'attente (position {res['position']})...")
+                time.sleep(self.DELAI_FILE)
+                res = post("/joueur_connecte/rejoindre_file", params={"pseudo": self.pseudo})
+        except APIError as e:
+            print(f"\nErreur API : {e}\n")
+            input("Appuyez sur Entrée pour revenir au menu précédent...")
+            return self
+
+        print("")
+        print(res["message"])
+        print("")
+        if res["statut"] == "place":
+            input("Appuyez sur Entrée pour continuer...")
+            return MenuTableVue(id_table=res["id_table"])
+        input("Appuyer sur Entrée pour revenir à la page d'accueil.")
+        return MenuJoueurVue("", None)
@@ -2,7 +2,7 @@ from InquirerPy import inquirer
 from src.view.vue_abstraite import VueAbstraite
 from src.view.session import Session
 from src.view.menu_joueur_vue import MenuJoueurVue
-from src.client.api_client import get, post, APIError
+from src.client.api_client import get, post, ecouter, APIError
 from src.business_object.partie import Partie
 from src.utils.log_decorator import log
 
@@ -17,21 +17,29 @@ class MenuTableVue(VueAbstraite):
         self.pseudo = Session().joueur
         self.joueur_courant = None  # sera mis à jour à chaque affichage
         self.resultats_deja_affiche = False
+        self.flux = None  # abonnement aux changements de la partie, ouvert à la première attente
+        self.version = 0  # version du dernier état affiché
+        self.etat_recu = None  # état poussé par le serveur, pas encore affiché
 
     @log
     def afficher_etat_partie(self):
         """Affiche l'état actuel de la partie et met à jour le joueur courant"""
-        try:
-            etat = get("/joueur_en_jeu/voir_etat_partie", params={"partie": self.id_table})
-        except APIError as e:
-            print(f"\nErreur API lors de la récupération de l'état : {e}\n")
-            return None
+        etat, self.etat_recu = self.etat_recu, None
+        if etat is None:
+            try:
+                etat = get("/joueur_en_jeu/voir_etat_partie", params={"partie": self.id_table})
+            except APIError as e:
+                print(f"\nErreur API lors de la récupération de l'état : {e}\n")
+                return None
+        self.version = etat.get("version", self.version)
 
         self.joueur_courant = etat.get("joueur_courant")
         if self.joueur_courant is not None:
             print("\n" + "-" * 50)
             print(f"Table {self.id_table} | Tour actuel : {etat['tour_actuel']}")
             print(f"Pot principal : {etat['pot']} | Mise max : {etat['mise_max']}")
+            for i, pot in enumerate(etat.get("pots_secondaires", []), start=1):
+                print(f"Pot secondaire {i} : {pot['montant']} ({', '.join(pot['eligibles'])})")
             print(f"Joueur courant : {self.joueur_courant}\n")
             for j in etat["joueurs"]:
                 actif = "(actif)" if j["actif"] else "(couché)"
@@ -46,6 +54,29 @@ class MenuTableVue(VueAbstraite):
             print("-" * 50)
         return etat
 
+    def attendre_mise_a_jour(self):
+        """
+        Attend que le serveur pousse un nouvel état de la partie, sans l'interroger en boucle.
+        L'état reçu sera affiché au prochain passage dans le menu.
+        """
+        try:
+            if self.flux is None:
+                self.flux = ecouter("/joueur_en_jeu/flux", params={"partie": self.id_table})
+            for etat in self.flux:
+                if etat.get("version", 0) > self.version:
+                    self.etat_recu = etat
+                    return
+        except APIError as e:
+            print(f"\nConnexion au flux de la partie perdue : {e}\n")
+        # flux interrompu : on repasse au rafraîchissement manuel
+        self.fermer_flux()
+        input("Appuyez sur Entrée pour rafraîchir...")
+
+    def fermer_flux(self):
+        if self.flux is not None:
+            self.flux.close()
+            self.flux = None
+
     @log
     def voir_mes_cartes(self):
         """Affiche les cartes du joueur"""
@@ -58,6 +89,12 @@ class MenuTableVue(VueAbstraite):
     @log
     def choisir_menu(self):
         """Affichage du menu joueur en table"""
+        vue = self._choisir_menu()
+        if vue is not self:
+            self.fermer_flux()
+        return vue
+
+    def _choisir_menu(self):
         self.afficher()
         etat = self.afficher_etat_partie()
         if etat is None:
@@ -89,7 +126,7 @@ class MenuTableVue(VueAbstraite):
                         print(f"Erreur lors de la suppression de la table : {e}")
                     return MenuJoueurVue("", None)
                 elif choix == "Continuer à attendre":
-                    input("Appuyez sur Entrée pour rafraîchir...")
+                    self.attendre_mise_a_jour()
                     return self
             except APIError as e:
                 print(f"\nErreur API lors de '{choix}' : {e}\n")
@@ -182,7 +219,7 @@ class MenuTableVue(VueAbstraite):
                     else:
                         # reponse == "Oui"
                         print("Attente des autres joueurs pour relancer la partie...")
-                        input("Appuyez sur Entrée pour rafraîchir...")
+                        self.attendre_mise_a_jour()
                         choix = inquirer.select(
                             message="Que voulez-vous faire ?",
                             choices=[
@@ -201,13 +238,13 @@ class MenuTableVue(VueAbstraite):
                                     print(f"Erreur lors de la suppression de la table : {e}")
                                 return MenuJoueurVue("", None)
                             elif choix == "Continuer à attendre":
-                                input("Appuyez sur Entrée pour rafraîchir...")
+                                self.attendre_mise_a_jour()
                                 return self
                         except APIError as e:
                             print(f"\nErreur API lors de '{choix}' : {e}\n")
             else:
                 print("Attente des autres joueurs pour relancer la partie...")
-                input("Appuyez sur Entrée pour rafraîchir...")
+                self.attendre_mise_a_jour()
             return self
 
         if self.resultats_deja_affiche:
@@ -251,7 +288,7 @@ class MenuTableVue(VueAbstraite):
                     return MenuJoueurVue("", None)
 
                 else:  # Continuer à attendre
-                    input("Appuyez sur Entrée pour rafraîchir...")
+                    self.attendre_mise_a_jour()
                     return self
 
             elif val is False:
@@ -312,7 +349,7 @@ class MenuTableVue(VueAbstraite):
                         return self
 
                 elif choix == "Continuer à attendre":
-                    input("Appuyez sur Entrée pour rafraîchir...")
+                    self.attendre_mise_a_jour()
                     return self
 
                 else:  # Quitter la table
@@ -329,7 +366,7 @@ class MenuTableVue(VueAbstraite):
         if self.joueur_courant != self.pseudo:
 
             print(f"\nCe n'est pas votre tour, veuillez patienter...\n")
-            input("Appuyez sur Entrée pour rafraîchir...")
+            self.attendre_mise_a_jour()
             return self
 
         choix = inquirer.select(